@@ -0,0 +1 @@
+"""Performance benchmarks for Project 9."""
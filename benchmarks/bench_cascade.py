@@ -0,0 +1,116 @@
+"""Compare model time per video with and without a model cascade.
+
+Serves a small fast model and a large slow one from the fake Ollama server
+(see benchmarks.fake_ollama). The small model is confident on a
+configurable share of frames and unsure of the rest. Each video is then
+analyzed with the large model alone and with a small-then-large cascade.
+Reports the wall time, the requests per model and the model (GPU) seconds,
+i.e. the summed generation time the server spent per video.
+
+Usage:
+    python -m benchmarks.bench_cascade
+    python -m benchmarks.bench_cascade --easy 0.6 --large-latency 1.0 --json
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.bench_pipeline import DEFAULT_VIDEO
+from benchmarks.fake_ollama import DEFAULT_RESPONSES, FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.cascade import CascadeTier
+from src.providers import OllamaClient
+
+SMALL, LARGE = "moondream", "llava"
+
+
+def small_responses(easy: float, cycle: int = 20) -> list[dict]:
+    """Verdicts of the small model: confident on ``easy`` of the frames."""
+    confident = round(easy * cycle)
+    sure = {**DEFAULT_RESPONSES[1], "confidence": 92}
+    unsure = {**DEFAULT_RESPONSES[0], "confidence": 55}
+    return [sure] * confident + [unsure] * (cycle - confident)
+
+
+def bench(args: argparse.Namespace, cascade: bool) -> dict:
+    """Analyze the video ``--repeat`` times and sum the server's model time."""
+    latency = {SMALL: args.small_latency, LARGE: args.large_latency}
+    with FakeOllamaServer(
+        models=(f"{SMALL}:latest", f"{LARGE}:latest"),
+        model_latency=latency,
+        model_responses={SMALL: small_responses(args.easy)},
+    ) as server:
+        agent = VideoFraudDetectionAgent(
+            model_name=LARGE,
+            ollama_client=OllamaClient(host=server.url),
+            max_concurrency=args.concurrency,
+            cascade=(
+                [CascadeTier(SMALL, threshold=args.threshold), CascadeTier(LARGE)]
+                if cascade
+                else None
+            ),
+            verbose=False,
+        )
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            agent.analyze_video(args.video, args.frames)
+        elapsed = time.perf_counter() - start
+        agent.close()
+    requests = Counter(server.generated)
+    model_s = sum(latency[model] * count for model, count in requests.items())
+    return {
+        "mode": "cascade" if cascade else "single",
+        "frames": args.frames,
+        "wall_s_per_video": elapsed / args.repeat,
+        "model_s_per_video": model_s / args.repeat,
+        "requests": {m: requests[m] // args.repeat for m in (SMALL, LARGE)},
+    }
+
+
+def main():
+    """Run the cascade benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", type=Path, default=DEFAULT_VIDEO)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--easy",
+        type=float,
+        default=0.8,
+        help="Share of frames the small model is sure of",
+    )
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--small-latency", type=float, default=0.05)
+    parser.add_argument("--large-latency", type=float, default=0.4)
+    parser.add_argument("--json", action="store_true", help="Emit JSON records")
+    args = parser.parse_args()
+
+    records = [bench(args, cascade) for cascade in (False, True)]
+    single, cascaded = records
+    cascaded["model_time_saving"] = (
+        single["model_s_per_video"] / cascaded["model_s_per_video"]
+    )
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    print(
+        f"{'mode':<9}{'frames':>7}{'wall s':>9}{'model s':>9}"
+        f"{SMALL + ' req':>15}{LARGE + ' req':>11}"
+    )
+    for r in records:
+        print(
+            f"{r['mode']:<9}{r['frames']:>7}{r['wall_s_per_video']:>9.2f}"
+            f"{r['model_s_per_video']:>9.2f}{r['requests'][SMALL]:>15}"
+            f"{r['requests'][LARGE]:>11}"
+        )
+    print(f"Model time per video: {cascaded['model_time_saving']:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
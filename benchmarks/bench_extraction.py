@@ -0,0 +1,79 @@
+"""Compare frame extraction strategies on the videos in videos/.
+
+Usage:
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --frames 5 10 50 --repeat 5 --json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from src.frame_reader import AUTO, KEYFRAME, SEEK, SEQUENTIAL, read_frames
+
+VIDEOS_DIR = Path(__file__).parent.parent / "videos"
+STRATEGIES = (SEEK, SEQUENTIAL, KEYFRAME, AUTO)
+
+
+def time_strategy(
+    video_path: Path, num_frames: int, strategy: str, repeat: int
+) -> dict:
+    """Time one strategy on one video.
+
+    Args:
+        video_path: Video to decode
+        num_frames: Number of frames to sample
+        strategy: Extraction strategy name
+        repeat: Number of timed runs
+
+    Returns:
+        Benchmark record with median/min seconds and frames extracted
+    """
+    timings = []
+    extracted = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extracted = sum(1 for _ in read_frames(video_path, num_frames, strategy))
+        timings.append(time.perf_counter() - start)
+    return {
+        "video": video_path.name,
+        "frames": num_frames,
+        "strategy": strategy,
+        "extracted": extracted,
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+    }
+
+
+def main():
+    """Run the extraction benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=Path, default=VIDEOS_DIR)
+    parser.add_argument("--frames", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Emit JSON records")
+    args = parser.parse_args()
+
+    records = [
+        time_strategy(video, num_frames, strategy, args.repeat)
+        for video in sorted(args.videos.glob("*.mp4"))
+        for num_frames in args.frames
+        for strategy in STRATEGIES
+    ]
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    print(f"{'video':<16}{'frames':>7}  {'strategy':<11}{'got':>5}{'median ms':>11}")
+    for r in records:
+        print(
+            f"{r['video']:<16}{r['frames']:>7}  {r['strategy']:<11}"
+            f"{r['extracted']:>5}{r['median_s'] * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
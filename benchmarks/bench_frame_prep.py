@@ -0,0 +1,144 @@
+"""Compare frame preparation settings: payload size, latency and accuracy.
+
+Payload bytes and encode time are measured offline. With --analyze each
+setting is also run against a live model on the labelled videos listed
+in results/metrics/experiment_metrics.json, reporting latency and
+accuracy.
+
+Usage:
+    python -m benchmarks.bench_frame_prep
+    python -m benchmarks.bench_frame_prep --analyze --model llava --json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from src.agent import VideoFraudDetectionAgent
+from src.frame_prep import GRAY, WEBP, FramePrep
+from src.frame_reader import read_frames
+from src.models import Frame
+
+ROOT = Path(__file__).parent.parent
+VIDEOS_DIR = ROOT / "videos"
+LABELS = ROOT / "results" / "metrics" / "experiment_metrics.json"
+
+SETTINGS = {
+    "full": FramePrep(max_side=None, quality=95),
+    "1568px q85": FramePrep(max_side=1568),
+    "1024px q85": FramePrep(max_side=1024),
+    "672px q85": FramePrep(max_side=672),
+    "672px q60": FramePrep(max_side=672, quality=60),
+    "672px webp": FramePrep(max_side=672, image_format=WEBP, quality=80),
+    "672px gray": FramePrep(max_side=672, color=GRAY),
+    "448px q85": FramePrep(max_side=448),
+}
+
+
+def load_labels(labels_path: Path) -> dict[str, str]:
+    """Map video file names to their ground-truth verdict values."""
+    dataset = json.loads(labels_path.read_text())["dataset"]
+    return {v["file"]: v["ground_truth"].lower() for v in dataset["videos"]}
+
+
+def bench_setting(
+    name: str,
+    prep: FramePrep,
+    decoded: dict[str, list],
+    labels: dict[str, str],
+    agent: VideoFraudDetectionAgent | None,
+) -> dict:
+    """Encode every decoded frame with one setting, optionally analyzing.
+
+    Args:
+        name: Setting label
+        prep: Frame preparation under test
+        decoded: Video name -> list of (frame index, decoded frame)
+        labels: Video name -> ground-truth verdict value
+        agent: Agent used to analyze each video, or None for offline only
+
+    Returns:
+        Benchmark record for the setting
+    """
+    payloads, encode_times, latencies = [], [], []
+    correct = 0
+    for video, frames in decoded.items():
+        start = time.perf_counter()
+        encoded = [
+            Frame(idx, f"frame_{i:04d}{prep.extension}", prep.encode(image))
+            for i, (idx, image) in enumerate(frames)
+        ]
+        encode_times.append(time.perf_counter() - start)
+        payloads.extend(len(frame.data) for frame in encoded)
+        if agent is not None:
+            start = time.perf_counter()
+            result = agent.analyze_extracted_frames(encoded)
+            latencies.append(time.perf_counter() - start)
+            correct += result.verdict.value == labels.get(video)
+
+    record = {
+        "setting": name,
+        **asdict(prep),
+        "mean_payload_kb": statistics.mean(payloads) / 1024,
+        "encode_ms_per_video": statistics.mean(encode_times) * 1000,
+    }
+    if agent is not None:
+        record["median_latency_s"] = statistics.median(latencies)
+        record["accuracy"] = correct / len(decoded)
+    return record
+
+
+def main():
+    """Run the frame preparation benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=Path, default=VIDEOS_DIR)
+    parser.add_argument("--labels", type=Path, default=LABELS)
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--analyze", action="store_true", help="Query the model")
+    parser.add_argument("--provider", default="ollama")
+    parser.add_argument("--model", default="llava")
+    parser.add_argument("--json", action="store_true", help="Emit JSON records")
+    args = parser.parse_args()
+
+    labels = load_labels(args.labels)
+    decoded = {
+        video: list(read_frames(args.videos / video, args.frames))
+        for video in labels
+        if (args.videos / video).exists()
+    }
+    agent = None
+    if args.analyze:
+        agent = VideoFraudDetectionAgent(args.provider, args.model, verbose=False)
+
+    try:
+        records = [
+            bench_setting(name, prep, decoded, labels, agent)
+            for name, prep in SETTINGS.items()
+        ]
+    finally:
+        if agent is not None:
+            agent.close()
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    header = f"{'setting':<13}{'payload KB':>11}{'encode ms':>11}"
+    if args.analyze:
+        header += f"{'latency s':>11}{'accuracy':>10}"
+    print(header)
+    for r in records:
+        line = (
+            f"{r['setting']:<13}{r['mean_payload_kb']:>11.1f}"
+            f"{r['encode_ms_per_video']:>11.1f}"
+        )
+        if args.analyze:
+            line += f"{r['median_latency_s']:>11.2f}{r['accuracy']:>10.0%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Compare response parsers on a corpus of model responses.
+
+Measures throughput and how many responses yield a verdict object for
+the tolerant parser in src/parsing.py and for the previous one, which
+decoded the text between the first ``{`` and the last ``}``.
+
+The default corpus, benchmarks/responses.jsonl, holds single-frame
+responses in the shapes local vision models produce: clean structured
+output, pretty-printed, fenced or wrapped in prose, with trailing commas,
+percentage strings, fractions, out-of-range confidences and truncation.
+Any JSON Lines file of Ollama /api/generate responses works as a corpus,
+so real responses can be recorded with e.g.
+``curl -s localhost:11434/api/generate -d @request.json >> corpus.jsonl``.
+
+Usage:
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --corpus corpus.jsonl --repeat 2000 --json
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from src.models import AnalysisResult, Verdict
+from src.parsing import VERDICT_MAP, parse_llm_response
+
+CORPUS = Path(__file__).parent / "responses.jsonl"
+
+
+def legacy_parse(response: str) -> AnalysisResult:
+    """Parse a response the way the agent did before the tolerant parser."""
+    try:
+        start, end = response.find("{"), response.rfind("}") + 1
+        if start < 0 or end <= start:
+            raise ValueError("No JSON object in response")
+        data = json.loads(response[start:end])
+        return AnalysisResult(
+            verdict=VERDICT_MAP.get(data.get("verdict"), Verdict.UNCERTAIN),
+            confidence=float(data.get("confidence", 50)) / 100.0,
+            reasoning=data.get("reasoning", "No reasoning provided"),
+            indicators=data.get("indicators", []),
+            recommendations=data.get("recommendations", []),
+        )
+    except (json.JSONDecodeError, KeyError, ValueError, AttributeError):
+        return AnalysisResult(Verdict.UNCERTAIN, 0.0, response, [], [])
+
+
+# The tolerant parser is timed without its stage-timing wrapper, whose
+# cost is the same whichever parser it wraps
+PARSERS: dict[str, Callable[[str], AnalysisResult]] = {
+    "legacy": legacy_parse,
+    "tolerant": parse_llm_response.__wrapped__,
+}
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Read the response text of every JSON Lines record in a corpus."""
+    with open(path) as f:
+        return [json.loads(line)["response"] for line in f if line.strip()]
+
+
+def is_usable(result: AnalysisResult) -> bool:
+    """Check whether a result is a verdict rather than the parse fallback.
+
+    Results outside 0.0-1.0 (the legacy parser does not clamp) count as
+    unusable.
+    """
+    parsed = result.verdict != Verdict.UNCERTAIN or result.confidence > 0
+    return parsed and 0.0 <= result.confidence <= 1.0
+
+
+def bench_parser(name: str, corpus: list[str], repeat: int) -> dict:
+    """Parse the corpus ``repeat`` times with one parser.
+
+    Args:
+        name: Key of the parser in PARSERS
+        corpus: Response texts
+        repeat: Passes over the corpus
+
+    Returns:
+        Benchmark record with throughput and the share of usable results
+    """
+    parse = PARSERS[name]
+    usable = sum(is_usable(parse(response)) for response in corpus)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in corpus:
+            parse(response)
+    elapsed = time.perf_counter() - start
+    parsed = repeat * len(corpus)
+    return {
+        "parser": name,
+        "responses": len(corpus),
+        "usable": usable,
+        "usable_rate": usable / len(corpus),
+        "per_second": parsed / elapsed,
+        "mean_us": elapsed / parsed * 1e6,
+        "mb_per_second": repeat * sum(map(len, corpus)) / elapsed / 1e6,
+    }
+
+
+def main():
+    """Run the parser benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="Emit JSON records")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    records = [bench_parser(name, corpus, args.repeat) for name in PARSERS]
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    print(f"{'parser':<10}{'usable':>10}{'responses/s':>14}{'mean us':>10}{'MB/s':>8}")
+    for r in records:
+        print(
+            f"{r['parser']:<10}{r['usable']:>5}/{r['responses']:<4}"
+            f"{r['per_second']:>14,.0f}{r['mean_us']:>10.1f}"
+            f"{r['mb_per_second']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
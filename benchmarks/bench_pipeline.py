@@ -0,0 +1,348 @@
+"""Offline throughput benchmark of the analysis pipeline.
+
+Starts local fake Ollama servers (see benchmarks.fake_ollama) and drives
+frame extraction, analyze_frame, analyze_video and the CLI against them
+across frame counts and concurrency levels. With ``--hosts N`` requests
+are balanced over N servers, each generating ``--parallel`` at a time.
+Each scenario runs in a fresh process so its peak RSS is measured in
+isolation. Results are written as JSON tagged with the git commit, so
+runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --frames 5 20 --concurrency 1 4 \
+        --latency 0.2 --jitter 0.05 --output after.json
+    python -m benchmarks.bench_pipeline --scenarios analyze_video \
+        --concurrency 4 --parallel 1 --hosts 4
+    python -m benchmarks.bench_pipeline --compare before.json after.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from multiprocessing import get_context
+from pathlib import Path
+
+from benchmarks.fake_ollama import FakeOllamaServer
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_VIDEO = ROOT / "videos" / "video_4.mp4"
+SCENARIOS = ("extract_disk", "extract_memory", "analyze_frame", "analyze_video", "cli")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """Peak resident set size of this process (or its children) in MiB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _summarize(latencies: list[float], frames: int, elapsed: float) -> dict:
+    return {
+        "runs": len(latencies),
+        "frames_per_s": frames / elapsed if elapsed else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+    }
+
+
+def bench_extract(video: Path, frames: int, in_memory: bool, repeat: int) -> dict:
+    """Time frame extraction to disk or to memory."""
+    from src.video_utils import (
+        cleanup_temp_files,
+        extract_frames,
+        extract_frames_in_memory,
+    )
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if in_memory:
+            extract_frames_in_memory(video, frames)
+        else:
+            _, temp_dir = extract_frames(video, frames)
+            cleanup_temp_files(temp_dir)
+        latencies.append(time.perf_counter() - start)
+    record = _summarize(latencies, frames * repeat, sum(latencies))
+    return {**record, "peak_rss_mb": peak_rss_mb()}
+
+
+def _client(urls: list[str], concurrency: int):
+    from src.balancer import EndpointPool
+    from src.providers import OllamaClient
+
+    return OllamaClient(pool_size=max(10, concurrency), endpoints=EndpointPool(urls))
+
+
+def bench_analyze_frame(
+    urls: list[str], video: Path, requests: int, concurrency: int
+) -> dict:
+    """Issue analyze_frame calls for one frame from ``concurrency`` threads."""
+    from src.agent import VideoFraudDetectionAgent
+    from src.video_utils import extract_frames_in_memory
+
+    frame = extract_frames_in_memory(video, 1)[0]
+    agent = VideoFraudDetectionAgent(
+        ollama_client=_client(urls, concurrency), verbose=False
+    )
+
+    def timed_call(_):
+        start = time.perf_counter()
+        try:
+            agent.analyze_frame(frame)
+            failed = False
+        except Exception:
+            failed = True
+        return time.perf_counter() - start, failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        outcomes = list(pool.map(timed_call, range(requests)))
+    elapsed = time.perf_counter() - start
+    agent.close()
+
+    record = _summarize([t for t, _ in outcomes], requests, elapsed)
+    errors = sum(failed for _, failed in outcomes)
+    return {**record, "errors": errors, "peak_rss_mb": peak_rss_mb()}
+
+
+def bench_analyze_video(
+    urls: list[str], video: Path, frames: int, concurrency: int, repeat: int
+) -> dict:
+    """Time analyze_video end to end."""
+    from src.agent import VideoFraudDetectionAgent
+
+    agent = VideoFraudDetectionAgent(
+        ollama_client=_client(urls, concurrency),
+        max_concurrency=concurrency,
+        verbose=False,
+    )
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        agent.analyze_video(video, frames)
+        latencies.append(time.perf_counter() - start)
+    agent.close()
+    record = _summarize(latencies, frames * repeat, sum(latencies))
+    return {**record, "peak_rss_mb": peak_rss_mb()}
+
+
+def bench_cli(
+    urls: list[str], video: Path, frames: int, concurrency: int, repeat: int
+) -> dict:
+    """Time the CLI as a subprocess, including interpreter start-up."""
+    command = [
+        sys.executable,
+        "-m",
+        "src.main",
+        "--video",
+        str(video),
+        "--frames",
+        str(frames),
+        "--concurrency",
+        str(concurrency),
+        "--no-cache",
+        "--json",
+    ]
+    env = {**os.environ, "OLLAMA_HOSTS": ",".join(urls)}
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True, capture_output=True)
+        latencies.append(time.perf_counter() - start)
+    record = _summarize(latencies, frames * repeat, sum(latencies))
+    return {**record, "peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN)}
+
+
+def plan(args: argparse.Namespace, urls: list[str]) -> list[tuple[dict, object, tuple]]:
+    """List (labels, function, arguments) for every selected scenario."""
+    runs = []
+    for scenario in args.scenarios:
+        for frames in args.frames:
+            if scenario in ("extract_disk", "extract_memory"):
+                in_memory = scenario == "extract_memory"
+                labels = {"scenario": scenario, "frames": frames, "concurrency": 1}
+                call = (args.video, frames, in_memory, args.repeat)
+                runs.append((labels, bench_extract, call))
+                continue
+            for concurrency in args.concurrency:
+                labels = {
+                    "scenario": scenario,
+                    "frames": frames,
+                    "concurrency": concurrency,
+                }
+                if scenario == "analyze_frame":
+                    call = (urls, args.video, frames, concurrency)
+                    runs.append((labels, bench_analyze_frame, call))
+                elif scenario == "analyze_video":
+                    call = (urls, args.video, frames, concurrency, args.repeat)
+                    runs.append((labels, bench_analyze_video, call))
+                else:
+                    call = (urls, args.video, frames, concurrency, args.repeat)
+                    runs.append((labels, bench_cli, call))
+    return runs
+
+
+def git_commit() -> str | None:
+    """Return the current commit hash, suffixed with + if the tree is dirty."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+" if dirty else "")
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    """Run every planned scenario against fresh fake servers."""
+    servers = [
+        FakeOllamaServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            parallel=args.parallel,
+            seed=args.seed + i,
+        )
+        for i in range(args.hosts)
+    ]
+    records = []
+    with ExitStack() as stack:
+        urls = [stack.enter_context(server).url for server in servers]
+        for labels, function, call in plan(args, urls):
+            requests_before = sum(server.requests for server in servers)
+            # A fresh process per scenario keeps peak RSS comparable
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                record = pool.submit(function, *call).result()
+            requests = sum(server.requests for server in servers) - requests_before
+            record = {**labels, **record, "requests": requests}
+            records.append(record)
+            if not args.json:
+                print(_format(record), file=sys.stderr)
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": {
+            "latency_s": args.latency,
+            "jitter_s": args.jitter,
+            "error_rate": args.error_rate,
+            "parallel": args.parallel,
+            "hosts": args.hosts,
+            "seed": args.seed,
+        },
+        "results": records,
+    }
+
+
+def _key(record: dict) -> tuple:
+    return record["scenario"], record["frames"], record["concurrency"]
+
+
+def _format(record: dict) -> str:
+    return (
+        f"{record['scenario']:<15}{record['frames']:>7}{record['concurrency']:>6}"
+        f"{record['frames_per_s']:>10.1f}{record['p50_s']:>9.3f}"
+        f"{record['p95_s']:>9.3f}{record['p99_s']:>9.3f}"
+        f"{record['peak_rss_mb']:>9.0f}"
+    )
+
+
+def compare(before: dict, after: dict) -> None:
+    """Print throughput and p95 changes between two result files."""
+    baseline = {_key(r): r for r in before["results"]}
+    print(f"{before['commit']} -> {after['commit']}")
+    print(f"{'scenario':<15}{'frames':>7}{'conc':>6}{'frames/s':>18}{'p95 s':>20}")
+    for record in after["results"]:
+        old = baseline.get(_key(record))
+        if old is None:
+            continue
+        speedup = record["frames_per_s"] / old["frames_per_s"] - 1
+        p95 = record["p95_s"] - old["p95_s"]
+        print(
+            f"{record['scenario']:<15}{record['frames']:>7}{record['concurrency']:>6}"
+            f"{record['frames_per_s']:>10.1f} ({speedup:+.0%})"
+            f"{record['p95_s']:>11.3f} ({p95:+.3f})"
+        )
+
+
+def main():
+    """Run the pipeline benchmark or compare two result files."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", type=Path, default=DEFAULT_VIDEO)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument(
+        "--frames",
+        type=int,
+        nargs="+",
+        default=[5, 20],
+        help="Frame counts (requests per scenario for analyze_frame)",
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Stdev seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--parallel", type=int, help="Requests each server generates at once"
+    )
+    parser.add_argument("--hosts", type=int, default=1, help="Fake servers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--json", action="store_true", help="Print results JSON")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        type=Path,
+        metavar=("BEFORE", "AFTER"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        before, after = (json.loads(path.read_text()) for path in args.compare)
+        compare(before, after)
+        return
+
+    if not args.json:
+        print(
+            f"{'scenario':<15}{'frames':>7}{'conc':>6}{'frames/s':>10}"
+            f"{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'RSS MB':>9}",
+            file=sys.stderr,
+        )
+    results = run_suite(args)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
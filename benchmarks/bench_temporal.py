@@ -0,0 +1,71 @@
+"""Measure temporal analysis speed against real time, per labelled video.
+
+Runs the temporal analyzer over the labelled videos listed in
+results/metrics/experiment_metrics.json. Reports the processing time as a
+fraction of each video's duration, and the anomaly score and number of
+suspicious segments next to the ground truth.
+
+Usage:
+    python -m benchmarks.bench_temporal
+    python -m benchmarks.bench_temporal --max-fps 30 --json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from benchmarks.bench_frame_prep import LABELS, VIDEOS_DIR, load_labels
+from src.temporal import MAX_ANALYSIS_FPS, analyze_temporal
+
+
+def bench_video(path: Path, truth: str, max_fps: float) -> dict:
+    """Analyze one video, timing the whole pass including decoding."""
+    start = time.perf_counter()
+    report = analyze_temporal(path, max_fps=max_fps)
+    elapsed = time.perf_counter() - start
+    return {
+        "video": path.name,
+        "ground_truth": truth,
+        "duration_s": report.duration,
+        "elapsed_s": elapsed,
+        "realtime_fraction": elapsed / report.duration if report.duration else 0.0,
+        "frames": report.frames_analyzed,
+        "anomaly_score": report.anomaly_score,
+        "segments": len(report.segments),
+    }
+
+
+def main():
+    """Run the temporal analysis benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=Path, default=VIDEOS_DIR)
+    parser.add_argument("--labels", type=Path, default=LABELS)
+    parser.add_argument("--max-fps", type=float, default=MAX_ANALYSIS_FPS)
+    parser.add_argument("--json", action="store_true", help="Emit JSON records")
+    args = parser.parse_args()
+
+    records = [
+        bench_video(args.videos / video, truth, args.max_fps)
+        for video, truth in load_labels(args.labels).items()
+        if (args.videos / video).exists()
+    ]
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    print(
+        f"{'video':<14}{'truth':<14}{'video s':>9}{'elapsed s':>11}"
+        f"{'x realtime':>12}{'anomaly':>9}{'segments':>10}"
+    )
+    for r in records:
+        print(
+            f"{r['video']:<14}{r['ground_truth']:<14}{r['duration_s']:>9.1f}"
+            f"{r['elapsed_s']:>11.2f}{r['realtime_fraction']:>12.2f}"
+            f"{r['anomaly_score']:>9.1%}{r['segments']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""In-process stub of the Ollama HTTP API for offline benchmarks.
+
+Serves ``POST /api/generate`` (plain, NDJSON-streamed and preload) and
+``GET /api/tags`` with configurable latency, jitter, error rate, model
+load time, parallelism and canned responses (optionally per model, to
+stand in for a cascade of small and large models), so the agent can be
+benchmarked without a model. Several servers stand in for a pool of
+Ollama hosts.
+
+Usage:
+    with FakeOllamaServer(latency=0.2, jitter=0.05) as server:
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=server.url)
+        )
+"""
+
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.providers import model_matches
+
+DEFAULT_RESPONSES = (
+    {
+        "verdict": "AI_GENERATED",
+        "confidence": 88,
+        "reasoning": "Skin texture is unnaturally smooth and lighting is flat.",
+        "indicators": ["smooth skin", "flat lighting"],
+        "recommendations": ["Check adjacent frames"],
+    },
+    {
+        "verdict": "AUTHENTIC",
+        "confidence": 74,
+        "reasoning": "Natural sensor noise and consistent shadows.",
+        "indicators": ["sensor noise"],
+        "recommendations": [],
+    },
+)
+
+_PACKED_COUNT = re.compile(r"these (\d+) video frames")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY every
+    # response waits ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path != "/api/tags":
+            self._send_json(404, {"error": "not found"})
+            return
+        models = [{"name": name} for name in self.server.fake.models]
+        self._send_json(200, {"models": models})
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        model = body["model"]
+        if not any(model_matches(name, model) for name in fake.models):
+            self._send_json(404, {"error": f'model "{model}" not found'})
+            return
+        load = fake.load(model, body.get("keep_alive"))
+        if not body.get("prompt") and not body.get("images"):
+            fake.preloads += 1
+            message = {"model": model, "response": "", "done": True}
+            timing = {
+                "total_duration": int(load * 1e9),
+                "load_duration": int(load * 1e9),
+            }
+            self._send_json(200, {**message, "done_reason": "load", **timing})
+            return
+        with fake.slots:
+            self._generate(body, load)
+
+    def _generate(self, body: dict, load: float) -> None:
+        fake = self.server.fake
+        fake.formats.append(body.get("format"))
+        fake.generated.append(body["model"])
+        delay, fail = fake.next_outcome(body["model"])
+        time.sleep(delay)
+        if fail:
+            self._send_json(500, {"error": "injected failure"})
+            return
+        text = fake.response_text(body.get("prompt", ""), body["model"])
+        stats = {
+            "total_duration": int((load + delay) * 1e9),
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": 600 * len(body.get("images", [])),
+            "prompt_eval_duration": int(delay * 0.7e9),
+            "eval_count": len(text) // 4,
+            "eval_duration": int(delay * 0.3e9),
+        }
+        if body.get("stream"):
+            self._send_stream(body["model"], text, stats)
+        else:
+            message = {"model": body["model"], "response": text, "done": True}
+            self._send_json(200, {**message, **stats})
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model: str, text: str, stats: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        step = self.server.fake.stream_chunk_chars
+        lines = [
+            {"model": model, "response": text[i : i + step], "done": False}
+            for i in range(0, len(text), step)
+        ]
+        lines.append({"model": model, "response": "", "done": True, **stats})
+        try:
+            for line in lines:
+                data = json.dumps(line).encode() + b"\n"
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                time.sleep(self.server.fake.stream_chunk_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.fake.cancelled += 1
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping pooled keep-alive connections is expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeOllamaServer:
+    """Threaded stub Ollama server listening on localhost.
+
+    Attributes:
+        latency: Mean seconds before each generate response
+        jitter: Standard deviation of the latency in seconds
+        error_rate: Fraction of generate requests answered with HTTP 500
+        load_time: Seconds the first request for each model spends loading
+        parallel: Requests generated at once; others queue, like Ollama's
+            OLLAMA_NUM_PARALLEL. None serves every request at once
+        models: Model names reported by /api/tags
+        stream_chunk_chars: Characters per streamed NDJSON line
+        stream_chunk_delay: Seconds between streamed lines
+        requests: Number of generate requests received, excluding preloads
+        preloads: Number of preload requests (no prompt or images)
+        errors: Number of injected failures
+        cancelled: Number of streams the client closed early
+        keep_alive: keep_alive value of every generate request, None when
+            it was omitted
+        formats: ``format`` (output schema) of every generate request
+            that produced output, None when it was omitted
+        generated: Model name of every generate request
+        model_latency: Mean latency per model, overriding ``latency``
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        load_time: float = 0.0,
+        parallel: int | None = None,
+        responses: list[dict | str] | None = None,
+        models: tuple[str, ...] = ("llava:latest",),
+        model_latency: dict[str, float] | None = None,
+        model_responses: dict[str, list[dict | str]] | None = None,
+        stream_chunk_chars: int = 8,
+        stream_chunk_delay: float = 0.0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        """Configure the server; call ``start()`` or use it as a context.
+
+        Args:
+            latency: Mean seconds before each generate response
+            jitter: Standard deviation of the latency in seconds
+            error_rate: Fraction of generate requests failing with HTTP 500
+            load_time: Seconds added to the first request for each model,
+                reported as its ``load_duration``
+            parallel: Requests generated at once; None for no limit
+            responses: Canned model outputs (dicts are JSON-encoded), served
+                in rotation; defaults to alternating verdicts
+            models: Model names reported by /api/tags
+            model_latency: Mean latency of the models named, overriding
+                ``latency`` for them
+            model_responses: Canned outputs of the models named, served
+                in their own rotation instead of ``responses``
+            stream_chunk_chars: Characters per streamed NDJSON line
+            stream_chunk_delay: Seconds between streamed lines
+            seed: Seed for latency and failure sampling
+            port: Port to bind (0 picks a free one)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.load_time = load_time
+        self.parallel = parallel
+        self.slots = threading.Semaphore(parallel) if parallel else nullcontext()
+        self.models = models
+        self.model_latency = model_latency or {}
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_chunk_delay = stream_chunk_delay
+        self.requests = 0
+        self.preloads = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.keep_alive: list[str | int | None] = []
+        self.formats: list[str | dict | None] = []
+        self.generated: list[str] = []
+        self._loaded: set[str] = set()
+        self._rotation = _rotation(responses or DEFAULT_RESPONSES)
+        self._model_rotations = {
+            name: _rotation(canned) for name, canned in (model_responses or {}).items()
+        }
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.fake = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def load(self, model: str, keep_alive: str | int | None) -> float:
+        """Record a request's keep_alive and load the model if needed.
+
+        Returns:
+            Seconds spent loading, 0.0 when the model was already loaded
+        """
+        with self._lock:
+            self.keep_alive.append(keep_alive)
+            cold = model not in self._loaded
+            self._loaded.add(model)
+        if cold and self.load_time:
+            time.sleep(self.load_time)
+            return self.load_time
+        return 0.0
+
+    def next_outcome(self, model: str = "") -> tuple[float, bool]:
+        """Draw the delay and failure flag of the next generate request."""
+        latency = _for_model(self.model_latency, model, self.latency)
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._random.gauss(latency, self.jitter))
+            fail = self._random.random() < self.error_rate
+            self.errors += fail
+        return delay, fail
+
+    def response_text(self, prompt: str, model: str = "") -> str:
+        """Return the next canned response, packed if the prompt asks."""
+        rotation = _for_model(self._model_rotations, model, self._rotation)
+        with self._lock:
+            text = next(rotation)
+        match = _PACKED_COUNT.search(prompt)
+        if not match:
+            return text
+        try:
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            return text
+        frames = [{**entry, "frame": i + 1} for i in range(int(match.group(1)))]
+        return json.dumps({"frames": frames, "temporal_indicators": []})
+
+    def start(self) -> "FakeOllamaServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _rotation(responses) -> "itertools.cycle[str]":
+    """Cycle through canned responses, JSON-encoding dicts."""
+    return itertools.cycle(
+        [r if isinstance(r, str) else json.dumps(r) for r in responses]
+    )
+
+
+def _for_model(values: dict, model: str, default):
+    """Return the value configured for a requested model, or the default."""
+    for name, value in values.items():
+        if model_matches(name, model):
+            return value
+    return default
@@ -4,13 +4,77 @@ A security expert agent specialized in investigating video frauds
 and detecting AI-generated video content.
 """
 
+import asyncio
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import accumulate
 from pathlib import Path
 
-from .models import AnalysisResult, Verdict
-from .parsing import aggregate_results, parse_llm_response
-from .providers import query_anthropic, query_ollama, query_openai
-from .video_utils import cleanup_temp_files, extract_frames
+import cv2
+
+from .aggregation import VotingPolicy
+from .async_providers import AsyncOllamaClient
+from .cache import VerdictCache
+from .cascade import (
+    CascadeTier,
+    escalate,
+    escalate_async,
+    escalate_pack,
+    escalate_pack_async,
+)
+from .checkpoint import VideoCheckpoint
+from .concurrency import (
+    analyze_concurrently,
+    analyze_concurrently_async,
+    analyze_or_fail,
+    analyze_pack_or_fail,
+    analyze_packs_concurrently,
+    analyze_packs_concurrently_async,
+)
+from .dedup import deduplicate_frames
+from .early_exit import (
+    EarlyStopPolicy,
+    analyze_until_decided,
+    analyze_until_decided_async,
+    informative_order,
+)
+from .frame_prep import FramePrep, prep_for
+from .frame_reader import AUTO, EXTRACTION_STRATEGIES
+from .metrics import (
+    DECODE,
+    FRAME,
+    VIDEO,
+    bind_context,
+    span,
+    timing_scope,
+)
+from .models import AnalysisResult, Frame
+from .packing import (
+    PACK_IMAGES,
+    PACKING_MODES,
+    query_pack,
+    query_pack_async,
+    split_packs,
+)
+from .parsing import (
+    ANALYSIS_SCHEMA,
+    MULTI_FRAME_SCHEMA,
+    aggregate_results,
+    is_parsed,
+    parse_llm_response,
+)
+from .providers import KeepAlive, OllamaClient, query_anthropic, query_openai
+from .sampling import SAMPLING_MODES, UNIFORM
+from .streaming import VERDICT_FIELDS, aread_streamed_json, read_streamed_json
+from .temporal import analyze_temporal, attach_report
+from .video_utils import (
+    cleanup_temp_files,
+    extract_frames,
+    extract_frames_in_memory,
+)
+from .warmup import WarmupReport, warm_up
 
 
 class VideoFraudDetectionAgent:
@@ -22,35 +86,256 @@ class VideoFraudDetectionAgent:
     Attributes:
         model_provider: The LLM provider ('ollama', 'openai', 'anthropic')
         model_name: The specific model to use
+        max_concurrency: Maximum number of frames analyzed in parallel
+        ollama_client: Pooled HTTP client used for every Ollama request
+        in_memory_frames: Whether video frames are kept in memory
+        extraction_strategy: How sampled frames are decoded from video
+        cache: Persistent per-frame verdict cache, or None
+        dedup_threshold: Hamming distance for merging similar frames, or None
+        sampling: How the frame budget is spread over the video
+        early_stop: Policy for skipping frames once the verdict is settled
+        voting: How frame verdicts are weighted into the video verdict
+        frame_prep: How frames and images are downscaled and encoded
+        frames_per_request: Number of frames packed into each model request
+        packing: How packed frames are sent ('images' or 'mosaic')
+        stream_responses: Whether Ollama responses are streamed
+        cancel_after_verdict: Whether generation stops once the verdict
+            and confidence are parsed
+        keep_alive: How long Ollama keeps the model loaded after each
+            request, or None for the server default
+        structured_output: Whether Ollama output is constrained to the
+            verdict JSON schema
+        features: Whether spectral and compression artifact features of
+            in-memory video frames are attached to results
+        temporal: Whether videos get a temporal consistency analysis
+        cascade: Model tiers each frame escalates through, or None
+        warmup_reports: Cold versus warm latency of each server from the
+            last warm-up; empty if the agent was never warmed up
+        verbose: Whether progress messages are printed
     """
 
-    def __init__(self, model_provider: str = "ollama", model_name: str = "llava"):
+    def __init__(
+        self,
+        model_provider: str = "ollama",
+        model_name: str = "llava",
+        max_concurrency: int = 1,
+        ollama_client: OllamaClient | None = None,
+        in_memory_frames: bool = True,
+        extraction_strategy: str = AUTO,
+        cache: VerdictCache | None = None,
+        dedup_threshold: int | None = None,
+        sampling: str = UNIFORM,
+        early_stop: EarlyStopPolicy | None = None,
+        voting: VotingPolicy | None = None,
+        frame_prep: FramePrep | None = None,
+        frames_per_request: int = 1,
+        packing: str = PACK_IMAGES,
+        stream_responses: bool = False,
+        cancel_after_verdict: bool = False,
+        keep_alive: KeepAlive | None = None,
+        warm_up: bool = False,
+        structured_output: bool = False,
+        features: bool = False,
+        temporal: bool = False,
+        cascade: list[CascadeTier] | None = None,
+        verbose: bool = True,
+    ):
         """Initialize the video fraud detection agent.
 
         Args:
             model_provider: The LLM provider ('ollama', 'openai', 'anthropic')
             model_name: The specific model to use
+            max_concurrency: Maximum number of frames analyzed in parallel.
+                A value of 1 analyzes frames sequentially.
+            ollama_client: Client holding the pooled keep-alive session
+                reused for the agent's lifetime. Defaults to a client
+                with at least ``max_concurrency`` pooled connections. Its
+                endpoint pool, retry policy and hedging settings are
+                shared by the async path.
+            in_memory_frames: Encode sampled video frames in memory. When
+                False, frames are written to a temp directory (debugging).
+            extraction_strategy: Frame decoding strategy ('auto', 'seek',
+                'sequential', 'keyframe'); 'auto' picks seeking or a single
+                sequential pass from the sample density.
+            cache: Verdict cache consulted before every model query. Hits
+                skip the model; parsed responses are stored on misses.
+            dedup_threshold: When set, sampled frames whose perceptual
+                hashes differ by at most this many bits (of 64) are sent
+                to the model once and weighted by group size. None
+                disables deduplication.
+            sampling: 'uniform' spaces frames evenly; 'scene' makes one
+                cheap pass to find shot boundaries and motion, then spreads
+                the budget across scenes and high-motion regions.
+            early_stop: When set, frames are analyzed in an order that
+                covers the whole video first (in batches of
+                ``max_concurrency``) and the rest are skipped once the
+                policy is satisfied. None analyzes every frame.
+            voting: Weighting of frame votes in the video verdict
+                (confidence, recency) and how many indicators are kept.
+                Defaults to one vote per frame.
+            frame_prep: Downscaling and encoding applied to every frame
+                and image before upload. Defaults to the profile for the
+                provider and model, or of the last cascade tier (see
+                frame_prep.PREP_PROFILES).
+            frames_per_request: Video frames sent together in one request
+                with a prompt asking for one verdict per frame. Values
+                above 1 pay the prompt prefill once per group and let the
+                model compare frames. Single images always use one request.
+            packing: 'images' sends each packed frame as its own entry of
+                the request's image list; 'mosaic' tiles them into one
+                labelled image, fitted to the frame_prep size as a whole.
+            stream_responses: Consume Ollama's NDJSON token stream and
+                parse the verdict object incrementally.
+            cancel_after_verdict: Stream single-frame responses and close
+                the connection as soon as "verdict" and "confidence" are
+                parsed, so Ollama stops generating the reasoning. Results
+                then carry no reasoning or indicators, and are cached
+                apart from full responses.
+            keep_alive: Sent with every Ollama request so the model stays
+                loaded between frames and videos; a duration string
+                ("30m") or seconds (-1 keeps it loaded indefinitely).
+                None leaves Ollama's default (5 minutes).
+            warm_up: Check the model is installed and load it before
+                returning, so the first frame doesn't pay the load time.
+                See ``warm_up()``.
+            structured_output: Send Ollama the JSON schema of the expected
+                verdict object (derived from AnalysisResult) as its
+                ``format``, so every response decodes as that object.
+                Other providers are unaffected.
+            features: Score FFT/DCT high-frequency energy, upsampling
+                grid peaks, blockiness and color statistics of every
+                sampled frame locally (see features). Frame results carry
+                their scores and video results the mean over frames.
+                Requires in_memory_frames.
+            temporal: Decode each analyzed video once more at reduced
+                resolution, alongside the model requests, and score frame
+                difference, optical flow and face flicker over time (see
+                temporal). Video results carry the report and list the
+                strongest suspicious segments as indicators. If the
+                analysis fails, the result keeps its frame verdicts and
+                its reasoning notes the failure.
+            cascade: Tiers tried in order for every frame (see cascade),
+                replacing model_provider and model_name for requests. A
+                frame is escalated to the next tier when its verdict is
+                UNCERTAIN or below the tier's confidence threshold; the
+                last tier always decides. Results count the frames each
+                tier decided. None queries the single model.
+            verbose: Print per-frame progress messages to stdout
+
+        Raises:
+            ValueError: If max_concurrency or frames_per_request is less
+                than 1, the extraction strategy, sampling mode or packing
+                mode is unknown, the cascade is empty, features is set
+                without in_memory_frames, or warm_up is set and a model is
+                not installed
         """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        if extraction_strategy not in EXTRACTION_STRATEGIES:
+            raise ValueError(f"Unknown extraction strategy: {extraction_strategy}")
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode: {sampling}")
+        if frames_per_request < 1:
+            raise ValueError(
+                f"frames_per_request must be >= 1, got {frames_per_request}"
+            )
+        if packing not in PACKING_MODES:
+            raise ValueError(f"Unknown packing mode: {packing}")
+        if cascade is not None and not cascade:
+            raise ValueError("cascade needs at least one tier")
+        if features and not in_memory_frames:
+            raise ValueError("features requires in_memory_frames")
         self.model_provider = model_provider
         self.model_name = model_name
-        self._temp_dir: str | None = None
+        self.max_concurrency = max_concurrency
+        self.in_memory_frames = in_memory_frames
+        self.extraction_strategy = extraction_strategy
+        self.cache = cache
+        self.dedup_threshold = dedup_threshold
+        self.sampling = sampling
+        self.early_stop = early_stop
+        self.voting = voting or VotingPolicy()
+        self.frames_per_request = frames_per_request
+        self.packing = packing
+        self.stream_responses = stream_responses or cancel_after_verdict
+        self.cancel_after_verdict = cancel_after_verdict
+        self.keep_alive = keep_alive
+        self.structured_output = structured_output
+        self.features = features
+        self.temporal = temporal
+        self.cascade = list(cascade) if cascade is not None else None
+        # None stands for the single model_provider/model_name
+        self._tiers: list[CascadeTier | None] = self.cascade or [None]
+        self.frame_prep = frame_prep or prep_for(*self._model(self._tiers[-1]))
+        self.warmup_reports: list[WarmupReport] = []
+        self.verbose = verbose
+        self._request_pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self.ollama_client = ollama_client or OllamaClient(
+            pool_size=max(10, max_concurrency)
+        )
+        client = self.ollama_client
+        self._async_ollama = AsyncOllamaClient(
+            timeout=client.read_timeout,
+            max_connections=client.pool_size * len(client.endpoints.hosts),
+            endpoints=client.endpoints,
+            retry=client.retry,
+            hedge_percentile=client.hedge_percentile,
+            latencies=client.latencies,
+        )
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self) -> list[WarmupReport]:
+        """Verify the model is installed and load it on every server.
+
+        Sends an empty preload request twice per server: the first pays
+        for loading the model (cold), the second measures a loaded model
+        (warm). With a cascade, every tier's model is loaded. The reports
+        are kept as ``warmup_reports``.
 
-    def analyze_frame(self, frame_path: str | Path) -> AnalysisResult:
+        Returns:
+            One WarmupReport per model and server with the cold and warm
+            latency
+
+        Raises:
+            ValueError: If a provider is not Ollama or a model is not
+                installed on a server
+        """
+        models = [self._model(tier) for tier in self._tiers]
+        for provider, _ in models:
+            if provider != "ollama":
+                raise ValueError(
+                    f"Warm-up is only supported for ollama, not {provider}"
+                )
+        self.warmup_reports = [
+            warm_up(self.ollama_client, model, self.keep_alive, host)
+            for _, model in dict.fromkeys(models)
+            for host in self.ollama_client.endpoints.hosts
+        ]
+        return self.warmup_reports
+
+    def analyze_frame(self, frame_path: str | Path | Frame) -> AnalysisResult:
         """Analyze a single video frame for AI generation indicators.
 
         Args:
-            frame_path: Path to the frame image file
+            frame_path: Path to the frame image file, or an in-memory Frame
 
         Returns:
-            AnalysisResult with verdict and analysis details
+            AnalysisResult with verdict, analysis details and stage timings
         """
-        frame_path = Path(frame_path)
-        if not frame_path.exists():
-            raise FileNotFoundError(f"Frame not found: {frame_path}")
-
-        image_data = self._load_image(frame_path)
-        response = self._query_llm(image_data, frame_path.name)
-        return parse_llm_response(response)
+        with timing_scope() as timings, span(FRAME):
+            if isinstance(frame_path, Frame):
+                result = self._analyze_image(frame_path.data, frame_path.name)
+                _attach_features([frame_path], [result])
+            else:
+                frame_path = Path(frame_path)
+                if not frame_path.exists():
+                    raise FileNotFoundError(f"Frame not found: {frame_path}")
+                image_data = self._load_image(frame_path)
+                result = self._analyze_image(image_data, frame_path.name)
+        result.timings = timings.as_dict()
+        return result
 
     def analyze_video(
         self, video_path: str | Path, sample_frames: int = 5
@@ -58,43 +343,633 @@ class VideoFraudDetectionAgent:
         """Analyze a video file for AI generation indicators.
 
         Extracts frames from the video, analyzes each frame, and returns
-        a single aggregated verdict for the entire video.
+        a single aggregated verdict for the entire video. When the agent
+        was created with ``max_concurrency > 1`` frames are analyzed in
+        parallel and a failing frame is recorded as UNCERTAIN.
+
+        Args:
+            video_path: Path to the video file
+            sample_frames: Number of frames to sample for analysis
+
+        Returns:
+            AnalysisResult with aggregated verdict, analysis and the stage
+            timings of the whole video, extraction included
+        """
+        video_path = Path(video_path)
+        if not video_path.exists():
+            raise FileNotFoundError(f"Video not found: {video_path}")
+
+        temp_dir = None
+        with timing_scope() as timings, span(VIDEO):
+            background = temporal = None
+            if self.temporal:
+                # Runs while the frames are extracted and analyzed
+                background = ThreadPoolExecutor(max_workers=1)
+                temporal = background.submit(bind_context(analyze_temporal), video_path)
+            try:
+                frames, temp_dir = self._extract_frames(video_path, sample_frames)
+                result = self.analyze_extracted_frames(frames)
+            finally:
+                cleanup_temp_files(temp_dir)
+                if background is not None:
+                    background.shutdown(wait=False)
+            if temporal is not None:
+                try:
+                    attach_report(result, temporal.result())
+                except Exception as e:
+                    _temporal_failed(result, e)
+        result.timings = timings.as_dict()
+        return result
+
+    def analyze_extracted_frames(
+        self,
+        frames: list[Frame] | list[Path],
+        checkpoint: VideoCheckpoint | None = None,
+    ) -> AnalysisResult:
+        """Analyze frames already extracted from one video and aggregate them.
+
+        Applies deduplication and early stopping as configured. Safe to
+        call from several threads at once; with ``max_concurrency > 1``
+        all callers share one bounded request pool.
+
+        Args:
+            frames: Frames extracted from a single video
+            checkpoint: When set, in-memory frames already recorded in it
+                are not queried again, each newly analyzed frame is
+                recorded as soon as it completes, and frames without a
+                usable result are counted as failed
+
+        Returns:
+            AnalysisResult with aggregated verdict, analysis and the summed
+            stage timings of its frames
+        """
+        unique_frames, weights = self._deduplicate(frames)
+        analyze_batch = partial(self._analyze_frames, checkpoint=checkpoint)
+        with timing_scope() as timings:
+            if self.early_stop is None:
+                frame_results, used = analyze_batch(unique_frames), weights
+            else:
+                frame_results, used = analyze_until_decided(
+                    analyze_batch,
+                    unique_frames,
+                    weights,
+                    self.early_stop,
+                    self.max_concurrency * self.frames_per_request,
+                    self.voting,
+                )
+        result = self._aggregate(frame_results, used, planned=weights)
+        result.timings = timings.as_dict()
+        return result
+
+    async def analyze_frame_async(
+        self, frame_path: str | Path | Frame
+    ) -> AnalysisResult:
+        """Analyze a single video frame without blocking the event loop.
+
+        Args:
+            frame_path: Path to the frame image file, or an in-memory Frame
+
+        Returns:
+            AnalysisResult with verdict, analysis details and stage timings
+        """
+        with timing_scope() as timings, span(FRAME):
+            if isinstance(frame_path, Frame):
+                result = await self._analyze_image_async(
+                    frame_path.data, frame_path.name
+                )
+                _attach_features([frame_path], [result])
+            else:
+                frame_path = Path(frame_path)
+                if not frame_path.exists():
+                    raise FileNotFoundError(f"Frame not found: {frame_path}")
+                image_data = await asyncio.to_thread(self._load_image, frame_path)
+                result = await self._analyze_image_async(image_data, frame_path.name)
+        result.timings = timings.as_dict()
+        return result
+
+    async def analyze_video_async(
+        self, video_path: str | Path, sample_frames: int = 5
+    ) -> AnalysisResult:
+        """Analyze a video file without blocking the event loop.
+
+        Frame decoding runs in a worker thread and frames are queried
+        concurrently (bounded by ``max_concurrency``) over the agent's
+        shared async HTTP client. Many videos may be analyzed at once
+        on the same agent. A failing frame is recorded as UNCERTAIN.
 
         Args:
             video_path: Path to the video file
             sample_frames: Number of frames to sample for analysis
 
         Returns:
-            AnalysisResult with aggregated verdict and analysis
+            AnalysisResult with aggregated verdict, analysis and stage timings
         """
         video_path = Path(video_path)
         if not video_path.exists():
             raise FileNotFoundError(f"Video not found: {video_path}")
 
+        with timing_scope() as timings, span(VIDEO):
+            temporal = None
+            if self.temporal:
+                temporal = asyncio.create_task(
+                    asyncio.to_thread(analyze_temporal, video_path)
+                )
+            try:
+                frames, temp_dir = await asyncio.to_thread(
+                    self._extract_frames, video_path, sample_frames
+                )
+                try:
+                    frame_results, used, weights = await self._analyze_frames_async(
+                        frames
+                    )
+                finally:
+                    await asyncio.to_thread(cleanup_temp_files, temp_dir)
+            except BaseException:
+                if temporal is not None:
+                    temporal.cancel()
+                raise
+            report = error = None
+            if temporal is not None:
+                try:
+                    report = await temporal
+                except Exception as e:
+                    error = e
+        result = self._aggregate(frame_results, used, planned=weights)
+        if report is not None:
+            attach_report(result, report)
+        elif error is not None:
+            _temporal_failed(result, error)
+        result.timings = timings.as_dict()
+        return result
+
+    async def _analyze_frames_async(
+        self, frames: list[Frame] | list[Path]
+    ) -> tuple[list[AnalysisResult], list[int], list[int]]:
+        """Deduplicate and analyze frames concurrently on the event loop.
+
+        Returns:
+            Tuple of (frame results, weights of the analyzed frames,
+            weights of every planned frame)
+        """
+        unique_frames, weights = self._deduplicate(frames)
+
+        async def analyze_batch(batch):
+            if self.frames_per_request > 1:
+                return await analyze_packs_concurrently_async(
+                    self._analyze_pack_async,
+                    split_packs(batch, self.frames_per_request),
+                    self.max_concurrency,
+                )
+            return await analyze_concurrently_async(
+                self.analyze_frame_async, batch, self.max_concurrency
+            )
+
+        if self.early_stop is None:
+            return await analyze_batch(unique_frames), weights, weights
+        frame_results, used = await analyze_until_decided_async(
+            analyze_batch,
+            unique_frames,
+            weights,
+            self.early_stop,
+            self.max_concurrency * self.frames_per_request,
+            self.voting,
+        )
+        return frame_results, used, weights
+
+    def close(self) -> None:
+        """Release the agent's request pool and pooled HTTP connections."""
+        with self._pool_lock:
+            if self._request_pool is not None:
+                self._request_pool.shutdown()
+                self._request_pool = None
+        self.ollama_client.close()
+
+    async def aclose(self) -> None:
+        """Release the agent's async HTTP connections."""
+        await self._async_ollama.aclose()
+
+    def _extract_frames(
+        self, video_path: Path, sample_frames: int
+    ) -> tuple[list[Frame] | list[Path], str | None]:
+        """Extract frames in memory, or to a temp directory for debugging."""
+        options = (self.extraction_strategy, self.sampling)
+        if self.in_memory_frames:
+            frames = extract_frames_in_memory(
+                video_path, sample_frames, *options, self.frame_prep, self.features
+            )
+            return frames, None
+        return extract_frames(video_path, sample_frames, *options)
+
+    def _deduplicate(
+        self, frames: list[Frame] | list[Path]
+    ) -> tuple[list[Frame] | list[Path], list[int]]:
+        """Collapse near-identical in-memory frames when dedup is enabled."""
+        in_memory = all(isinstance(frame, Frame) for frame in frames)
+        if self.dedup_threshold is None or not in_memory:
+            return frames, [1] * len(frames)
+        return deduplicate_frames(frames, self.dedup_threshold)
+
+    def _aggregate(
+        self,
+        frame_results: list[AnalysisResult],
+        weights: list[int],
+        planned: list[int] | None = None,
+    ) -> AnalysisResult:
+        """Aggregate frame results, reporting model calls saved.
+
+        ``planned`` holds the weights of every frame that was scheduled;
+        it differs from ``weights`` when analysis stopped early.
+        """
+        planned = weights if planned is None else planned
+        positions = None
+        if self.early_stop is not None:
+            # Results arrive in informative order; place each in the video
+            starts = list(accumulate(planned, initial=0))
+            order = informative_order(len(planned))[: len(frame_results)]
+            positions = [starts[i] for i in order]
+        result = aggregate_results(frame_results, weights, self.voting, positions)
+        saved = sum(planned) - len(planned)
+        if saved:
+            result.reasoning += (
+                f" Deduplicated {saved} near-identical frames "
+                f"({len(planned)} model calls for {sum(planned)} frames)."
+            )
+        if len(weights) < len(planned):
+            result.reasoning += (
+                f" Stopped early: analyzed {sum(weights)} of "
+                f"{sum(planned)} planned frames."
+            )
+        if result.tiers:
+            decided = ", ".join(f"{tier}: {n}" for tier, n in result.tiers.items())
+            result.reasoning += f" Cascade decisions: {decided}."
+        return result
+
+    def _analyze_frames(
+        self,
+        frames: list[Frame] | list[Path],
+        checkpoint: VideoCheckpoint | None = None,
+    ) -> list[AnalysisResult]:
+        """Analyze extracted frames, in parallel and packed when configured."""
+        if self.frames_per_request > 1:
+            return self._analyze_packed(frames, checkpoint)
+        analyze = self.analyze_frame
+        if checkpoint is not None:
+            analyze = partial(self._analyze_checkpointed, checkpoint)
+        if self.max_concurrency > 1:
+            self._log(
+                f"Analyzing {len(frames)} frames ({self.max_concurrency} concurrent)..."
+            )
+            return analyze_concurrently(
+                analyze,
+                frames,
+                self.max_concurrency,
+                executor=self._get_request_pool(),
+            )
+
+        frame_results = []
+        for idx, frame in enumerate(frames):
+            self._log(f"Analyzing frame {idx + 1}/{len(frames)}...")
+            frame_results.append(analyze_or_fail(analyze, frame))
+        return frame_results
+
+    def _analyze_checkpointed(
+        self, checkpoint: VideoCheckpoint, frame: Frame | Path
+    ) -> AnalysisResult:
+        """Reuse a checkpointed frame result, or analyze and record it."""
+        if not isinstance(frame, Frame):
+            return self.analyze_frame(frame)
+        result = checkpoint.get(frame.index)
+        if result is not None:
+            return result
         try:
-            frames, self._temp_dir = extract_frames(video_path, sample_frames)
-            frame_results = []
-            for idx, frame in enumerate(frames):
-                print(f"Analyzing frame {idx + 1}/{len(frames)}...")
-                result = self.analyze_frame(frame)
-                frame_results.append(result)
-            return aggregate_results(frame_results)
-        finally:
-            cleanup_temp_files(self._temp_dir)
-            self._temp_dir = None
+            result = self.analyze_frame(frame)
+        except Exception:
+            checkpoint.fail(frame.index)
+            raise
+        _record_frame(checkpoint, frame, result)
+        return result
+
+    def _analyze_packed(
+        self,
+        frames: list[Frame] | list[Path],
+        checkpoint: VideoCheckpoint | None = None,
+    ) -> list[AnalysisResult]:
+        """Analyze frames in packs of ``frames_per_request`` per request."""
+        packs = split_packs(frames, self.frames_per_request)
+        analyze_pack = self._analyze_pack
+        if checkpoint is not None:
+            analyze_pack = partial(self._analyze_pack_checkpointed, checkpoint)
+        if self.max_concurrency > 1:
+            self._log(
+                f"Analyzing {len(frames)} frames in {len(packs)} requests "
+                f"({self.max_concurrency} concurrent)..."
+            )
+            return analyze_packs_concurrently(
+                analyze_pack,
+                packs,
+                self.max_concurrency,
+                executor=self._get_request_pool(),
+            )
+
+        frame_results = []
+        for idx, pack in enumerate(packs):
+            self._log(
+                f"Analyzing {len(pack)} frames in request {idx + 1}/{len(packs)}..."
+            )
+            frame_results.extend(analyze_pack_or_fail(analyze_pack, pack))
+        return frame_results
+
+    def _analyze_pack_checkpointed(
+        self, checkpoint: VideoCheckpoint, pack: list[Frame] | list[Path]
+    ) -> list[AnalysisResult]:
+        """Pack only frames missing from the checkpoint, recording new ones."""
+        stored = [
+            checkpoint.get(frame.index) if isinstance(frame, Frame) else None
+            for frame in pack
+        ]
+        missing = [frame for frame, result in zip(pack, stored) if result is None]
+        try:
+            fresh = iter(self._analyze_pack(missing) if missing else [])
+        except Exception:
+            for frame in missing:
+                if isinstance(frame, Frame):
+                    checkpoint.fail(frame.index)
+            raise
+        results = []
+        for frame, result in zip(pack, stored):
+            if result is None:
+                result = next(fresh)
+                _record_frame(checkpoint, frame, result)
+            results.append(result)
+        return results
+
+    def _analyze_pack(self, pack: list[Frame] | list[Path]) -> list[AnalysisResult]:
+        """Analyze a group of frames with one request, per-frame cached.
+
+        With a cascade, the frames a tier escalates are packed again into
+        one request to the next tier.
+        """
+        datas = [self._frame_data(frame) for frame in pack]
+        query = partial(self._query_pack, pack, datas)
+        results = escalate_pack(self._tiers, len(pack), query, self._log)
+        _attach_features(pack, results)
+        return results
+
+    def _query_pack(
+        self,
+        pack: list[Frame] | list[Path],
+        datas: list[str],
+        tier: CascadeTier | None,
+        pending: list[int],
+    ) -> list[AnalysisResult]:
+        """Query one tier with the pending, uncached frames of a pack."""
+
+        def send(images: list[str], prompt: str) -> str:
+            return self._query_llm(images, "", prompt, tier=tier)
+
+        return query_pack(send, *self._pack_request(pack, datas, tier, pending))
+
+    async def _analyze_pack_async(
+        self, pack: list[Frame] | list[Path]
+    ) -> list[AnalysisResult]:
+        """Async counterpart of _analyze_pack."""
+        datas = [
+            frame.data
+            if isinstance(frame, Frame)
+            else await asyncio.to_thread(self._frame_data, frame)
+            for frame in pack
+        ]
+        query = partial(self._query_pack_async, pack, datas)
+        results = await escalate_pack_async(self._tiers, len(pack), query, self._log)
+        _attach_features(pack, results)
+        return results
+
+    async def _query_pack_async(
+        self,
+        pack: list[Frame] | list[Path],
+        datas: list[str],
+        tier: CascadeTier | None,
+        pending: list[int],
+    ) -> list[AnalysisResult]:
+        """Async counterpart of _query_pack."""
+
+        async def send(images: list[str], prompt: str) -> str:
+            return await self._query_llm_async(images, "", prompt, tier=tier)
+
+        request = self._pack_request(pack, datas, tier, pending)
+        return await query_pack_async(send, *request)
+
+    def _frame_data(self, frame: Frame | Path) -> str:
+        """Return the base64 image of an extracted frame."""
+        if isinstance(frame, Frame):
+            return frame.data
+        if not Path(frame).exists():
+            raise FileNotFoundError(f"Frame not found: {frame}")
+        return self._load_image(Path(frame))
+
+    def _pack_request(
+        self,
+        pack: list[Frame] | list[Path],
+        datas: list[str],
+        tier: CascadeTier | None,
+        pending: list[int],
+    ) -> tuple:
+        """Arguments of ``query_pack`` after ``send`` for a pack's pending frames.
+
+        Returns:
+            Names, images and cache keys of the frames, the cache, the
+            packing mode and the frame prep
+        """
+        datas = [datas[i] for i in pending]
+        keys = [self._cache_key(data, packed=True, tier=tier) for data in datas]
+        names = [pack[i].name for i in pending]
+        return names, datas, keys, self.cache, self.packing, self.frame_prep
+
+    def _get_request_pool(self) -> ThreadPoolExecutor:
+        """Return the shared pool bounding concurrent model requests."""
+        with self._pool_lock:
+            if self._request_pool is None:
+                self._request_pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="frame-request",
+                )
+            return self._request_pool
+
+    def _log(self, message: str) -> None:
+        """Print a progress message when verbose."""
+        if self.verbose:
+            print(message)
+
+    def _analyze_image(self, image_data: str, context: str) -> AnalysisResult:
+        """Analyze an encoded image, escalating through the cascade if set."""
+        query = partial(self._query_image, image_data, context)
+        return escalate(self._tiers, query, self._log)
+
+    async def _analyze_image_async(
+        self, image_data: str, context: str
+    ) -> AnalysisResult:
+        """Async counterpart of _analyze_image."""
+        query = partial(self._query_image_async, image_data, context)
+        return await escalate_async(self._tiers, query, self._log)
+
+    def _query_image(
+        self, image_data: str, context: str, tier: CascadeTier | None
+    ) -> AnalysisResult:
+        """Query one tier with an image, consulting the verdict cache first."""
+        key = self._cache_key(image_data, tier=tier)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
+        response = self._query_llm(image_data, context, tier=tier)
+        return self._store_result(key, response)
+
+    async def _query_image_async(
+        self, image_data: str, context: str, tier: CascadeTier | None
+    ) -> AnalysisResult:
+        """Async counterpart of _query_image."""
+        key = self._cache_key(image_data, tier=tier)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
+        response = await self._query_llm_async(image_data, context, tier=tier)
+        return self._store_result(key, response)
+
+    def _model(self, tier: CascadeTier | None) -> tuple[str, str]:
+        """Provider and model name of a cascade tier, or of the agent."""
+        if tier is None:
+            return self.model_provider, self.model_name
+        return tier.provider, tier.model
+
+    def _cache_key(
+        self,
+        image_data: str,
+        packed: bool = False,
+        tier: CascadeTier | None = None,
+    ) -> str | None:
+        """Return the verdict cache key for an image, if caching is enabled.
+
+        Verdicts from packed requests are keyed apart from single-frame
+        ones, since the model saw the frame alongside others.
+        """
+        if self.cache is None:
+            return None
+        provider, model = self._model(tier)
+        if packed:
+            model += f"#{self.packing}"
+        elif self.cancel_after_verdict:
+            model += "#verdict"
+        return self.cache.make_key(image_data, provider, model)
+
+    def _store_result(self, key: str | None, response: str) -> AnalysisResult:
+        """Parse a response and cache it unless parsing failed."""
+        result = parse_llm_response(response)
+        if key and is_parsed(result):
+            self.cache.put(key, response, result)
+        return result
 
     def _load_image(self, image_path: Path) -> str:
-        """Load and base64 encode an image."""
+        """Load an image, prepared for upload, and base64 encode it.
+
+        Files OpenCV cannot decode are sent unchanged.
+        """
+        with span(DECODE):
+            image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if image is not None:
+            return self.frame_prep.encode(image)
         with open(image_path, "rb") as f:
             return base64.b64encode(f.read()).decode("utf-8")
 
-    def _query_llm(self, image_data: str, context: str) -> str:
-        """Query the LLM with the image for analysis."""
-        if self.model_provider == "ollama":
-            return query_ollama(self.model_name, image_data, context)
-        elif self.model_provider == "openai":
-            return query_openai(self.model_name, image_data, context)
-        elif self.model_provider == "anthropic":
-            return query_anthropic(self.model_name, image_data, context)
+    def _query_llm(
+        self,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        tier: CascadeTier | None = None,
+    ) -> str:
+        """Query the LLM with the image (or packed images) for analysis."""
+        provider, model = self._model(tier)
+        args = self._ollama_args(model, image_data, context, prompt)
+        if provider == "ollama" and self.stream_responses:
+            stream = self.ollama_client.stream(*args)
+            return read_streamed_json(stream, self._stop_fields(prompt))
+        if provider == "ollama":
+            return self.ollama_client.generate(*args)
+        elif provider == "openai":
+            return query_openai(model, image_data, context)
+        elif provider == "anthropic":
+            return query_anthropic(model, image_data, context)
         else:
-            raise ValueError(f"Unknown model provider: {self.model_provider}")
+            raise ValueError(f"Unknown model provider: {provider}")
+
+    async def _query_llm_async(
+        self,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        tier: CascadeTier | None = None,
+    ) -> str:
+        """Query the LLM asynchronously with the image for analysis."""
+        provider, model = self._model(tier)
+        args = self._ollama_args(model, image_data, context, prompt)
+        if provider == "ollama" and self.stream_responses:
+            stream = self._async_ollama.stream(*args)
+            return await aread_streamed_json(stream, self._stop_fields(prompt))
+        if provider == "ollama":
+            return await self._async_ollama.generate(*args)
+        return await asyncio.to_thread(
+            self._query_llm, image_data, context, prompt, tier=tier
+        )
+
+    def _ollama_args(
+        self,
+        model: str,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None,
+    ) -> tuple:
+        """Arguments of an Ollama generate or stream call.
+
+        Packed requests (those with a prompt) are constrained to the
+        multi-frame schema, single frames to the verdict schema.
+        """
+        response_format = None
+        if self.structured_output:
+            response_format = ANALYSIS_SCHEMA if prompt is None else MULTI_FRAME_SCHEMA
+        return (
+            model,
+            image_data,
+            context,
+            prompt,
+            self.keep_alive,
+            response_format,
+        )
+
+    def _stop_fields(self, prompt: str | None) -> tuple[str, ...] | None:
+        """Fields after which a streamed single-frame response is cancelled."""
+        if self.cancel_after_verdict and prompt is None:
+            return VERDICT_FIELDS
+        return None
+
+
+def _record_frame(
+    checkpoint: VideoCheckpoint, frame: Frame | Path, result: AnalysisResult
+) -> None:
+    """Checkpoint a usable in-memory frame result, or note its failure."""
+    if not isinstance(frame, Frame):
+        return
+    if is_parsed(result):
+        checkpoint.put(frame.index, result)
+    else:
+        checkpoint.fail(frame.index)
+
+
+def _temporal_failed(result: AnalysisResult, error: Exception) -> None:
+    """Keep a video's frame verdicts when its temporal analysis fails."""
+    result.reasoning += f" Temporal analysis failed: {error}."
+
+
+def _attach_features(
+    frames: list[Frame] | list[Path], results: list[AnalysisResult]
+) -> None:
+    """Copy the features scored at extraction onto each frame's result."""
+    for frame, result in zip(frames, results):
+        if isinstance(frame, Frame) and frame.features:
+            result.features = frame.features
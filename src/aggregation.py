@@ -0,0 +1,215 @@
+"""Incremental verdict aggregation for Video Fraud Detection Agent.
+
+A ``VerdictAccumulator`` folds frame results into a running verdict one
+at a time. Its state does not grow with the number of frames: one vote
+total per verdict, a weighted confidence sum, per-feature sums and a
+bounded table of the most frequent indicators and recommendations. A snapshot of the
+aggregated verdict can be taken at any point, e.g. while an hour-long
+video is still being analyzed.
+"""
+
+from dataclasses import dataclass
+
+from .models import AnalysisResult, Verdict
+
+# Indicators and recommendations kept by default
+DEFAULT_TOP_K = 20
+
+
+@dataclass
+class VotingPolicy:
+    """How frame results are weighted when aggregated.
+
+    Every frame votes for its verdict with its weight (the number of
+    frames it stands for after deduplication), scaled as configured.
+
+    Attributes:
+        confidence_weighted: Scale each vote by the frame's confidence, so
+            one confident frame outweighs several unsure ones
+        half_life: When set, a vote halves for every ``half_life`` frames
+            between its frame and the latest one, so the verdict follows
+            the most recent part of the video
+        top_k: Most frequent indicators and recommendations kept, or None
+            to keep every one
+    """
+
+    confidence_weighted: bool = False
+    half_life: float | None = None
+    top_k: int | None = DEFAULT_TOP_K
+
+    def __post_init__(self):
+        if self.half_life is not None and self.half_life <= 0:
+            raise ValueError(f"half_life must be > 0, got {self.half_life}")
+        if self.top_k is not None and self.top_k < 1:
+            raise ValueError(f"top_k must be >= 1, got {self.top_k}")
+
+
+class TopKCounter:
+    """Frequency counts of the most common strings in bounded memory.
+
+    Uses the Space-Saving algorithm: once ``k`` strings are tracked, a new
+    one replaces the least frequent and inherits its count. Counts are
+    never underestimated, and every string seen more than ``total / k``
+    times is kept. Ties are ordered by first appearance, so results are
+    deterministic.
+    """
+
+    def __init__(self, k: int | None = DEFAULT_TOP_K):
+        """Create an empty counter keeping ``k`` strings (None: unbounded)."""
+        self.k = k
+        self._counts: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Count ``count`` more occurrences of ``item``."""
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+        elif self.k is None or len(counts) < self.k:
+            counts[item] = count
+        else:
+            evicted = min(counts, key=counts.__getitem__)
+            counts[item] = counts.pop(evicted) + count
+
+    def most_common(self) -> list[tuple[str, int]]:
+        """Return (string, count) pairs, most frequent first."""
+        return sorted(self._counts.items(), key=lambda pair: -pair[1])
+
+
+class VerdictAccumulator:
+    """Running weighted aggregate of frame results.
+
+    Attributes:
+        policy: How votes are weighted
+        frames: Frames added so far, counting each result's weight
+        counts: Frames per verdict, before confidence or recency weighting
+        indicators: Most frequent indicators
+        recommendations: Most frequent recommendations
+    """
+
+    def __init__(self, policy: VotingPolicy | None = None):
+        """Create an empty accumulator.
+
+        Args:
+            policy: Vote weighting (default: one vote per frame, top 20
+                indicators)
+        """
+        self.policy = policy or VotingPolicy()
+        self.frames = 0
+        self.counts = {v: 0 for v in Verdict}
+        self.indicators = TopKCounter(self.policy.top_k)
+        self.recommendations = TopKCounter(self.policy.top_k)
+        self._scores = {v: 0.0 for v in Verdict}
+        self._weight = 0.0
+        self._confidence = 0.0
+        self._latest: float | None = None
+        self._features: dict[str, float] = {}
+        self._featured = 0
+        self._tiers: dict[str, int] = {}
+
+    def add(
+        self, result: AnalysisResult, weight: int = 1, position: float | None = None
+    ) -> None:
+        """Fold one frame result into the aggregate.
+
+        Args:
+            result: Frame result
+            weight: Number of frames the result stands for
+            position: Where the frame is in the video, in frames; only
+                used for recency weighting. Defaults to the number of
+                frames added before it. Frames may be added in any order.
+        """
+        if position is None:
+            position = self.frames
+        self.frames += weight
+        self.counts[result.verdict] += weight
+        vote = weight * self._recency(position)
+        self._weight += vote
+        self._confidence += result.confidence * vote
+        if self.policy.confidence_weighted:
+            vote *= result.confidence
+        self._scores[result.verdict] += vote
+        for indicator in result.indicators:
+            self.indicators.add(indicator, weight)
+        for recommendation in result.recommendations:
+            self.recommendations.add(recommendation, weight)
+        if result.features:
+            self._featured += weight
+            for name, value in result.features.items():
+                self._features[name] = self._features.get(name, 0.0) + value * weight
+        for tier, count in result.tiers.items():
+            self._tiers[tier] = self._tiers.get(tier, 0) + count * weight
+
+    def snapshot(self) -> AnalysisResult:
+        """Return the aggregated verdict of every frame added so far.
+
+        The verdict is the one with the highest weighted vote and the
+        confidence is the mean frame confidence, both weighted for
+        recency when configured. Indicators and recommendations are
+        listed most frequent first, features are the mean over the
+        frames that carried them, and cascade tiers count the frames
+        each decided.
+        """
+        if not self.frames:
+            return AnalysisResult(
+                verdict=Verdict.UNCERTAIN,
+                confidence=0.0,
+                reasoning="No frames analyzed",
+                indicators=[],
+                recommendations=["Provide video frames for analysis"],
+            )
+        verdict = max(self._scores, key=self._scores.__getitem__)
+        confidence = self._confidence / self._weight if self._weight else 0.0
+        reasoning = (
+            f"Analyzed {self.frames} frames. "
+            f"Verdicts: AI={self.counts[Verdict.AI_GENERATED]}, "
+            f"Authentic={self.counts[Verdict.AUTHENTIC]}, "
+            f"Uncertain={self.counts[Verdict.UNCERTAIN]}. "
+            f"Average confidence: {confidence:.1%}"
+        )
+        weighting = self._weighting()
+        if weighting:
+            reasoning += f". Votes weighted by {weighting}"
+        return AnalysisResult(
+            verdict=verdict,
+            confidence=confidence,
+            reasoning=reasoning,
+            indicators=[item for item, _ in self.indicators.most_common()],
+            recommendations=[item for item, _ in self.recommendations.most_common()],
+            features={
+                name: round(total / self._featured, 4)
+                for name, total in self._features.items()
+            },
+            tiers=dict(self._tiers),
+        )
+
+    def _recency(self, position: float) -> float:
+        """Weight of a frame at ``position`` relative to the latest frame.
+
+        A frame newer than every earlier one becomes the reference: the
+        running totals are decayed once, so each update stays O(1).
+        """
+        half_life = self.policy.half_life
+        if half_life is None:
+            return 1.0
+        if self._latest is None:
+            self._latest = position
+        if position <= self._latest:
+            return 0.5 ** ((self._latest - position) / half_life)
+        decay = 0.5 ** ((position - self._latest) / half_life)
+        self._scores = {v: score * decay for v, score in self._scores.items()}
+        self._weight *= decay
+        self._confidence *= decay
+        self._latest = position
+        return 1.0
+
+    def _weighting(self) -> str:
+        """Describe the vote weighting for the reasoning, '' if plain."""
+        parts = []
+        if self.policy.confidence_weighted:
+            parts.append("confidence")
+        if self.policy.half_life is not None:
+            parts.append(f"recency (half-life {self.policy.half_life:g} frames)")
+        return " and ".join(parts)
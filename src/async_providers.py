@@ -0,0 +1,286 @@
+"""Asynchronous LLM provider implementations for Video Fraud Detection Agent.
+
+This module contains event-loop-friendly counterparts of the providers
+in ``providers.py``. Requests share one pooled ``httpx.AsyncClient`` so
+that thousands of pending frame requests can wait on the loop without
+each holding a thread.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TypeVar
+
+from .balancer import CircuitOpenError, EndpointPool
+from .metrics import REQUEST, record_model_durations, span
+from .providers import (
+    KeepAlive,
+    LatencyWindow,
+    ResponseFormat,
+    RetryPolicy,
+    build_ollama_payload,
+    is_retryable,
+)
+from .streaming import parse_ndjson_line
+
+T = TypeVar("T")
+
+
+def is_retryable_async(error: BaseException) -> bool:
+    """Like ``is_retryable``, also covering httpx transport errors."""
+    if is_retryable(error):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+class AsyncOllamaClient:
+    """Shared asynchronous HTTP client for one or more Ollama servers.
+
+    The underlying ``httpx.AsyncClient`` is created lazily on first use
+    and is bound to the running event loop; a later loop (e.g. a second
+    ``asyncio.run()``) gets a new one. Call ``aclose()`` before the loop
+    shuts down. Each generate request is routed to a server of
+    ``endpoints``, retried and optionally hedged like ``OllamaClient``;
+    the slower of two hedged requests is cancelled.
+
+    Attributes:
+        host: Base URL of the first Ollama server
+        endpoints: Servers requests are balanced across
+        timeout: Per-request timeout in seconds
+        max_connections: Maximum number of open connections in total
+        retry: Retry policy for failed requests
+        hedge_percentile: Latency percentile after which a duplicate
+            request is sent, or None to never hedge
+        latencies: Recent successful request latencies
+        retries: Number of requests retried
+        hedges: Number of duplicate requests sent
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        timeout: float = 120.0,
+        max_connections: int = 16,
+        endpoints: EndpointPool | None = None,
+        retry: RetryPolicy | None = None,
+        hedge_percentile: float | None = None,
+        latencies: LatencyWindow | None = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            host: Base URL of the Ollama server (default: $OLLAMA_HOSTS,
+                comma-separated, then $OLLAMA_HOST)
+            timeout: Per-request timeout in seconds
+            max_connections: Maximum number of open connections; further
+                requests wait on the event loop for a free connection
+            endpoints: Servers to balance requests across, usually shared
+                with the sync client; overrides host
+            retry: Retry policy (default: 3 attempts with jittered
+                exponential backoff)
+            hedge_percentile: Latency percentile after which an unanswered
+                generate request is sent again, or None to never hedge
+            latencies: Latency window to share with the sync client
+        """
+        self.endpoints = endpoints or EndpointPool.from_env(host)
+        self.host = self.endpoints.hosts[0]
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.retry = retry or RetryPolicy()
+        self.hedge_percentile = hedge_percentile
+        self.latencies = latencies or LatencyWindow()
+        self.retries = 0
+        self.hedges = 0
+        self._client = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client(self):
+        """Return the running loop's AsyncClient, creating it on first use.
+
+        Connections belong to the loop that opened them, so a client from
+        an earlier loop is dropped rather than reused.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def generate(
+        self,
+        model_name: str,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        keep_alive: KeepAlive | None = None,
+        response_format: ResponseFormat | None = None,
+    ) -> str:
+        """Query Ollama with vision model.
+
+        Args:
+            model_name: Name of the Ollama model to use
+            image_data: Base64 encoded image, or several for a packed request
+            context: Additional context for the analysis
+            prompt: Prompt replacing the single-frame analysis prompt
+            keep_alive: How long the model stays loaded after the request
+            response_format: JSON schema (or "json") constraining the output
+
+        Returns:
+            Model response text
+        """
+        payload = build_ollama_payload(
+            model_name,
+            image_data,
+            context,
+            prompt,
+            keep_alive=keep_alive,
+            response_format=response_format,
+        )
+        message = await self._with_retries(lambda: self._hedged(payload))
+        record_model_durations(message)
+        return message.get("response", "")
+
+    async def stream(
+        self,
+        model_name: str,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        keep_alive: KeepAlive | None = None,
+        response_format: ResponseFormat | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream the model response as it is generated.
+
+        Closing the generator early closes the connection, which makes
+        Ollama stop generating.
+
+        Args:
+            model_name: Name of the Ollama model to use
+            image_data: Base64 encoded image, or several for a packed request
+            context: Additional context for the analysis
+            prompt: Prompt replacing the single-frame analysis prompt
+            keep_alive: How long the model stays loaded after the request
+            response_format: JSON schema (or "json") constraining the output
+
+        Yields:
+            Response text chunks
+        """
+        payload = build_ollama_payload(
+            model_name, image_data, context, prompt, True, keep_alive, response_format
+        )
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async for chunk in self._stream(payload):
+                    started = True
+                    yield chunk
+                return
+            except Exception as error:
+                # Text already yielded can't be taken back
+                delay = (
+                    None
+                    if started
+                    else self.retry.delay_after(error, attempt, is_retryable_async)
+                )
+                if delay is None:
+                    raise
+                attempt += not isinstance(error, CircuitOpenError)
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _post(self, payload: dict) -> dict:
+        """Send one generate request to the next endpoint."""
+        start = time.perf_counter()
+        with self.endpoints.route(is_retryable_async) as host, span(REQUEST):
+            response = await self._get_client().post(
+                f"{host}/api/generate", json=payload
+            )
+            response.raise_for_status()
+            message = response.json()
+        self.latencies.add(time.perf_counter() - start)
+        return message
+
+    async def _stream(self, payload: dict) -> AsyncIterator[str]:
+        """Stream one generate request from the next endpoint."""
+        with self.endpoints.route(is_retryable_async) as host, span(REQUEST):
+            async with self._get_client().stream(
+                "POST", f"{host}/api/generate", json=payload
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    chunk, done = parse_ndjson_line(line)
+                    if chunk:
+                        yield chunk
+                    if done:
+                        return
+
+    async def _with_retries(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Await ``call()``, retrying retryable failures with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as error:
+                delay = self.retry.delay_after(error, attempt, is_retryable_async)
+                if delay is None:
+                    raise
+                attempt += not isinstance(error, CircuitOpenError)
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, payload: dict) -> dict:
+        """Post ``payload``, duplicating it if it is slower than usual.
+
+        The first successful response wins and the other request is
+        cancelled, which closes its connection so Ollama stops
+        generating. If both fail the first error is raised.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._post(payload)
+        first = asyncio.ensure_future(self._post(payload))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        self.hedges += 1
+        pending = {first, asyncio.ensure_future(self._post(payload))}
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None if hedging is off."""
+        if self.hedge_percentile is None:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connections."""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
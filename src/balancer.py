@@ -0,0 +1,286 @@
+"""Load balancing across several Ollama servers.
+
+Each model request is routed to one endpoint of an ``EndpointPool``,
+chosen by fewest requests in flight or by latency-weighted load. Failed
+requests are tracked passively, and each endpoint acts as a circuit
+breaker: failing ``max_failures`` times in a row opens it (the endpoint
+is ejected for ``ejection_seconds``), after which it is half-open,
+serving one request at a time until one succeeds and closes it again.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+DEFAULT_HOST = "http://localhost:11434"
+
+LEAST_OUTSTANDING = "least_outstanding"
+LATENCY = "latency"
+STRATEGIES = (LEAST_OUTSTANDING, LATENCY)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while every endpoint is ejected.
+
+    Attributes:
+        retry_in: Seconds until the first endpoint is back on probation,
+            0.0 if one already is but its probe request is in flight
+    """
+
+    def __init__(self, message: str, retry_in: float = 0.0):
+        """Create the error with the seconds left until a retry."""
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class Endpoint:
+    """Health and load of one Ollama server.
+
+    Attributes:
+        host: Base URL of the server
+        outstanding: Requests currently in flight
+        latency: Exponentially weighted mean request latency in seconds,
+            or None before the first success
+        failures: Consecutive failed requests
+        ejected_until: Monotonic time the ejection ends, 0.0 if never ejected
+        requests: Requests routed to the server
+        errors: Requests that failed
+        ejections: Times the server was ejected
+    """
+
+    def __init__(self, host: str):
+        """Create an idle, healthy endpoint for ``host``."""
+        self.host = host.rstrip("/")
+        self.outstanding = 0
+        self.latency: float | None = None
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    def to_dict(self, now: float) -> dict:
+        """Convert the endpoint's state to a JSON-serializable dict."""
+        return {
+            "host": self.host,
+            "outstanding": self.outstanding,
+            "latency_s": self.latency,
+            "ejected": self.ejected_until > now,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+        }
+
+
+class EndpointPool:
+    """Thread-safe scheduler over several Ollama servers.
+
+    One pool is shared by the agent's sync and async clients, so both
+    see the same in-flight counts and health.
+
+    Attributes:
+        endpoints: The servers, in configuration order
+        strategy: 'least_outstanding' or 'latency'
+        max_failures: Consecutive failures that eject an endpoint
+        ejection_seconds: How long an ejected endpoint receives no requests
+    """
+
+    def __init__(
+        self,
+        hosts: list[str],
+        strategy: str = LEAST_OUTSTANDING,
+        max_failures: int = 3,
+        ejection_seconds: float = 30.0,
+        latency_alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the pool.
+
+        Args:
+            hosts: Base URLs of the Ollama servers
+            strategy: 'least_outstanding' picks the endpoint with the fewest
+                requests in flight; 'latency' weighs that count by each
+                endpoint's mean latency, favouring faster servers
+            max_failures: Consecutive failures that eject an endpoint
+            ejection_seconds: How long an ejected endpoint is skipped
+            latency_alpha: Weight of the newest sample in the latency mean
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If no hosts are given, the strategy is unknown or
+                max_failures is less than 1
+        """
+        if not hosts:
+            raise ValueError("At least one host is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancing strategy: {strategy}")
+        if max_failures < 1:
+            raise ValueError(f"max_failures must be >= 1, got {max_failures}")
+        self.endpoints = [Endpoint(host) for host in dict.fromkeys(hosts)]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_seconds = ejection_seconds
+        self.latency_alpha = latency_alpha
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, hosts: list[str] | str | None = None, **kwargs) -> "EndpointPool":
+        """Create a pool from explicit hosts or the environment.
+
+        Args:
+            hosts: Base URL or URLs; defaults to the comma-separated
+                $OLLAMA_HOSTS, then $OLLAMA_HOST, then localhost
+            **kwargs: Passed to ``EndpointPool``
+
+        Returns:
+            EndpointPool over the configured hosts
+        """
+        if isinstance(hosts, str):
+            hosts = [hosts]
+        if not hosts:
+            hosts = [h.strip() for h in os.getenv("OLLAMA_HOSTS", "").split(",")]
+            hosts = [h for h in hosts if h]
+        if not hosts:
+            hosts = [os.getenv("OLLAMA_HOST", DEFAULT_HOST)]
+        return cls(hosts, **kwargs)
+
+    @property
+    def hosts(self) -> list[str]:
+        """Base URLs of every endpoint."""
+        return [endpoint.host for endpoint in self.endpoints]
+
+    def acquire(self) -> Endpoint:
+        """Pick the endpoint for the next request and count it in flight.
+
+        Ejected endpoints are skipped, and endpoints back on probation
+        take one request at a time.
+
+        Returns:
+            The chosen Endpoint; pass it to ``release()`` when done
+
+        Raises:
+            CircuitOpenError: If every endpoint is ejected, or on probation
+                with its one request in flight
+        """
+        with self._lock:
+            now = self._clock()
+            candidates = [e for e in self.endpoints if self._available(e, now)]
+            if not candidates:
+                retry_in = max(0.0, min(e.ejected_until for e in self.endpoints) - now)
+                raise CircuitOpenError(
+                    f"All {len(self.endpoints)} Ollama endpoints are failing; "
+                    f"next retry in {retry_in:.0f}s",
+                    retry_in,
+                )
+            if self.strategy == LATENCY:
+                endpoint = min(candidates, key=self._weighted_load)
+            else:
+                endpoint = min(candidates, key=lambda e: (e.outstanding, e.requests))
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(
+        self, endpoint: Endpoint, latency: float | None = None, ok: bool | None = True
+    ) -> None:
+        """Record the outcome of a request started with ``acquire()``.
+
+        Args:
+            endpoint: Endpoint returned by ``acquire()``
+            latency: Seconds the request took, or None to leave the
+                latency mean alone (e.g. a cancelled stream)
+            ok: False if the request failed, None if its outcome says
+                nothing about the endpoint's health (a cancelled request,
+                a missing model or a client-side error)
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok is None:
+                return
+            if not ok:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures:
+                    endpoint.ejected_until = self._clock() + self.ejection_seconds
+                    endpoint.ejections += 1
+                return
+            endpoint.failures = 0
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += self.latency_alpha * (
+                        latency - endpoint.latency
+                    )
+
+    @contextmanager
+    def route(
+        self, failed: Callable[[BaseException], bool] | None = None
+    ) -> Iterator[str]:
+        """Route one request, yielding the host to send it to.
+
+        Args:
+            failed: Decides whether an exception raised inside the block
+                is a failure of the endpoint (e.g. ``is_retryable``); other
+                exceptions are neither a success nor a failure. By default
+                every exception is a failure. Cancellation (``GeneratorExit``,
+                ``CancelledError``) never is.
+        """
+        endpoint = self.acquire()
+        start = time.perf_counter()
+        try:
+            yield endpoint.host
+        except Exception as error:
+            counts = failed is None or failed(error)
+            self.release(endpoint, ok=False if counts else None)
+            raise
+        except BaseException:
+            self.release(endpoint, ok=None)
+            raise
+        self.release(endpoint, time.perf_counter() - start)
+
+    def stats(self) -> list[dict]:
+        """Return the state of every endpoint."""
+        with self._lock:
+            now = self._clock()
+            return [endpoint.to_dict(now) for endpoint in self.endpoints]
+
+    def to_prometheus(self, namespace: str = "video_fraud") -> str:
+        """Export per-endpoint gauges and counters in Prometheus text format."""
+        stats = self.stats()
+        series = (
+            ("endpoint_outstanding", "gauge", "Requests in flight.", "outstanding"),
+            ("endpoint_ejected", "gauge", "1 while ejected.", "ejected"),
+            ("endpoint_requests_total", "counter", "Requests routed.", "requests"),
+            ("endpoint_errors_total", "counter", "Failed requests.", "errors"),
+        )
+        lines = []
+        for name, kind, help_text, key in series:
+            lines += [
+                f"# HELP {namespace}_{name} {help_text}",
+                f"# TYPE {namespace}_{name} {kind}",
+            ]
+            for entry in stats:
+                value = int(entry[key])
+                lines.append(f'{namespace}_{name}{{host="{entry["host"]}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def _available(self, endpoint: Endpoint, now: float) -> bool:
+        """Check whether an endpoint may take another request."""
+        if endpoint.ejected_until > now:
+            return False
+        on_probation = endpoint.failures >= self.max_failures
+        return not on_probation or endpoint.outstanding == 0
+
+    @staticmethod
+    def _weighted_load(endpoint: Endpoint) -> tuple[float, int]:
+        """Expected wait on an endpoint: queue length times mean latency.
+
+        Endpoints without a latency sample yet score zero so that each
+        is tried at least once.
+        """
+        latency = endpoint.latency or 0.0
+        return (endpoint.outstanding + 1) * latency, endpoint.requests
@@ -0,0 +1,271 @@
+"""Batch analysis of many videos for Video Fraud Detection Agent.
+
+This module analyzes a directory or manifest of videos in one process:
+frames are decoded in a process pool, model requests share the agent's
+bounded request pool, and one JSON line is written per finished video.
+"""
+
+import json
+import math
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from .agent import VideoFraudDetectionAgent
+from .checkpoint import CheckpointStore, VideoCheckpoint, fingerprint_video
+from .frame_prep import FramePrep
+from .models import Frame, TemporalReport, result_to_dict
+from .temporal import analyze_temporal, attach_report
+from .video_utils import extract_frames_in_memory
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v")
+
+
+def discover_videos(directory: Path) -> list[Path]:
+    """List video files in a directory tree, sorted by path.
+
+    Args:
+        directory: Directory to search recursively
+
+    Returns:
+        Sorted list of video paths
+    """
+    return sorted(
+        path
+        for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS
+    )
+
+
+def read_manifest(manifest: Path) -> list[Path]:
+    """Read video paths from a manifest file.
+
+    One path per line; blank lines and lines starting with ``#`` are
+    ignored. Relative paths are resolved against the manifest's folder.
+
+    Args:
+        manifest: Path to the manifest file
+
+    Returns:
+        Video paths in manifest order
+    """
+    manifest = Path(manifest)
+    paths = []
+    for line in manifest.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            path = Path(line)
+            paths.append(path if path.is_absolute() else manifest.parent / path)
+    return paths
+
+
+def _decode_video(
+    video_path: Path,
+    sample_frames: int,
+    strategy: str,
+    sampling: str,
+    prep: FramePrep,
+    features: bool = False,
+    temporal: bool = False,
+) -> tuple[list[Frame], TemporalReport | None, float]:
+    """Decode a video's sampled frames (runs in a worker process).
+
+    With ``temporal``, the video's temporal analysis runs here too, so
+    its full decode also happens in the process pool.
+    """
+    start = time.perf_counter()
+    frames = extract_frames_in_memory(
+        video_path, sample_frames, strategy, sampling, prep, features
+    )
+    report = analyze_temporal(video_path) if temporal else None
+    return frames, report, time.perf_counter() - start
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class BatchSummary:
+    """Throughput statistics for a batch run.
+
+    Attributes:
+        videos: Number of videos that produced a result
+        failed: Number of videos that raised an error or got no usable
+            frame result
+        resumed: Number of videos skipped as already finished
+        frames: Number of frames extracted across all videos
+        elapsed: Wall-clock seconds for the whole run
+        latencies: Per-video seconds from decode start to result
+    """
+
+    videos: int = 0
+    failed: int = 0
+    resumed: int = 0
+    frames: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Return the summary as a JSON-serializable dict."""
+        elapsed = self.elapsed or 1e-9
+        return {
+            "videos": self.videos,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "frames": self.frames,
+            "elapsed_s": round(self.elapsed, 3),
+            "videos_per_s": round(self.videos / elapsed, 3),
+            "frames_per_s": round(self.frames / elapsed, 3),
+            "latency_p50_s": round(_percentile(self.latencies, 50), 3),
+            "latency_p95_s": round(_percentile(self.latencies, 95), 3),
+        }
+
+
+def run_batch(
+    agent: VideoFraudDetectionAgent,
+    videos: Iterable[Path],
+    output: TextIO,
+    sample_frames: int = 5,
+    decode_workers: int | None = None,
+    checkpoint: CheckpointStore | None = None,
+) -> BatchSummary:
+    """Analyze many videos in one process, streaming JSON Lines results.
+
+    Decoding, and the temporal analysis of agents that have it enabled,
+    runs in a process pool of ``decode_workers``. Up to
+    ``agent.max_concurrency`` decoded videos are analyzed at once, and
+    their model requests share the agent's bounded request pool. Only a
+    bounded number of videos is decoded ahead of analysis, so memory
+    does not grow with the corpus. Each video's record is written and
+    flushed as soon as it finishes; a video that fails is written with
+    an ``error`` field instead.
+
+    With a ``checkpoint``, every analyzed frame and finished video is
+    recorded in it. Videos it already lists as finished are not decoded
+    again: their stored record is re-emitted. A video is only finished
+    once every frame has a usable result, so videos interrupted midway
+    or with failed frames only query the frames that are missing. Videos
+    without any usable frame are counted as failed.
+
+    Args:
+        agent: Agent used for every video
+        videos: Video paths to analyze
+        output: Text stream receiving one JSON object per line
+        sample_frames: Number of frames to sample per video
+        decode_workers: Decoder processes (default: CPU count)
+        checkpoint: Store of completed work for a resumable run
+
+    Returns:
+        Throughput summary of the run
+    """
+    summary = BatchSummary()
+    start = time.perf_counter()
+    options = (
+        sample_frames,
+        agent.extraction_strategy,
+        agent.sampling,
+        agent.frame_prep,
+        agent.features,
+        agent.temporal,
+    )
+
+    def analyze(
+        path: Path,
+        video_hash: str | None,
+        frames: list[Frame],
+        report: TemporalReport | None,
+        decode_s: float,
+    ) -> tuple[dict, bool]:
+        begin = time.perf_counter()
+        # Tallies failed frames even without a store
+        frame_checkpoint = VideoCheckpoint(checkpoint, video_hash or str(path))
+        result = agent.analyze_extracted_frames(frames, frame_checkpoint)
+        if report is not None:
+            attach_report(result, report)
+        latency = decode_s + time.perf_counter() - begin
+        record = {"video": str(path), **result_to_dict(result)}
+        record = {**record, "frames": len(frames), "latency_s": round(latency, 3)}
+        # Unfinished videos are resumed, re-querying only the failed frames
+        if checkpoint and frame_checkpoint.complete:
+            checkpoint.record_video(video_hash, record)
+        return record, frame_checkpoint.parsed == 0
+
+    def emit(record: dict, resumed: bool = False, failed: bool = False) -> None:
+        if resumed:
+            summary.resumed += 1
+        elif failed or "error" in record:
+            summary.failed += 1
+        else:
+            summary.videos += 1
+            summary.frames += record["frames"]
+            summary.latencies.append(record["latency_s"])
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    decode_workers = decode_workers or os.cpu_count() or 1
+    # Bound videos held in memory between decoding and analysis
+    max_in_flight = decode_workers + 2 * agent.max_concurrency
+    queue = iter(videos)
+    pending: dict[Future, tuple[Path, str | None]] = {}
+    analyses: set[Future] = set()
+
+    with (
+        ProcessPoolExecutor(max_workers=decode_workers) as decoders,
+        ThreadPoolExecutor(max_workers=agent.max_concurrency) as analyzers,
+    ):
+        while True:
+            while len(pending) < max_in_flight:
+                path = next(queue, None)
+                if path is None:
+                    break
+                path = Path(path)
+                video_hash = None
+                if checkpoint:
+                    try:
+                        video_hash = fingerprint_video(path)
+                    except OSError as e:
+                        emit({"video": str(path), "error": str(e)})
+                        continue
+                    if (stored := checkpoint.video_record(video_hash)) is not None:
+                        emit(stored, resumed=True)
+                        continue
+                future = decoders.submit(_decode_video, path, *options)
+                pending[future] = (path, video_hash)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, video_hash = pending.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    analyses.discard(future)
+                    emit({"video": str(path), "error": str(e)})
+                    continue
+                if future in analyses:
+                    analyses.discard(future)
+                    record, failed = outcome
+                    emit(record, failed=failed)
+                else:
+                    analysis = analyzers.submit(analyze, path, video_hash, *outcome)
+                    analyses.add(analysis)
+                    pending[analysis] = (path, video_hash)
+
+    summary.elapsed = time.perf_counter() - start
+    return summary
@@ -0,0 +1,170 @@
+"""Persistent verdict cache for Video Fraud Detection Agent.
+
+This module stores per-frame LLM responses and parsed results in a
+SQLite database keyed by frame content, provider, model and prompt
+version, so re-analyzing the same frame skips the model entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .models import AnalysisResult, result_from_dict, result_to_dict
+from .prompts import (
+    ANALYSIS_PROMPT_TEMPLATE,
+    MULTI_FRAME_PROMPT_TEMPLATE,
+    SYSTEM_PROMPT,
+)
+
+# Changes whenever a prompt template is edited, invalidating old entries
+PROMPT_VERSION = hashlib.sha256(
+    (SYSTEM_PROMPT + ANALYSIS_PROMPT_TEMPLATE + MULTI_FRAME_PROMPT_TEMPLATE).encode(
+        "utf-8"
+    )
+).hexdigest()[:12]
+
+DEFAULT_CACHE_DIR = (
+    Path(os.getenv("XDG_CACHE_HOME", "~/.cache")).expanduser() / "video-fraud-detection"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+class VerdictCache:
+    """SQLite-backed, content-addressed cache of per-frame verdicts.
+
+    Entries older than ``max_age`` seconds are ignored and purged; when
+    the stored size exceeds ``max_bytes`` the least recently used
+    entries are evicted. Safe to share between threads.
+
+    Attributes:
+        path: Location of the SQLite database file
+        max_bytes: Upper bound on stored response/result bytes
+        max_age: Maximum entry age in seconds (None keeps entries forever)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float | None = 30 * 24 * 3600,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            max_bytes: Upper bound on stored bytes before LRU eviction
+            max_age: Maximum entry age in seconds, or None for no expiry
+        """
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "verdicts.sqlite3"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(image_data: str, provider: str, model_name: str) -> str:
+        """Build the cache key for a frame and model configuration.
+
+        Args:
+            image_data: Base64 encoded frame
+            provider: LLM provider name
+            model_name: Model name
+
+        Returns:
+            Hex digest identifying the frame/provider/model/prompt tuple
+        """
+        digest = hashlib.sha256(image_data.encode("ascii"))
+        digest.update(f"\0{provider}\0{model_name}\0{PROMPT_VERSION}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> AnalysisResult | None:
+        """Return the cached result for ``key``, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.max_age is not None and now - row[1] > self.max_age:
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return result_from_dict(json.loads(row[0]))
+
+    def get_response(self, key: str) -> str | None:
+        """Return the raw model response stored for ``key``, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, response: str, result: AnalysisResult) -> None:
+        """Store a raw response and its parsed result, then evict if needed."""
+        payload = json.dumps(result_to_dict(result))
+        size = len(response) + len(payload)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response, payload, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM verdicts")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over budget."""
+        if self.max_age is not None:
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE created_at < ?", (now - self.max_age,)
+            )
+        total = self._conn.execute("SELECT SUM(size) FROM verdicts").fetchone()[0]
+        if not total or total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM verdicts ORDER BY accessed_at"
+        ).fetchall():
+            self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
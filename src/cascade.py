@@ -0,0 +1,202 @@
+"""Model cascades for Video Fraud Detection Agent.
+
+A cascade is an ordered list of tiers, usually from a small fast vision
+model to a large one. Every frame goes to the first tier. A tier's
+result decides the frame unless its verdict is UNCERTAIN or its
+confidence is below the tier's threshold, in which case the frame is
+escalated to the next tier. The last tier always decides. When most
+frames are easy, most of them never reach the expensive model.
+
+The escalation helpers take the tiers and a callable querying one tier,
+so the agent's sync and async, single and packed paths share them. A
+tier of None stands for the agent's single model, which always decides.
+"""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .models import AnalysisResult, Verdict
+
+PROVIDERS = ("ollama", "openai", "anthropic")
+
+
+@dataclass(frozen=True)
+class CascadeTier:
+    """One model of a cascade.
+
+    Attributes:
+        model: Model name, e.g. 'moondream' or 'llava:13b'
+        provider: LLM provider ('ollama', 'openai', 'anthropic')
+        threshold: Confidence (0.0-1.0) a result needs to decide its
+            frame; ignored for the last tier
+    """
+
+    model: str
+    provider: str = "ollama"
+    threshold: float = 0.0
+
+    def __post_init__(self):
+        if self.provider not in PROVIDERS:
+            raise ValueError(f"Unknown model provider: {self.provider}")
+        if not 0.0 <= self.threshold <= 1.0:
+            raise ValueError(f"threshold must be in [0, 1], got {self.threshold}")
+
+    @property
+    def label(self) -> str:
+        """Name of the tier in reports, e.g. 'ollama/moondream'."""
+        return f"{self.provider}/{self.model}"
+
+    def accepts(self, result: AnalysisResult) -> bool:
+        """Check whether a result of this tier decides its frame."""
+        return (
+            result.verdict != Verdict.UNCERTAIN and result.confidence >= self.threshold
+        )
+
+
+def parse_tier(spec: str) -> CascadeTier:
+    """Parse a tier written as ``[provider/]model[@threshold]``.
+
+    Model names may contain ':' tags, so the threshold follows '@'; the
+    provider prefix is only recognized for known providers. Examples:
+    'moondream@0.8', 'llava:13b', 'openai/gpt-4o@0.5'.
+
+    Args:
+        spec: Tier specification
+
+    Returns:
+        Parsed tier (provider 'ollama' and threshold 0 by default)
+
+    Raises:
+        ValueError: If the threshold is not a number in [0, 1] or the
+            model name is empty
+    """
+    model, _, threshold = spec.partition("@")
+    provider = "ollama"
+    prefix, slash, rest = model.partition("/")
+    if slash and prefix in PROVIDERS:
+        provider, model = prefix, rest
+    if not model:
+        raise ValueError(f"No model name in cascade tier: {spec!r}")
+    try:
+        value = float(threshold) if threshold else 0.0
+    except ValueError:
+        raise ValueError(f"Invalid threshold in cascade tier: {spec!r}") from None
+    return CascadeTier(model, provider, value)
+
+
+def decides(
+    tiers: list[CascadeTier | None],
+    tier: CascadeTier | None,
+    result: AnalysisResult,
+    log: Callable[[str], None],
+) -> bool:
+    """Check whether a tier's result is final, recording the tier if so.
+
+    Args:
+        tiers: Every tier of the cascade, in order
+        tier: Tier that produced the result
+        result: Result of one frame; its ``tiers`` is set when final
+        log: Receives a progress message for each escalation
+
+    Returns:
+        False if the frame escalates to the next tier
+    """
+    if tier is None:
+        return True
+    if tier is not tiers[-1] and not tier.accepts(result):
+        log(
+            f"  {tier.label}: {result.verdict.value} at "
+            f"{result.confidence:.0%}, escalating"
+        )
+        return False
+    result.tiers = {tier.label: 1}
+    return True
+
+
+def escalate(
+    tiers: list[CascadeTier | None],
+    query: Callable[[CascadeTier | None], AnalysisResult],
+    log: Callable[[str], None],
+) -> AnalysisResult:
+    """Query one frame with each tier in turn until one decides it."""
+    for tier in tiers:
+        result = query(tier)
+        if decides(tiers, tier, result, log):
+            break
+    return result
+
+
+async def escalate_async(
+    tiers: list[CascadeTier | None],
+    query: Callable[[CascadeTier | None], Awaitable[AnalysisResult]],
+    log: Callable[[str], None],
+) -> AnalysisResult:
+    """Async counterpart of escalate."""
+    for tier in tiers:
+        result = await query(tier)
+        if decides(tiers, tier, result, log):
+            break
+    return result
+
+
+def escalate_pack(
+    tiers: list[CascadeTier | None],
+    count: int,
+    query: Callable[[CascadeTier | None, list[int]], list[AnalysisResult]],
+    log: Callable[[str], None],
+) -> list[AnalysisResult]:
+    """Escalate a pack of frames, re-packing those a tier doesn't decide.
+
+    Args:
+        tiers: Every tier of the cascade, in order
+        count: Number of frames in the pack
+        query: Queries a tier with the frames at the given indices of
+            the pack in one request, returning their results in order
+        log: Receives a progress message for each escalation
+
+    Returns:
+        One result per frame of the pack, in order
+    """
+    results: list[AnalysisResult | None] = [None] * count
+    pending = list(range(count))
+    for tier in tiers:
+        if not pending:
+            break
+        answered = query(tier, pending)
+        pending = _settle(tiers, tier, pending, answered, results, log)
+    return results
+
+
+async def escalate_pack_async(
+    tiers: list[CascadeTier | None],
+    count: int,
+    query: Callable[[CascadeTier | None, list[int]], Awaitable[list[AnalysisResult]]],
+    log: Callable[[str], None],
+) -> list[AnalysisResult]:
+    """Async counterpart of escalate_pack."""
+    results: list[AnalysisResult | None] = [None] * count
+    pending = list(range(count))
+    for tier in tiers:
+        if not pending:
+            break
+        answered = await query(tier, pending)
+        pending = _settle(tiers, tier, pending, answered, results, log)
+    return results
+
+
+def _settle(
+    tiers: list[CascadeTier | None],
+    tier: CascadeTier | None,
+    pending: list[int],
+    answered: list[AnalysisResult],
+    results: list[AnalysisResult | None],
+    log: Callable[[str], None],
+) -> list[int]:
+    """Record a tier's answers for the pending frames of a pack.
+
+    Returns:
+        Indices of the frames the tier escalated
+    """
+    for i, result in zip(pending, answered):
+        results[i] = result
+    return [i for i in pending if not decides(tiers, tier, results[i], log)]
@@ -0,0 +1,247 @@
+"""Resumable batch-run checkpoints for Video Fraud Detection Agent.
+
+This module records per-frame and per-video completion of a batch run
+in an append-only JSON Lines file named after the run id. Restarting a
+run with the same id replays the file, so finished videos are skipped
+and partially analyzed videos only query their missing frames.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .models import AnalysisResult, result_from_dict, result_to_dict
+
+# Bytes hashed from each end of a video when fingerprinting it
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+def fingerprint_video(video_path: Path) -> str:
+    """Identify a video by its size and the bytes at both ends.
+
+    Hashing the whole file would cost a full read of every video on
+    each resume; the container header, the trailing index and the size
+    identify a video file in practice.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Hex digest of the video's size, first and last FINGERPRINT_BYTES
+    """
+    size = os.path.getsize(video_path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(video_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """Append-only log of completed frames and videos for one run.
+
+    Records are appended as JSON lines and fsynced in batches: after
+    ``sync_every`` records or ``sync_interval`` seconds, whichever comes
+    first, so a crash loses at most that much work. A torn final line
+    left by a crash is ignored on replay. Safe to share between threads.
+
+    Attributes:
+        path: Location of the run's checkpoint file
+        run_id: Identifier of the run
+        config: Settings the run was started with
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: str | Path,
+        run_id: str,
+        config: dict | None = None,
+        sync_every: int = 64,
+        sync_interval: float = 1.0,
+    ):
+        """Open (or create) the checkpoint file for a run.
+
+        Args:
+            checkpoint_dir: Directory holding checkpoint files
+            run_id: Identifier of the run; reuse it to resume
+            config: Settings that must match when resuming (model,
+                sampling, ...), or None to skip the check
+            sync_every: Records written between fsyncs
+            sync_interval: Maximum seconds between fsyncs
+
+        Raises:
+            ValueError: If the run exists with a different config
+        """
+        checkpoint_dir = Path(checkpoint_dir)
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.path = checkpoint_dir / f"{run_id}.jsonl"
+        self.run_id = run_id
+        self.config = config
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._frames: dict[tuple[str, int], AnalysisResult] = {}
+        self._videos: dict[str, dict] = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        stored_config = self._replay()
+        if stored_config is not None and config is not None and stored_config != config:
+            raise ValueError(
+                f"Run {run_id!r} was started with different settings: "
+                f"{stored_config} != {config}"
+            )
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() > 0 and not self._ends_with_newline():
+            self._file.write("\n")
+        if stored_config is None and config is not None:
+            self._append({"type": "run", "config": config})
+
+    def video_record(self, video_hash: str) -> dict | None:
+        """Return the stored output record of a finished video, if any."""
+        with self._lock:
+            return self._videos.get(video_hash)
+
+    def frame_result(self, video_hash: str, index: int) -> AnalysisResult | None:
+        """Return the stored result of an analyzed frame, if any."""
+        with self._lock:
+            return self._frames.get((video_hash, index))
+
+    def record_frame(self, video_hash: str, index: int, result: AnalysisResult) -> None:
+        """Record that a frame of a video has been analyzed."""
+        with self._lock:
+            self._frames[(video_hash, index)] = result
+            self._append(
+                {
+                    "type": "frame",
+                    "video": video_hash,
+                    "frame": index,
+                    "result": result_to_dict(result),
+                }
+            )
+
+    def record_video(self, video_hash: str, record: dict) -> None:
+        """Record that a video is finished, with its output record."""
+        with self._lock:
+            self._videos[video_hash] = record
+            self._append({"type": "video", "video": video_hash, "record": record})
+
+    def for_video(self, video_hash: str) -> "VideoCheckpoint":
+        """Return a per-frame view of this store for one video."""
+        return VideoCheckpoint(self, video_hash)
+
+    def flush(self) -> None:
+        """Write and fsync any buffered records."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Flush buffered records and close the checkpoint file."""
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _replay(self) -> dict | None:
+        """Load completed frames and videos; return the stored run config."""
+        config = None
+        if not self.path.exists():
+            return config
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted run
+                kind = entry.get("type")
+                if kind == "run":
+                    config = entry["config"]
+                elif kind == "frame":
+                    key = (entry["video"], entry["frame"])
+                    self._frames[key] = result_from_dict(entry["result"])
+                elif kind == "video":
+                    self._videos[entry["video"]] = entry["record"]
+        return config
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _append(self, entry: dict) -> None:
+        """Append one record, fsyncing when the batch is due (lock held)."""
+        self._file.write(json.dumps(entry) + "\n")
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self._sync()
+
+    def _sync(self) -> None:
+        """Flush and fsync the checkpoint file (lock held)."""
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+
+class VideoCheckpoint:
+    """Per-frame checkpoint view of one video within a CheckpointStore.
+
+    Also tallies how the frames of the current pass ended: a video is
+    only complete once no frame failed. Without a store nothing is
+    recorded and only the tallies are kept.
+
+    Attributes:
+        store: Store the frames are recorded in, or None
+        video_hash: Fingerprint of the video
+        parsed: Frames with a usable result, stored or new
+        failed: Frames whose analysis failed or could not be parsed
+    """
+
+    def __init__(self, store: CheckpointStore | None, video_hash: str):
+        self.store = store
+        self.video_hash = video_hash
+        self.parsed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """Whether every frame analyzed so far has a usable result."""
+        return self.failed == 0
+
+    def get(self, index: int) -> AnalysisResult | None:
+        """Return the stored result for a frame index, if any."""
+        if self.store is None:
+            return None
+        result = self.store.frame_result(self.video_hash, index)
+        if result is not None:
+            with self._lock:
+                self.parsed += 1
+        return result
+
+    def put(self, index: int, result: AnalysisResult) -> None:
+        """Record the usable result for a frame index."""
+        with self._lock:
+            self.parsed += 1
+        if self.store is not None:
+            self.store.record_frame(self.video_hash, index, result)
+
+    def fail(self, index: int) -> None:
+        """Note that a frame has no usable result; it is not recorded."""
+        with self._lock:
+            self.failed += 1
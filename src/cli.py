@@ -0,0 +1,392 @@
+"""Command-line options of Video Fraud Detection Agent.
+
+The options are grouped by concern, each group added by its own helper,
+so ``--help`` lists them under headings.
+"""
+
+import argparse
+from pathlib import Path
+
+from .balancer import LEAST_OUTSTANDING, STRATEGIES
+from .cache import DEFAULT_CACHE_DIR
+from .cascade import parse_tier
+from .frame_prep import IMAGE_FORMATS
+from .frame_reader import AUTO, EXTRACTION_STRATEGIES
+from .packing import PACK_IMAGES, PACKING_MODES
+from .providers import parse_keep_alive
+from .sampling import SAMPLING_MODES, UNIFORM
+
+DEFAULT_CHECKPOINT_DIR = DEFAULT_CACHE_DIR / "runs"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Analyze videos/images for AI-generated content",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    _add_input_options(parser)
+    _add_service_options(parser)
+    _add_batch_options(parser)
+    _add_sampling_options(parser)
+    _add_analysis_options(parser)
+    _add_model_options(parser)
+    _add_request_options(parser)
+    _add_frame_prep_options(parser)
+    _add_network_options(parser)
+    _add_output_options(parser)
+    return parser
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Exit with a usage error if the parsed options don't fit together."""
+    inputs = [args.image, args.video, args.dir, args.manifest, args.serve]
+    if sum(bool(i) for i in inputs) != 1:
+        parser.error(
+            "Exactly one of --image, --video, --dir, --manifest or --serve is required"
+        )
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.frames_per_request < 1:
+        parser.error("--frames-per-request must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries must be at least 0")
+    if args.features and args.disk_frames:
+        parser.error("--features requires in-memory frames, not --disk-frames")
+    if args.workers < 1 or args.queue_size < 1:
+        parser.error("--workers and --queue-size must be at least 1")
+
+
+def _add_input_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options choosing what to analyze."""
+    group = parser.add_argument_group("inputs")
+    group.add_argument(
+        "--image",
+        type=Path,
+        help="Path to a single image/frame to analyze",
+    )
+    group.add_argument(
+        "--video",
+        type=Path,
+        help="Path to a video file to analyze",
+    )
+    group.add_argument(
+        "--dir",
+        type=Path,
+        help="Directory of videos to analyze in one batch run",
+    )
+    group.add_argument(
+        "--manifest",
+        type=Path,
+        help="File listing video paths (one per line) to analyze in one run",
+    )
+    group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a local HTTP service that analyzes submitted videos",
+    )
+
+
+def _add_service_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the HTTP service."""
+    group = parser.add_argument_group("service mode")
+    group.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Service mode: interface to listen on (default: 127.0.0.1)",
+    )
+    group.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Service mode: port to listen on (default: 8765)",
+    )
+    group.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Service mode: videos analyzed at once (default: 2)",
+    )
+    group.add_argument(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="Service mode: jobs waiting before submissions get 429 (default: 16)",
+    )
+
+
+def _add_batch_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options of batch runs over a directory or manifest."""
+    group = parser.add_argument_group("batch mode")
+    group.add_argument(
+        "--output",
+        type=Path,
+        help="Batch mode: write JSON Lines results here (default: stdout)",
+    )
+    group.add_argument(
+        "--decode-workers",
+        type=int,
+        default=None,
+        help="Batch mode: frame decoding processes (default: CPU count)",
+    )
+    group.add_argument(
+        "--run-id",
+        help="Batch mode: checkpoint progress under this id; rerun with the "
+        "same id to resume an interrupted run",
+    )
+    group.add_argument(
+        "--checkpoint-dir",
+        type=Path,
+        default=DEFAULT_CHECKPOINT_DIR,
+        help=f"Batch mode: checkpoint directory (default: {DEFAULT_CHECKPOINT_DIR})",
+    )
+
+
+def _add_sampling_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options choosing and decoding video frames."""
+    group = parser.add_argument_group("frame sampling")
+    group.add_argument(
+        "--frames",
+        type=int,
+        default=5,
+        help="Number of frames to sample from video (default: 5)",
+    )
+    group.add_argument(
+        "--sampling",
+        type=str,
+        default=UNIFORM,
+        choices=SAMPLING_MODES,
+        help="How frames are chosen: evenly spaced or across detected "
+        "scenes and motion (default: uniform)",
+    )
+    group.add_argument(
+        "--extraction",
+        type=str,
+        default=AUTO,
+        choices=EXTRACTION_STRATEGIES,
+        help="Frame decoding strategy (default: auto)",
+    )
+    group.add_argument(
+        "--disk-frames",
+        action="store_true",
+        help="Write extracted frames to a temp directory (debugging)",
+    )
+    group.add_argument(
+        "--dedup-threshold",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="Analyze near-identical frames once (perceptual hash distance, "
+        "e.g. 6); disabled by default",
+    )
+
+
+def _add_analysis_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options shaping the video verdict and its reports."""
+    group = parser.add_argument_group("analysis")
+    group.add_argument(
+        "--early-stop",
+        action="store_true",
+        help="Stop querying frames once the video verdict is settled",
+    )
+    group.add_argument(
+        "--early-stop-confidence",
+        type=float,
+        default=0.9,
+        help="Also stop when the first frames all agree at this confidence "
+        "(0-1, default: 0.9)",
+    )
+    group.add_argument(
+        "--confidence-weighted",
+        action="store_true",
+        help="Weight each frame's vote in the video verdict by its confidence",
+    )
+    group.add_argument(
+        "--recency-half-life",
+        type=float,
+        default=None,
+        metavar="FRAMES",
+        help="Halve a frame's vote for every FRAMES sampled frames before "
+        "the latest one, so the verdict follows the end of the video",
+    )
+    group.add_argument(
+        "--features",
+        action="store_true",
+        help="Score spectral and compression artifacts (FFT/DCT energy, "
+        "upsampling grid peaks, blockiness, color statistics) of each frame",
+    )
+    group.add_argument(
+        "--temporal",
+        action="store_true",
+        help="Also decode the whole video at reduced resolution and report "
+        "flicker and motion anomalies over time, with their timestamps",
+    )
+
+
+def _add_model_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options choosing and loading the models."""
+    group = parser.add_argument_group("model")
+    group.add_argument(
+        "--provider",
+        type=str,
+        default="ollama",
+        choices=["ollama", "openai", "anthropic"],
+        help="LLM provider to use (default: ollama)",
+    )
+    group.add_argument(
+        "--model",
+        type=str,
+        default="llava",
+        help="Model name to use (default: llava)",
+    )
+    group.add_argument(
+        "--cascade",
+        nargs="+",
+        type=parse_tier,
+        metavar="TIER",
+        help="Try each frame on these models in order, as "
+        "[provider/]model[@threshold] (e.g. moondream@0.8 llava:13b); a frame "
+        "goes to the next model when UNCERTAIN or below the threshold. "
+        "Replaces --provider and --model",
+    )
+    group.add_argument(
+        "--keep-alive",
+        type=parse_keep_alive,
+        default=None,
+        metavar="DURATION",
+        help="How long Ollama keeps the model loaded after each request, "
+        'e.g. "30m", or seconds; -1 keeps it loaded (default: server default)',
+    )
+    group.add_argument(
+        "--warm-up",
+        action="store_true",
+        help="Check the model is installed and load it before analyzing; "
+        "reports cold vs warm latency on stderr",
+    )
+    group.add_argument(
+        "--structured",
+        action="store_true",
+        help="Constrain Ollama output to the verdict JSON schema "
+        "(Ollama's format option), so every response parses",
+    )
+
+
+def _add_request_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options of model requests and the verdict cache."""
+    group = parser.add_argument_group("model requests")
+    group.add_argument(
+        "--frames-per-request",
+        type=int,
+        default=1,
+        help="Video frames packed into each model request (default: 1)",
+    )
+    group.add_argument(
+        "--packing",
+        choices=PACKING_MODES,
+        default=PACK_IMAGES,
+        help="How packed frames are sent: separate images or one tiled "
+        "mosaic (default: images)",
+    )
+    group.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream model responses and parse them incrementally",
+    )
+    group.add_argument(
+        "--verdict-only",
+        action="store_true",
+        help="Cancel generation once verdict and confidence are parsed "
+        "(faster; no reasoning or indicators)",
+    )
+    group.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Verdict cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model, bypassing the verdict cache",
+    )
+
+
+def _add_frame_prep_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options overriding how frames are uploaded."""
+    group = parser.add_argument_group("frame upload")
+    group.add_argument(
+        "--max-side",
+        type=int,
+        help="Downscale frames so the longest side is at most this many "
+        "pixels; 0 keeps full resolution (default: per provider/model)",
+    )
+    group.add_argument(
+        "--image-format",
+        choices=IMAGE_FORMATS,
+        help="Encoding of uploaded frames (default: per provider/model)",
+    )
+    group.add_argument(
+        "--quality",
+        type=int,
+        help="JPEG/WebP quality 1-100 of uploaded frames (default: per provider/model)",
+    )
+    group.add_argument(
+        "--grayscale",
+        action="store_true",
+        help="Upload frames as grayscale",
+    )
+
+
+def _add_network_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options spreading requests over Ollama servers."""
+    group = parser.add_argument_group("Ollama servers")
+    group.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of frames to analyze in parallel (default: 1)",
+    )
+    group.add_argument(
+        "--hosts",
+        nargs="+",
+        metavar="URL",
+        help="Ollama servers to balance requests across "
+        "(default: $OLLAMA_HOSTS, comma-separated, then $OLLAMA_HOST)",
+    )
+    group.add_argument(
+        "--balance",
+        choices=STRATEGIES,
+        default=LEAST_OUTSTANDING,
+        help="How requests are spread over --hosts: fewest in flight, or "
+        "in-flight count weighted by mean latency (default: least_outstanding)",
+    )
+    group.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retries of a failed model request, with jittered exponential "
+        "backoff (default: 2)",
+    )
+    group.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Resend a model request still pending after the p95 of recent "
+        "latencies and take the first response",
+    )
+
+
+def _add_output_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options for results and metrics output."""
+    group = parser.add_argument_group("output")
+    group.add_argument(
+        "--json",
+        action="store_true",
+        help="Output results as JSON",
+    )
+    group.add_argument(
+        "--metrics",
+        type=Path,
+        default=None,
+        help="Write per-stage timing histograms to this file "
+        "(JSON for .json, otherwise Prometheus text format)",
+    )
@@ -0,0 +1,186 @@
+"""Concurrency helpers for Video Fraud Detection Agent.
+
+This module fans per-frame (or per-pack) analysis out to a bounded
+worker pool while keeping results in frame order.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import TypeVar
+
+from .metrics import bind_context
+from .models import AnalysisResult, Verdict
+
+FrameT = TypeVar("FrameT")
+
+
+def failed_frame_result(error: Exception) -> AnalysisResult:
+    """Build the UNCERTAIN result recorded for a frame whose analysis failed.
+
+    Args:
+        error: Exception raised while analyzing the frame
+
+    Returns:
+        UNCERTAIN AnalysisResult with zero confidence
+    """
+    return AnalysisResult(
+        verdict=Verdict.UNCERTAIN,
+        confidence=0.0,
+        reasoning=f"Frame analysis failed: {error}",
+        indicators=[],
+        recommendations=["Re-run analysis for this frame"],
+    )
+
+
+def analyze_or_fail(
+    analyze: Callable[[FrameT], AnalysisResult], frame: FrameT
+) -> AnalysisResult:
+    """Analyze one frame, recording a failure as UNCERTAIN.
+
+    ``NotImplementedError`` is re-raised since it signals a configuration
+    problem rather than a per-frame failure.
+    """
+    try:
+        return analyze(frame)
+    except NotImplementedError:
+        raise
+    except Exception as e:
+        return failed_frame_result(e)
+
+
+def analyze_pack_or_fail(
+    analyze_pack: Callable[[Sequence[FrameT]], list[AnalysisResult]],
+    pack: Sequence[FrameT],
+) -> list[AnalysisResult]:
+    """Analyze one pack, recording a failure as UNCERTAIN for every frame."""
+    try:
+        return analyze_pack(pack)
+    except NotImplementedError:
+        raise
+    except Exception as e:
+        return [failed_frame_result(e) for _ in pack]
+
+
+def analyze_concurrently(
+    analyze: Callable[[FrameT], AnalysisResult],
+    frames: Sequence[FrameT],
+    max_concurrency: int,
+    executor: Executor | None = None,
+) -> list[AnalysisResult]:
+    """Analyze frames on a bounded thread pool.
+
+    Results are returned in the same order as ``frames``. A frame whose
+    analysis raises is recorded as UNCERTAIN instead of failing the video;
+    ``NotImplementedError`` is re-raised since it signals a configuration
+    problem rather than a per-frame failure.
+
+    Args:
+        analyze: Callable analyzing a single frame
+        frames: Frames to analyze
+        max_concurrency: Maximum number of frames analyzed at once
+        executor: Shared pool to submit frames to instead of a private one;
+            its size then bounds concurrency across all callers
+
+    Returns:
+        List of per-frame AnalysisResult in frame order
+    """
+    if not frames:
+        return []
+
+    # Worker threads record stage timings into the caller's scope
+    run = bind_context(partial(analyze_or_fail, analyze))
+    if executor is not None:
+        return list(executor.map(run, frames))
+
+    workers = max(1, min(max_concurrency, len(frames)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, frames))
+
+
+def analyze_packs_concurrently(
+    analyze_pack: Callable[[Sequence[FrameT]], list[AnalysisResult]],
+    packs: Sequence[Sequence[FrameT]],
+    max_concurrency: int,
+    executor: Executor | None = None,
+) -> list[AnalysisResult]:
+    """Analyze groups of frames on a bounded thread pool.
+
+    Like ``analyze_concurrently``, but each task analyzes a whole pack in
+    one request and returns one result per frame. A pack whose analysis
+    raises records every one of its frames as UNCERTAIN.
+
+    Args:
+        analyze_pack: Callable analyzing a pack, returning results in order
+        packs: Groups of frames, each analyzed by one call
+        max_concurrency: Maximum number of packs analyzed at once
+        executor: Shared pool to submit packs to instead of a private one
+
+    Returns:
+        Flat list of per-frame AnalysisResult in frame order
+    """
+    if not packs:
+        return []
+
+    run = bind_context(partial(analyze_pack_or_fail, analyze_pack))
+    if executor is not None:
+        nested = list(executor.map(run, packs))
+    else:
+        workers = max(1, min(max_concurrency, len(packs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            nested = list(pool.map(run, packs))
+    return [result for results in nested for result in results]
+
+
+async def analyze_concurrently_async(
+    analyze: Callable[[FrameT], Awaitable[AnalysisResult]],
+    frames: Sequence[FrameT],
+    max_concurrency: int,
+) -> list[AnalysisResult]:
+    """Analyze frames as event-loop tasks bounded by a semaphore.
+
+    Asynchronous counterpart of ``analyze_concurrently`` with the same
+    ordering and failure semantics. Waiting frames hold no thread.
+
+    Args:
+        analyze: Coroutine function analyzing a single frame
+        frames: Frames to analyze
+        max_concurrency: Maximum number of frames analyzed at once
+
+    Returns:
+        List of per-frame AnalysisResult in frame order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(frame: FrameT) -> AnalysisResult:
+        async with semaphore:
+            try:
+                return await analyze(frame)
+            except NotImplementedError:
+                raise
+            except Exception as e:
+                return failed_frame_result(e)
+
+    return list(await asyncio.gather(*(run(frame) for frame in frames)))
+
+
+async def analyze_packs_concurrently_async(
+    analyze_pack: Callable[[Sequence[FrameT]], Awaitable[list[AnalysisResult]]],
+    packs: Sequence[Sequence[FrameT]],
+    max_concurrency: int,
+) -> list[AnalysisResult]:
+    """Asynchronous counterpart of ``analyze_packs_concurrently``."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(pack: Sequence[FrameT]) -> list[AnalysisResult]:
+        async with semaphore:
+            try:
+                return await analyze_pack(pack)
+            except NotImplementedError:
+                raise
+            except Exception as e:
+                return [failed_frame_result(e) for _ in pack]
+
+    nested = await asyncio.gather(*(run(pack) for pack in packs))
+    return [result for results in nested for result in results]
@@ -0,0 +1,71 @@
+"""Perceptual-hash deduplication for Video Fraud Detection Agent.
+
+This module groups visually near-identical sampled frames so only one
+representative per group is sent to the model, with the group size
+used as its weight when aggregating.
+"""
+
+import cv2
+import numpy as np
+
+from .models import Frame
+
+HASH_SIZE = 8
+
+
+def dhash(image: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """Compute a difference hash of a decoded frame.
+
+    The frame is reduced to a ``(hash_size + 1) x hash_size`` grayscale
+    thumbnail and each bit records whether a pixel is brighter than its
+    right-hand neighbour.
+
+    Args:
+        image: Decoded BGR (or grayscale) frame
+        hash_size: Hash side length; the hash has hash_size**2 bits
+
+    Returns:
+        Hash as an integer
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def deduplicate_frames(
+    frames: list[Frame], threshold: int
+) -> tuple[list[Frame], list[int]]:
+    """Group frames whose hashes are within ``threshold`` bits.
+
+    Groups are formed greedily in frame order: each frame joins the
+    first group whose representative is close enough, otherwise it
+    starts a new group. Frames without a hash are never grouped.
+
+    Args:
+        frames: Frames in video order
+        threshold: Maximum Hamming distance for two frames to be grouped
+
+    Returns:
+        Tuple of (representative frames, number of frames each represents)
+    """
+    representatives: list[Frame] = []
+    weights: list[int] = []
+    for frame in frames:
+        for i, rep in enumerate(representatives):
+            if (
+                frame.phash is not None
+                and rep.phash is not None
+                and hamming_distance(frame.phash, rep.phash) <= threshold
+            ):
+                weights[i] += 1
+                break
+        else:
+            representatives.append(frame)
+            weights.append(1)
+    return representatives, weights
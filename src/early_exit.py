@@ -0,0 +1,183 @@
+"""Early-exit sequential decisions for Video Fraud Detection Agent.
+
+This module orders frames so the first ones analyzed cover the whole
+video, and stops issuing model calls once the aggregated verdict is
+settled.
+"""
+
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .aggregation import VotingPolicy
+from .models import AnalysisResult, Verdict
+
+FrameT = TypeVar("FrameT")
+
+
+@dataclass
+class EarlyStopPolicy:
+    """When to stop analyzing a video's remaining frames.
+
+    Analysis always stops once the weighted majority verdict can no
+    longer change, whatever the remaining frames say. If
+    ``agreement_confidence`` is set, it also stops as soon as at least
+    ``min_frames`` frames agree on a non-UNCERTAIN verdict, each with at
+    least that confidence.
+
+    Attributes:
+        min_frames: Minimum frames analyzed before an agreement stop
+        agreement_confidence: Confidence every agreeing frame must reach,
+            or None to stop only when the verdict is mathematically settled
+    """
+
+    min_frames: int = 3
+    agreement_confidence: float | None = 0.9
+
+    def should_stop(
+        self,
+        results: list[AnalysisResult],
+        weights: list[int],
+        remaining_weight: int,
+        voting: VotingPolicy | None = None,
+    ) -> bool:
+        """Decide whether the remaining frames can be skipped.
+
+        Args:
+            results: Frame results analyzed so far
+            weights: Number of frames each result stands for
+            remaining_weight: Frames still unanalyzed
+            voting: Vote weighting of the video verdict (default: one
+                vote per frame)
+
+        Returns:
+            True if analysis should stop
+        """
+        if not results:
+            return False
+        if verdict_locked(results, weights, remaining_weight, voting):
+            return True
+        if self.agreement_confidence is None or len(results) < self.min_frames:
+            return False
+        verdict = results[0].verdict
+        return verdict != Verdict.UNCERTAIN and all(
+            r.verdict == verdict and r.confidence >= self.agreement_confidence
+            for r in results
+        )
+
+
+def verdict_locked(
+    results: list[AnalysisResult],
+    weights: list[int],
+    remaining_weight: int,
+    voting: VotingPolicy | None = None,
+) -> bool:
+    """Check whether the weighted majority verdict can still flip.
+
+    Votes are scored as VerdictAccumulator scores them. In the worst
+    case every remaining frame votes for the runner-up with full
+    confidence. Under recency weighting the remaining frames may be the
+    newest ones, whose votes can outweigh everything analyzed so far,
+    so the verdict is never locked.
+
+    Args:
+        results: Frame results analyzed so far
+        weights: Number of frames each result stands for
+        remaining_weight: Frames still unanalyzed
+        voting: Vote weighting of the video verdict (default: one vote
+            per frame)
+
+    Returns:
+        True if the leading verdict stays ahead even if every remaining
+        frame votes for the runner-up
+    """
+    voting = voting or VotingPolicy()
+    if voting.half_life is not None:
+        return False
+    scores = {v: 0.0 for v in Verdict}
+    for result, weight in zip(results, weights):
+        vote = weight * result.confidence if voting.confidence_weighted else weight
+        scores[result.verdict] += vote
+    leader, runner_up = sorted(scores.values(), reverse=True)[:2]
+    return leader - runner_up > remaining_weight
+
+
+def informative_order(count: int) -> list[int]:
+    """Order positions so every prefix spreads across the whole range.
+
+    Uses the bit-reversal (van der Corput) sequence: for 8 frames the
+    order is 0, 4, 2, 6, 1, 5, 3, 7.
+
+    Args:
+        count: Number of positions
+
+    Returns:
+        Permutation of range(count)
+    """
+    if count <= 1:
+        return list(range(count))
+    bits = (count - 1).bit_length()
+    keys = [int(f"{i:0{bits}b}"[::-1], 2) for i in range(count)]
+    return sorted(range(count), key=lambda i: keys[i])
+
+
+def _plan(frames: Sequence[FrameT], batch_size: int) -> list[list[int]]:
+    """Split the informative ordering of frames into batches."""
+    order = informative_order(len(frames))
+    size = max(1, batch_size)
+    return [order[i : i + size] for i in range(0, len(order), size)]
+
+
+def analyze_until_decided(
+    analyze_batch: Callable[[list[FrameT]], list[AnalysisResult]],
+    frames: Sequence[FrameT],
+    weights: list[int],
+    policy: EarlyStopPolicy,
+    batch_size: int = 1,
+    voting: VotingPolicy | None = None,
+) -> tuple[list[AnalysisResult], list[int]]:
+    """Analyze frames in informative order until the policy says stop.
+
+    Args:
+        analyze_batch: Analyzes a batch of frames, returning results in order
+        frames: Frames in video order
+        weights: Number of frames each entry stands for
+        policy: Early-stop policy
+        batch_size: Frames analyzed between stop checks
+        voting: Vote weighting of the video verdict, so a locked verdict
+            is the one the aggregate will report
+
+    Returns:
+        Tuple of (results analyzed, their weights)
+    """
+    results: list[AnalysisResult] = []
+    used: list[int] = []
+    remaining = sum(weights)
+    for batch in _plan(frames, batch_size):
+        results.extend(analyze_batch([frames[i] for i in batch]))
+        used.extend(weights[i] for i in batch)
+        remaining -= sum(weights[i] for i in batch)
+        if remaining and policy.should_stop(results, used, remaining, voting):
+            break
+    return results, used
+
+
+async def analyze_until_decided_async(
+    analyze_batch: Callable[[list[FrameT]], Awaitable[list[AnalysisResult]]],
+    frames: Sequence[FrameT],
+    weights: list[int],
+    policy: EarlyStopPolicy,
+    batch_size: int = 1,
+    voting: VotingPolicy | None = None,
+) -> tuple[list[AnalysisResult], list[int]]:
+    """Async counterpart of ``analyze_until_decided``."""
+    results: list[AnalysisResult] = []
+    used: list[int] = []
+    remaining = sum(weights)
+    for batch in _plan(frames, batch_size):
+        results.extend(await analyze_batch([frames[i] for i in batch]))
+        used.extend(weights[i] for i in batch)
+        remaining -= sum(weights[i] for i in batch)
+        if remaining and policy.should_stop(results, used, remaining, voting):
+            break
+    return results, used
@@ -0,0 +1,151 @@
+"""Frame preparation before upload for Video Fraud Detection Agent.
+
+This module downscales and re-encodes decoded frames before they are
+sent to a vision model. Vision encoders resize their input to a few
+hundred pixels anyway, so full-resolution frames only inflate request
+payloads and prefill time.
+"""
+
+import base64
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from .metrics import BASE64, ENCODE, RESIZE, span
+
+JPEG = "jpeg"
+WEBP = "webp"
+PNG = "png"
+IMAGE_FORMATS = (JPEG, WEBP, PNG)
+
+COLOR = "color"
+GRAY = "gray"
+COLOR_MODES = (COLOR, GRAY)
+
+INTERPOLATIONS = {
+    "area": cv2.INTER_AREA,
+    "linear": cv2.INTER_LINEAR,
+    "cubic": cv2.INTER_CUBIC,
+    "lanczos": cv2.INTER_LANCZOS4,
+}
+
+_EXTENSIONS = {JPEG: ".jpg", WEBP: ".webp", PNG: ".png"}
+
+
+@dataclass(frozen=True)
+class FramePrep:
+    """How a decoded frame is resized and encoded for upload.
+
+    Attributes:
+        max_side: Longest side in pixels after downscaling, or None to
+            keep the original resolution. Frames are never upscaled.
+        interpolation: Resampling method, a key of INTERPOLATIONS
+        image_format: One of IMAGE_FORMATS
+        quality: JPEG/WebP quality (1-100); ignored for PNG
+        color: 'color' keeps BGR; 'gray' sends a single luma channel
+    """
+
+    max_side: int | None = 1024
+    interpolation: str = "area"
+    image_format: str = JPEG
+    quality: int = 85
+    color: str = COLOR
+
+    def __post_init__(self):
+        if self.max_side is not None and self.max_side < 1:
+            raise ValueError(f"max_side must be >= 1, got {self.max_side}")
+        if self.interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation: {self.interpolation}")
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format: {self.image_format}")
+        if not 1 <= self.quality <= 100:
+            raise ValueError(f"quality must be in 1-100, got {self.quality}")
+        if self.color not in COLOR_MODES:
+            raise ValueError(f"Unknown color mode: {self.color}")
+
+    @property
+    def extension(self) -> str:
+        """File extension matching ``image_format``."""
+        return _EXTENSIONS[self.image_format]
+
+    def resize(self, image: np.ndarray) -> np.ndarray:
+        """Downscale and convert a decoded BGR frame.
+
+        Args:
+            image: Decoded BGR frame
+
+        Returns:
+            Frame whose longest side is at most ``max_side``
+        """
+        if self.color == GRAY and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = image.shape[:2]
+        longest = max(height, width)
+        if self.max_side is None or longest <= self.max_side:
+            return image
+        scale = self.max_side / longest
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(image, size, interpolation=INTERPOLATIONS[self.interpolation])
+
+    def encode_bytes(self, image: np.ndarray) -> bytes:
+        """Resize and encode a decoded frame to image bytes.
+
+        Raises:
+            ValueError: If the frame cannot be encoded
+        """
+        if self.image_format == JPEG:
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        elif self.image_format == WEBP:
+            params = [cv2.IMWRITE_WEBP_QUALITY, self.quality]
+        else:
+            params = []
+        with span(RESIZE):
+            image = self.resize(image)
+        with span(ENCODE):
+            ok, buffer = cv2.imencode(self.extension, image, params)
+        if not ok:
+            raise ValueError(f"Could not encode frame as {self.image_format}")
+        return buffer.tobytes()
+
+    def encode(self, image: np.ndarray) -> str:
+        """Resize and encode a decoded frame to base64.
+
+        Args:
+            image: Decoded BGR frame
+
+        Returns:
+            Base64 encoded image
+        """
+        data = self.encode_bytes(image)
+        with span(BASE64):
+            return base64.b64encode(data).decode("utf-8")
+
+
+DEFAULT_PREP = FramePrep()
+
+# Looked up as "provider:model", then "provider". LLaVA's encoder tiles
+# inputs to at most 672 px; hosted APIs downscale above these sizes.
+PREP_PROFILES: dict[str, FramePrep] = {
+    "ollama": FramePrep(max_side=1024),
+    "ollama:llava": FramePrep(max_side=672),
+    "openai": FramePrep(max_side=2048),
+    "anthropic": FramePrep(max_side=1568),
+}
+
+
+def prep_for(provider: str, model_name: str) -> FramePrep:
+    """Return the frame preparation profile for a provider and model.
+
+    Args:
+        provider: LLM provider name
+        model_name: Model name; a tag such as ``llava:13b`` matches ``llava``
+
+    Returns:
+        The most specific matching profile, or DEFAULT_PREP
+    """
+    base_model = model_name.split(":", 1)[0]
+    for key in (f"{provider}:{model_name}", f"{provider}:{base_model}", provider):
+        if key in PREP_PROFILES:
+            return PREP_PROFILES[key]
+    return DEFAULT_PREP
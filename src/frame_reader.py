@@ -0,0 +1,198 @@
+"""Frame decoding strategies for Video Fraud Detection Agent.
+
+This module decides which frames to sample and how to decode them:
+random seeks, a single sequential pass, or seeks snapped to keyframes.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .sampling import SAMPLING_MODES, SCENE, UNIFORM, select_scene_indices
+
+AUTO = "auto"
+SEEK = "seek"
+SEQUENTIAL = "sequential"
+KEYFRAME = "keyframe"
+EXTRACTION_STRATEGIES = (AUTO, SEEK, SEQUENTIAL, KEYFRAME)
+
+# Typical encoder keyframe interval (x264/x265 default keyint)
+DEFAULT_GOP_SIZE = 250
+
+
+def compute_frame_indices(total_frames: int, num_frames: int) -> list[int]:
+    """Calculate evenly distributed frame indices to sample.
+
+    Args:
+        total_frames: Number of frames in the video
+        num_frames: Number of frames to sample
+
+    Returns:
+        Sorted list of frame indices
+    """
+    if num_frames >= total_frames:
+        return list(range(total_frames))
+    step = total_frames / num_frames
+    return [int(i * step) for i in range(num_frames)]
+
+
+def choose_strategy(indices: list[int], gop_size: int = DEFAULT_GOP_SIZE) -> str:
+    """Pick the cheaper of seeking and a sequential pass.
+
+    A seek decodes from the preceding keyframe (about half a GOP on
+    average, never more than the frame index itself), while a sequential
+    pass decodes every frame up to the last target.
+
+    Args:
+        indices: Sorted frame indices to extract
+        gop_size: Assumed keyframe interval of the video
+
+    Returns:
+        SEEK or SEQUENTIAL
+    """
+    if not indices:
+        return SEQUENTIAL
+    seek_cost = sum(min(idx, gop_size // 2) + 1 for idx in indices)
+    sequential_cost = indices[-1] + 1
+    return SEEK if seek_cost < sequential_cost else SEQUENTIAL
+
+
+def find_keyframes(video_path: Path) -> list[int]:
+    """List keyframe indices by demuxing packets without decoding.
+
+    Uses the FFmpeg backend's raw stream mode. Returns an empty list
+    when the backend cannot report keyframes.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Sorted list of keyframe indices
+    """
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    keyframes = []
+    try:
+        idx = 0
+        while cap.isOpened() and cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(idx)
+            idx += 1
+    finally:
+        cap.release()
+    return keyframes
+
+
+def snap_to_keyframes(
+    indices: list[int], keyframes: list[int], max_distance: float
+) -> list[int]:
+    """Move each target to its nearest unused keyframe when close enough.
+
+    Targets without a keyframe within ``max_distance`` keep their index.
+
+    Args:
+        indices: Sorted frame indices to extract
+        keyframes: Sorted keyframe indices of the video
+        max_distance: Largest allowed shift of a target, in frames
+
+    Returns:
+        Sorted, de-duplicated frame indices
+    """
+    if not keyframes:
+        return indices
+    keyframe_array = np.asarray(keyframes)
+    snapped = set()
+    for idx in indices:
+        nearest = int(keyframe_array[np.abs(keyframe_array - idx).argmin()])
+        if abs(nearest - idx) <= max_distance and nearest not in snapped:
+            snapped.add(nearest)
+        else:
+            snapped.add(idx)
+    return sorted(snapped)
+
+
+def _read_seek(
+    cap: cv2.VideoCapture, indices: list[int]
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Decode each target frame after a random seek."""
+    for frame_idx in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        ret, frame = cap.read()
+        if ret:
+            yield frame_idx, frame
+
+
+def _read_sequential(
+    cap: cv2.VideoCapture, indices: list[int]
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Walk the stream once, retrieving only the target frames."""
+    position = 0
+    for frame_idx in indices:
+        while position < frame_idx:
+            if not cap.grab():
+                return
+            position += 1
+        if not cap.grab():
+            return
+        position += 1
+        ret, frame = cap.retrieve()
+        if ret:
+            yield frame_idx, frame
+
+
+def read_frames(
+    video_path: Path,
+    num_frames: int,
+    strategy: str = AUTO,
+    sampling: str = UNIFORM,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield (frame index, decoded frame) pairs for the sampled frames.
+
+    Args:
+        video_path: Path to video file
+        num_frames: Number of frames to sample
+        strategy: One of EXTRACTION_STRATEGIES
+        sampling: One of SAMPLING_MODES; 'uniform' spaces frames evenly,
+            'scene' spreads them across detected scenes and motion
+
+    Yields:
+        Tuples of (frame index in the video, decoded BGR frame)
+
+    Raises:
+        ValueError: If video cannot be opened, has no frames, or the
+            strategy or sampling mode is unknown
+    """
+    if strategy not in EXTRACTION_STRATEGIES:
+        raise ValueError(f"Unknown extraction strategy: {strategy}")
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {sampling}")
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_frames == 0:
+            raise ValueError(f"Video has no frames: {video_path}")
+
+        if sampling == SCENE:
+            indices = select_scene_indices(video_path, num_frames)
+        else:
+            indices = compute_frame_indices(total_frames, num_frames)
+        if strategy == KEYFRAME:
+            max_distance = total_frames / max(len(indices), 1) / 2
+            indices = snap_to_keyframes(
+                indices, find_keyframes(video_path), max_distance
+            )
+            strategy = SEEK
+        elif strategy == AUTO:
+            strategy = choose_strategy(indices)
+
+        if strategy == SEQUENTIAL:
+            yield from _read_sequential(cap, indices)
+        else:
+            yield from _read_seek(cap, indices)
+    finally:
+        cap.release()
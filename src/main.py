@@ -3,70 +3,206 @@
 Usage:
     python -m src.main --image path/to/frame.jpg
     python -m src.main --video path/to/video.mp4
+    python -m src.main --dir videos/ --output results.jsonl
+    python -m src.main --serve --port 8765
 """
 
 import argparse
 import sys
+from dataclasses import asdict, replace
 from pathlib import Path
 
 from .agent import VideoFraudDetectionAgent
-from .models import Verdict
+from .aggregation import VotingPolicy
+from .balancer import EndpointPool
+from .batch import discover_videos, read_manifest, run_batch
+from .cache import PROMPT_VERSION, VerdictCache
+from .checkpoint import CheckpointStore
+from .cli import build_parser, check_args
+from .early_exit import EarlyStopPolicy
+from .frame_prep import GRAY, FramePrep, prep_for
+from .metrics import METRICS
+from .models import Verdict, result_to_dict
+from .providers import OllamaClient, RetryPolicy
+from .service import serve
 
 
-def main():
-    """Run the video fraud detection agent."""
-    parser = argparse.ArgumentParser(
-        description="Analyze videos/images for AI-generated content",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
+def build_frame_prep(args: argparse.Namespace) -> FramePrep:
+    """Apply command-line overrides to the provider/model frame profile.
 
-    parser.add_argument(
-        "--image",
-        type=Path,
-        help="Path to a single image/frame to analyze",
-    )
-    parser.add_argument(
-        "--video",
-        type=Path,
-        help="Path to a video file to analyze",
-    )
-    parser.add_argument(
-        "--frames",
-        type=int,
-        default=5,
-        help="Number of frames to sample from video (default: 5)",
-    )
-    parser.add_argument(
-        "--provider",
-        type=str,
-        default="ollama",
-        choices=["ollama", "openai", "anthropic"],
-        help="LLM provider to use (default: ollama)",
-    )
-    parser.add_argument(
-        "--model",
-        type=str,
-        default="llava",
-        help="Model name to use (default: llava)",
+    Raises:
+        ValueError: If an override is out of range
+    """
+    overrides = {}
+    if args.max_side is not None:
+        overrides["max_side"] = args.max_side or None
+    if args.image_format:
+        overrides["image_format"] = args.image_format
+    if args.quality is not None:
+        overrides["quality"] = args.quality
+    if args.grayscale:
+        overrides["color"] = GRAY
+    provider, model = args.provider, args.model
+    if args.cascade:
+        # Frames are encoded once for every tier; fit the last one
+        provider, model = args.cascade[-1].provider, args.cascade[-1].model
+    return replace(prep_for(provider, model), **overrides)
+
+
+def build_agent(
+    args: argparse.Namespace, frame_prep: FramePrep
+) -> VideoFraudDetectionAgent:
+    """Create the agent described by parsed command-line arguments."""
+    batch = bool(args.dir or args.manifest or args.serve)
+    endpoints = EndpointPool.from_env(args.hosts, strategy=args.balance)
+    return VideoFraudDetectionAgent(
+        model_provider=args.provider,
+        model_name=args.model,
+        max_concurrency=args.concurrency,
+        ollama_client=OllamaClient(
+            pool_size=max(10, args.concurrency),
+            endpoints=endpoints,
+            retry=RetryPolicy(attempts=args.retries + 1),
+            hedge_percentile=95 if args.hedge else None,
+        ),
+        in_memory_frames=not args.disk_frames,
+        extraction_strategy=args.extraction,
+        cache=None if args.no_cache else VerdictCache(args.cache_dir),
+        dedup_threshold=args.dedup_threshold,
+        sampling=args.sampling,
+        early_stop=(
+            EarlyStopPolicy(agreement_confidence=args.early_stop_confidence)
+            if args.early_stop
+            else None
+        ),
+        voting=VotingPolicy(
+            confidence_weighted=args.confidence_weighted,
+            half_life=args.recency_half_life,
+        ),
+        frame_prep=frame_prep,
+        frames_per_request=args.frames_per_request,
+        packing=args.packing,
+        stream_responses=args.stream,
+        cancel_after_verdict=args.verdict_only,
+        keep_alive=args.keep_alive,
+        warm_up=args.warm_up,
+        structured_output=args.structured,
+        features=args.features,
+        temporal=args.temporal,
+        cascade=args.cascade,
+        verbose=not batch,
     )
-    parser.add_argument(
-        "--json",
-        action="store_true",
-        help="Output results as JSON",
+
+
+def run_config(agent: VideoFraudDetectionAgent, args: argparse.Namespace) -> dict:
+    """Settings a resumed batch run must share with the interrupted one.
+
+    Every setting that changes stored frame or video results is included,
+    so resuming with other settings fails instead of mixing results.
+    """
+    early_stop = agent.early_stop
+    return {
+        "provider": args.provider,
+        "model": args.model,
+        "cascade": [[t.provider, t.model, t.threshold] for t in args.cascade or []],
+        "frames": args.frames,
+        "sampling": args.sampling,
+        "extraction": args.extraction,
+        "frame_prep": asdict(agent.frame_prep),
+        "frames_per_request": args.frames_per_request,
+        "packing": args.packing,
+        "verdict_only": args.verdict_only,
+        "structured": args.structured,
+        "dedup_threshold": args.dedup_threshold,
+        "features": args.features,
+        "temporal": args.temporal,
+        "early_stop": asdict(early_stop) if early_stop is not None else None,
+        "voting": asdict(agent.voting),
+        "prompt_version": PROMPT_VERSION,
+    }
+
+
+def run_batch_mode(agent: VideoFraudDetectionAgent, args: argparse.Namespace):
+    """Analyze a directory or manifest of videos, streaming JSON Lines."""
+    videos = discover_videos(args.dir) if args.dir else read_manifest(args.manifest)
+    checkpoint = None
+    if args.run_id:
+        config = run_config(agent, args)
+        checkpoint = CheckpointStore(args.checkpoint_dir, args.run_id, config)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        summary = run_batch(
+            agent,
+            videos,
+            output,
+            args.frames,
+            decode_workers=args.decode_workers,
+            checkpoint=checkpoint,
+        )
+    finally:
+        if args.output:
+            output.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    stats = summary.to_dict()
+    print(
+        f"Processed {stats['videos']} videos ({stats['failed']} failed, "
+        f"{stats['resumed']} already done), "
+        f"{stats['frames']} frames in {stats['elapsed_s']:.1f}s: "
+        f"{stats['videos_per_s']:.2f} videos/s, {stats['frames_per_s']:.2f} "
+        f"frames/s, latency p50 {stats['latency_p50_s']:.2f}s "
+        f"p95 {stats['latency_p95_s']:.2f}s",
+        file=sys.stderr,
     )
 
-    args = parser.parse_args()
 
-    if not args.image and not args.video:
-        parser.error("Either --image or --video must be specified")
+def main():
+    """Run the video fraud detection agent."""
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(parser, args)
+    try:
+        frame_prep = build_frame_prep(args)
+    except ValueError as e:
+        parser.error(str(e))
 
     # Initialize agent
-    agent = VideoFraudDetectionAgent(
-        model_provider=args.provider,
-        model_name=args.model,
-    )
+    try:
+        agent = build_agent(args, frame_prep)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for report in agent.warmup_reports:
+        print(report.summary(), file=sys.stderr)
+
+    try:
+        if args.serve:
+            serve(
+                agent,
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                queue_size=args.queue_size,
+                sample_frames=args.frames,
+            )
+        elif args.dir or args.manifest:
+            try:
+                run_batch_mode(agent, args)
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            run_single_mode(agent, args)
+    finally:
+        agent.close()
+        if agent.cache is not None:
+            agent.cache.close()
+        write_metrics(args.metrics)
+
 
-    # Run analysis
+def run_single_mode(agent: VideoFraudDetectionAgent, args: argparse.Namespace):
+    """Analyze one image or video and print the result."""
     try:
         if args.image:
             result = agent.analyze_frame(args.image)
@@ -83,18 +219,21 @@ def main():
     if args.json:
         import json
 
-        output = {
-            "verdict": result.verdict.value,
-            "confidence": result.confidence,
-            "reasoning": result.reasoning,
-            "indicators": result.indicators,
-            "recommendations": result.recommendations,
-        }
-        print(json.dumps(output, indent=2))
+        print(json.dumps(result_to_dict(result), indent=2))
     else:
         print_report(result)
 
 
+def write_metrics(path: Path | None) -> None:
+    """Export the stage timing histograms recorded in this process."""
+    if path is None:
+        return
+    if path.suffix == ".json":
+        path.write_text(METRICS.to_json())
+    else:
+        path.write_text(METRICS.to_prometheus())
+
+
 def print_report(result):
     """Print a formatted analysis report.
 
@@ -126,8 +265,44 @@ def print_report(result):
         for rec in result.recommendations:
             print(f"  • {rec}")
 
+    print_pipeline_details(result)
     print("\n" + "=" * 60)
 
 
+def print_pipeline_details(result):
+    """Print the timings, features, temporal report and cascade of a result.
+
+    Args:
+        result: AnalysisResult to display
+    """
+    if result.timings:
+        print("\nTIMINGS:")
+        for stage, seconds in result.timings.items():
+            print(f"  • {stage}: {seconds:.3f}s")
+
+    if result.features:
+        print("\nFEATURES:")
+        for name, value in result.features.items():
+            print(f"  • {name}: {value:.4f}")
+
+    if result.temporal is not None:
+        report = result.temporal
+        print("\nTEMPORAL:")
+        print(
+            f"  • anomaly score: {report.anomaly_score:.1%} of transitions "
+            f"(peak {report.peak_score:.1f})"
+        )
+        for segment in report.segments:
+            print(
+                f"  • {segment.start:.2f}-{segment.end:.2f}s: "
+                f"{segment.signal} (score {segment.score:.1f})"
+            )
+
+    if result.tiers:
+        print("\nCASCADE:")
+        for tier, frames in result.tiers.items():
+            print(f"  • {tier}: {frames} frames")
+
+
 if __name__ == "__main__":
     main()
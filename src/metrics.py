@@ -0,0 +1,248 @@
+"""Per-stage timing instrumentation for Video Fraud Detection Agent.
+
+Pipeline stages (frame decoding, feature extraction, temporal analysis,
+resizing, encoding, the model request, parsing) are timed with
+``span()``, and Ollama's own server-side durations are recorded from
+its responses. Every observation goes to a process-wide
+``MetricsRegistry`` of histograms, exportable as JSON or Prometheus
+text, and to the innermost active ``timing_scope()``, whose per-stage
+totals the agent attaches to each AnalysisResult.
+
+Scopes nest: a frame's timings also count towards the video it belongs
+to. Worker threads see the scope of the caller when work is submitted
+through ``bind_context()``; asyncio tasks and ``asyncio.to_thread``
+inherit it automatically.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Client-side stages
+DECODE = "decode"
+FEATURES = "features"
+TEMPORAL = "temporal"
+RESIZE = "resize"
+ENCODE = "encode"
+BASE64 = "base64"
+REQUEST = "request"
+PARSE = "parse"
+FRAME = "frame"
+VIDEO = "video"
+
+# Server-side stages reported by Ollama, keyed by response field
+MODEL_DURATIONS = {
+    "total_duration": "model_total",
+    "load_duration": "model_load",
+    "prompt_eval_duration": "model_prompt_eval",
+    "eval_duration": "model_eval",
+}
+
+# Histogram upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (upper bound, observations at or below it) pairs."""
+        bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+        running, pairs = 0, []
+        for bound, count in zip(bounds, self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class MetricsRegistry:
+    """Thread-safe collection of per-stage duration histograms."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        """Create an empty registry.
+
+        Args:
+            buckets: Histogram upper bounds in seconds
+        """
+        self.buckets = buckets
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one duration for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def reset(self) -> None:
+        """Drop every recorded observation."""
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self) -> dict[str, dict]:
+        """Summarize each stage as count, total, mean and cumulative buckets."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": h.count,
+                    "sum_s": h.sum,
+                    "mean_s": h.sum / h.count,
+                    "buckets": dict(h.cumulative()),
+                }
+                for stage, h in sorted(self._histograms.items())
+            }
+
+    def to_json(self) -> str:
+        """Export the registry as JSON."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, namespace: str = "video_fraud") -> str:
+        """Export the registry in the Prometheus text exposition format.
+
+        Args:
+            namespace: Prefix of the metric name
+
+        Returns:
+            One ``<namespace>_stage_seconds`` histogram labelled by stage
+        """
+        name = f"{namespace}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent per pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                label = f'stage="{stage}"'
+                for bound, count in h.cumulative():
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {h.sum:.6f}")
+                lines.append(f"{name}_count{{{label}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+class StageTimings:
+    """Seconds spent per stage within one scope, including nested scopes."""
+
+    def __init__(self, parent: "StageTimings | None" = None):
+        self._parent = parent
+        self._totals: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time to a stage here and in every enclosing scope."""
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+        if self._parent is not None:
+            self._parent.add(stage, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        """Return per-stage totals in seconds."""
+        with self._lock:
+            return dict(self._totals)
+
+
+_scope: contextvars.ContextVar[StageTimings | None] = contextvars.ContextVar(
+    "timing_scope", default=None
+)
+
+
+@contextmanager
+def timing_scope() -> Iterator[StageTimings]:
+    """Collect the stage timings recorded until the block exits."""
+    timings = StageTimings(_scope.get())
+    token = _scope.set(timings)
+    try:
+        yield timings
+    finally:
+        _scope.reset(token)
+
+
+def record(stage: str, seconds: float) -> None:
+    """Record a duration in the registry and the current scope."""
+    METRICS.observe(stage, seconds)
+    timings = _scope.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one observation of ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed(stage: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorate a function so each call is timed as ``stage``."""
+
+    def decorate(function: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def timed_iter(items: Iterable[T], stage: str) -> Iterator[T]:
+    """Yield from ``items``, timing how long each item takes to produce."""
+    iterator = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record(stage, time.perf_counter() - start)
+        yield item
+
+
+def record_model_durations(message: dict) -> None:
+    """Record the server-side durations (nanoseconds) of an Ollama response."""
+    for field, stage in MODEL_DURATIONS.items():
+        if field in message:
+            record(stage, message[field] / 1e9)
+
+
+def bind_context(function: Callable[..., T]) -> Callable[..., T]:
+    """Run ``function`` in the caller's context, e.g. on a worker thread.
+
+    Each call gets its own copy, so one bound function can run on
+    several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+
+    return wrapper
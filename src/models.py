@@ -1,10 +1,10 @@
 """Data models for Video Fraud Detection Agent.
 
 This module contains the core data structures used for
-analysis results and verdict classifications.
+analysis results, verdict classifications and in-memory frames.
 """
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 
 
@@ -17,15 +17,65 @@ class Verdict(Enum):
 
 
 @dataclass
+class SuspiciousSegment:
+    """A stretch of video whose frame-to-frame changes are anomalous.
+
+    Attributes:
+        start: Start time in seconds
+        end: End time in seconds
+        score: Highest anomaly score (robust z-score) within the segment
+        signal: Temporal signal that scored highest, e.g. 'warp_error'
+    """
+
+    start: float
+    end: float
+    score: float
+    signal: str
+
+
+@dataclass
+class TemporalReport:
+    """Temporal consistency of a whole video (see temporal).
+
+    Attributes:
+        anomaly_score: Share of analyzed frame transitions that are
+            anomalous, from 0.0 to 1.0
+        peak_score: Highest anomaly score of any transition
+        duration: Length of the video in seconds
+        frames_analyzed: Frames decoded and analyzed
+        face_frames: Analyzed frames in which a face was tracked
+        segments: Suspicious segments in video order
+        signals: Mean of each temporal signal over the video
+    """
+
+    anomaly_score: float
+    peak_score: float
+    duration: float
+    frames_analyzed: int
+    face_frames: int
+    segments: list[SuspiciousSegment] = field(default_factory=list)
+    signals: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of video fraud analysis.
 
+    Slotted, so a result holds no per-instance ``__dict__`` and large
+    numbers of frame results stay compact in memory.
+
     Attributes:
         verdict: Classification result (AI_GENERATED, AUTHENTIC, UNCERTAIN)
         confidence: Confidence score from 0.0 to 1.0
         reasoning: Detailed explanation of the verdict
         indicators: List of specific indicators found
         recommendations: List of recommended follow-up actions
+        timings: Seconds spent per pipeline stage (see metrics)
+        features: Spectral and compression artifact scores of the frame,
+            or their mean over a video's frames (see features)
+        temporal: Temporal consistency of the whole video, if analyzed
+        tiers: Frames decided by each cascade tier, keyed by tier label
+            (see cascade); empty without a cascade
     """
 
     verdict: Verdict
@@ -33,3 +83,83 @@ class AnalysisResult:
     reasoning: str
     indicators: list[str]
     recommendations: list[str]
+    timings: dict[str, float] = field(default_factory=dict, compare=False)
+    features: dict[str, float] = field(default_factory=dict, compare=False)
+    temporal: TemporalReport | None = field(default=None, compare=False)
+    tiers: dict[str, int] = field(default_factory=dict, compare=False)
+
+
+def result_to_dict(result: AnalysisResult) -> dict:
+    """Convert an AnalysisResult to a JSON-serializable dict.
+
+    Args:
+        result: Result to convert
+
+    Returns:
+        Dict with the verdict as its string value; stage timings,
+        features, the temporal report and cascade tier counts are
+        included when recorded
+    """
+    data = {
+        "verdict": result.verdict.value,
+        "confidence": result.confidence,
+        "reasoning": result.reasoning,
+        "indicators": result.indicators,
+        "recommendations": result.recommendations,
+    }
+    if result.timings:
+        data["timings"] = result.timings
+    if result.features:
+        data["features"] = result.features
+    if result.temporal is not None:
+        data["temporal"] = asdict(result.temporal)
+    if result.tiers:
+        data["tiers"] = result.tiers
+    return data
+
+
+def result_from_dict(data: dict) -> AnalysisResult:
+    """Rebuild an AnalysisResult from ``result_to_dict`` output.
+
+    Args:
+        data: Dict produced by result_to_dict
+
+    Returns:
+        Equivalent AnalysisResult
+    """
+    return AnalysisResult(
+        verdict=Verdict(data["verdict"]),
+        confidence=data["confidence"],
+        reasoning=data["reasoning"],
+        indicators=data["indicators"],
+        recommendations=data["recommendations"],
+        timings=data.get("timings", {}),
+        features=data.get("features", {}),
+        temporal=temporal_from_dict(data["temporal"]) if "temporal" in data else None,
+        tiers=data.get("tiers", {}),
+    )
+
+
+@dataclass
+class Frame:
+    """A sampled video frame encoded in memory.
+
+    Attributes:
+        index: Position of the frame in the source video
+        name: Display name passed to the model as analysis context
+        data: Base64 encoded image, ready to send to a provider
+        phash: Perceptual hash of the decoded frame, if computed
+        features: Spectral and compression artifact scores, if computed
+    """
+
+    index: int
+    name: str
+    data: str = field(repr=False)
+    phash: int | None = None
+    features: dict[str, float] | None = None
+
+
+def temporal_from_dict(data: dict) -> TemporalReport:
+    """Rebuild a TemporalReport from its ``dataclasses.asdict`` form."""
+    segments = [SuspiciousSegment(**segment) for segment in data["segments"]]
+    return TemporalReport(**{**data, "segments": segments})
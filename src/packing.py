@@ -0,0 +1,220 @@
+"""Multi-frame request packing for Video Fraud Detection Agent.
+
+This module groups several frames into one model request, either as
+separate entries of the request's image list or tiled into a single
+labelled mosaic, so the system prompt and request overhead are paid
+once per group and the model can compare frames with each other.
+"""
+
+import base64
+import math
+from collections.abc import Awaitable, Callable
+
+import cv2
+import numpy as np
+
+from .cache import VerdictCache
+from .frame_prep import FramePrep
+from .metrics import StageTimings, timing_scope
+from .models import AnalysisResult
+from .parsing import is_parsed, parse_multi_frame_response
+from .prompts import MOSAIC_LAYOUT, MULTI_FRAME_PROMPT_TEMPLATE, MULTI_IMAGE_LAYOUT
+
+PACK_IMAGES = "images"
+PACK_MOSAIC = "mosaic"
+PACKING_MODES = (PACK_IMAGES, PACK_MOSAIC)
+
+
+def mosaic_grid(count: int) -> tuple[int, int]:
+    """Return the (rows, columns) of the most square grid holding ``count``."""
+    columns = max(1, math.ceil(math.sqrt(count)))
+    return math.ceil(count / columns), columns
+
+
+def decode_image(image_data: str) -> np.ndarray:
+    """Decode a base64 encoded image to a BGR array.
+
+    Raises:
+        ValueError: If the data is not a decodable image
+    """
+    buffer = np.frombuffer(base64.b64decode(image_data), dtype=np.uint8)
+    image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode image for mosaic")
+    return image
+
+
+def build_mosaic(images: list[np.ndarray]) -> np.ndarray:
+    """Tile frames into one image, left to right then top to bottom.
+
+    Every tile takes the size of the first frame; each is labelled with
+    its 1-based frame number and unused cells stay black.
+
+    Args:
+        images: Decoded BGR frames in order
+
+    Returns:
+        Mosaic as a BGR array
+    """
+    rows, columns = mosaic_grid(len(images))
+    height, width = images[0].shape[:2]
+    mosaic = np.zeros((rows * height, columns * width, 3), dtype=np.uint8)
+    scale = max(height, width) / 400
+    for number, image in enumerate(images, start=1):
+        if image.shape[:2] != (height, width):
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        row, column = divmod(number - 1, columns)
+        top, left = row * height, column * width
+        tile = mosaic[top : top + height, left : left + width]
+        tile[:] = image
+        origin = (int(8 * scale) + 2, int(32 * scale) + 2)
+        for color, thickness in (((0, 0, 0), 4), ((255, 255, 255), 2)):
+            cv2.putText(
+                tile,
+                str(number),
+                origin,
+                cv2.FONT_HERSHEY_SIMPLEX,
+                scale,
+                color,
+                max(1, int(thickness * scale)),
+                cv2.LINE_AA,
+            )
+    return mosaic
+
+
+def build_pack_prompt(names: list[str], mode: str) -> str:
+    """Format the multi-frame prompt for a group of frames.
+
+    Args:
+        names: Display names of the frames, in order
+        mode: One of PACKING_MODES
+
+    Returns:
+        Prompt text asking for one verdict per frame
+    """
+    if mode == PACK_MOSAIC:
+        rows, columns = mosaic_grid(len(names))
+        layout = MOSAIC_LAYOUT.format(rows=rows, columns=columns)
+    else:
+        layout = MULTI_IMAGE_LAYOUT
+    return MULTI_FRAME_PROMPT_TEMPLATE.format(
+        count=len(names), frames=", ".join(names), layout=layout
+    )
+
+
+def split_packs(frames: list, size: int) -> list[list]:
+    """Split frames into consecutive groups of ``size``."""
+    return [frames[i : i + size] for i in range(0, len(frames), size)]
+
+
+def pack_payload(
+    names: list[str], images: list[str], mode: str, frame_prep: FramePrep
+) -> tuple[list[str], str]:
+    """Build the images and prompt of one packed request.
+
+    Args:
+        names: Display names of the frames, in order
+        images: Base64 encoded frames, in order
+        mode: One of PACKING_MODES
+        frame_prep: Encodes the mosaic in mosaic mode
+
+    Returns:
+        Tuple of (images to send, prompt)
+    """
+    prompt = build_pack_prompt(names, mode)
+    if mode == PACK_MOSAIC:
+        mosaic = build_mosaic([decode_image(data) for data in images])
+        images = [frame_prep.encode(mosaic)]
+    return images, prompt
+
+
+def query_pack(
+    send: Callable[[list[str], str], str],
+    names: list[str],
+    images: list[str],
+    keys: list[str | None],
+    cache: VerdictCache | None,
+    mode: str,
+    frame_prep: FramePrep,
+) -> list[AnalysisResult]:
+    """Analyze the uncached frames of a pack with one model request.
+
+    Every frame sent carries the timings of the shared request, and its
+    result is cached if the response could be parsed.
+
+    Args:
+        send: Sends packed images and a prompt to the model and returns
+            its response
+        names: Display names of the frames, in order
+        images: Base64 encoded frames, in order
+        keys: Verdict cache key of each frame, or None when not cached
+        cache: Cache the keys belong to, or None
+        mode: One of PACKING_MODES
+        frame_prep: Encodes the mosaic in mosaic mode
+
+    Returns:
+        One result per frame, in order
+    """
+    results, todo = _cached(keys, cache)
+    if todo:
+        with timing_scope() as timings:
+            payload = pack_payload(
+                [names[i] for i in todo], [images[i] for i in todo], mode, frame_prep
+            )
+            response = send(*payload)
+            _store(response, results, todo, keys, cache)
+        _attach_timings(results, todo, timings)
+    return results
+
+
+async def query_pack_async(
+    send: Callable[[list[str], str], Awaitable[str]],
+    names: list[str],
+    images: list[str],
+    keys: list[str | None],
+    cache: VerdictCache | None,
+    mode: str,
+    frame_prep: FramePrep,
+) -> list[AnalysisResult]:
+    """Async counterpart of query_pack."""
+    results, todo = _cached(keys, cache)
+    if todo:
+        with timing_scope() as timings:
+            payload = pack_payload(
+                [names[i] for i in todo], [images[i] for i in todo], mode, frame_prep
+            )
+            response = await send(*payload)
+            _store(response, results, todo, keys, cache)
+        _attach_timings(results, todo, timings)
+    return results
+
+
+def _cached(
+    keys: list[str | None], cache: VerdictCache | None
+) -> tuple[list[AnalysisResult | None], list[int]]:
+    """Look up each packed frame, returning the results and the misses."""
+    results = [cache.get(key) if key else None for key in keys]
+    return results, [i for i, result in enumerate(results) if result is None]
+
+
+def _store(
+    response: str,
+    results: list[AnalysisResult | None],
+    todo: list[int],
+    keys: list[str | None],
+    cache: VerdictCache | None,
+) -> None:
+    """Fill in and cache the per-frame results of a packed response."""
+    parsed = parse_multi_frame_response(response, len(todo))
+    for i, result in zip(todo, parsed):
+        results[i] = result
+        if keys[i] and is_parsed(result):
+            cache.put(keys[i], response, result)
+
+
+def _attach_timings(
+    results: list[AnalysisResult], todo: list[int], timings: StageTimings
+) -> None:
+    """Give each frame of a request the timings of the shared request."""
+    for i in todo:
+        results[i].timings = timings.as_dict()
@@ -5,44 +5,229 @@ results from multiple frame analyses.
 """
 
 import json
+import math
+import re
+from dataclasses import fields
+from enum import Enum
+from typing import get_args, get_origin, get_type_hints
 
+from .aggregation import VerdictAccumulator, VotingPolicy
+from .metrics import PARSE, timed
 from .models import AnalysisResult, Verdict
 
+VERDICT_MAP = {
+    "AI_GENERATED": Verdict.AI_GENERATED,
+    "AUTHENTIC": Verdict.AUTHENTIC,
+    "UNCERTAIN": Verdict.UNCERTAIN,
+}
 
-def parse_llm_response(response: str) -> AnalysisResult:
-    """Parse LLM response into structured result.
+# AnalysisResult fields filled in by the pipeline rather than the model
+PIPELINE_FIELDS = frozenset({"timings", "features", "temporal", "tiers"})
 
-    Args:
-        response: Raw LLM response text
+# Wire format of fields whose JSON differs from their Python type
+_FIELD_SCHEMAS = {
+    # The prompts ask for a percentage; parsing rescales it to 0.0-1.0
+    "confidence": {"type": "number", "minimum": 0, "maximum": 100},
+}
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+# Characters that matter to the repair scanner outside strings, and the
+# rest of a string after its opening quote
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_DECODER = json.JSONDecoder(strict=False)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _type_schema(annotation) -> dict:
+    """Translate a field annotation to a JSON schema."""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return {"type": "string", "enum": [member.name for member in annotation]}
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation)
+        return {"type": "array", "items": _type_schema(item)}
+    return {"type": _JSON_TYPES[annotation]}
+
+
+def _result_schema() -> dict:
+    """Derive the JSON schema of one verdict object from AnalysisResult.
+
+    Properties follow the dataclass field order, which constrained
+    decoding preserves, so verdict and confidence are generated first.
+    """
+    hints = get_type_hints(AnalysisResult)
+    properties = {
+        f.name: _FIELD_SCHEMAS.get(f.name) or _type_schema(hints[f.name])
+        for f in fields(AnalysisResult)
+        if f.name not in PIPELINE_FIELDS
+    }
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+ANALYSIS_SCHEMA = _result_schema()
+
+_FRAME_SCHEMA = {
+    "type": "object",
+    "properties": {"frame": {"type": "integer"}, **ANALYSIS_SCHEMA["properties"]},
+    "required": ["frame", *ANALYSIS_SCHEMA["required"]],
+}
+
+MULTI_FRAME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "frames": {"type": "array", "items": _FRAME_SCHEMA},
+        "temporal_indicators": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["frames", "temporal_indicators"],
+}
+
+
+def _repair_json(response: str, start: int) -> tuple[str, int]:
+    """Cut the JSON object starting at ``start`` out of a response.
+
+    One pass over the structural characters finds where the object ends,
+    which leaves out trailing prose and code fences even when they contain
+    braces, and drops trailing commas before ``}`` and ``]``. A truncated
+    object (e.g. generation hit its token limit) is closed off.
 
     Returns:
-        Structured AnalysisResult
+        The repaired object text and the index just past its end
     """
-    try:
-        json_start = response.find("{")
-        json_end = response.rfind("}") + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = response[json_start:json_end]
-            data = json.loads(json_str)
-
-            verdict_map = {
-                "AI_GENERATED": Verdict.AI_GENERATED,
-                "AUTHENTIC": Verdict.AUTHENTIC,
-                "UNCERTAIN": Verdict.UNCERTAIN,
-            }
-
-            return AnalysisResult(
-                verdict=verdict_map.get(
-                    data.get("verdict", "UNCERTAIN"), Verdict.UNCERTAIN
-                ),
-                confidence=float(data.get("confidence", 50)) / 100.0,
-                reasoning=data.get("reasoning", "No reasoning provided"),
-                indicators=data.get("indicators", []),
-                recommendations=data.get("recommendations", []),
-            )
-    except (json.JSONDecodeError, KeyError, ValueError):
-        pass
+    stack: list[str] = []
+    drop: list[int] = []
+    comma = -1
+    in_string = False
+    end = -1
+    pos = start
+    while match := _STRUCTURAL.search(response, pos):
+        char, pos = match.group(), match.end()
+        if char in "}]" and comma >= 0 and not response[comma + 1 : pos - 1].strip():
+            drop.append(comma)
+        comma = pos - 1 if char == "," else -1
+        if char == '"':
+            string = _STRING_REST.match(response, pos)
+            if string is None:
+                in_string = True
+                break
+            pos = string.end()
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char != "," and stack:
+            stack.pop()
+            if not stack:
+                end = pos
+                break
+    if end < 0:
+        # Truncated: close the open string, value and containers
+        text = response[start:] + ('"' if in_string else "")
+        text = text.rstrip().rstrip(",")
+        if text.endswith(":"):
+            text += " null"
+        closed = _without(text, drop, start) + "".join(reversed(stack))
+        return closed, len(response)
+    return _without(response[start:end], drop, start), end
+
+
+def _without(text: str, positions: list[int], offset: int) -> str:
+    """Remove the characters at ``positions`` (offset by ``offset``) from text."""
+    if not positions:
+        return text
+    pieces, last = [], 0
+    for position in positions:
+        pieces.append(text[last : position - offset])
+        last = position - offset + 1
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
+def _extract_json(response: str) -> dict:
+    """Decode the first JSON object embedded in a response.
+
+    Each ``{`` not inside an earlier candidate is tried in turn, so prose
+    and code fences around the object, and brace-delimited prose before
+    it, are skipped. A candidate is decoded as is first and repaired by
+    ``_repair_json`` only if that fails. Control characters (raw
+    newlines) inside strings are accepted.
+
+    Raises:
+        ValueError: If the response holds no valid JSON object
+    """
+    start = response.find("{")
+    while start >= 0:
+        try:
+            return _DECODER.raw_decode(response, start)[0]
+        except json.JSONDecodeError:
+            candidate, end = _repair_json(response, start)
+            try:
+                return _DECODER.decode(candidate)
+            except json.JSONDecodeError:
+                start = response.find("{", end)
+    raise ValueError("No JSON object in response")
+
+
+def _verdict(value) -> Verdict:
+    """Map a verdict string, tolerating case, spaces and hyphens."""
+    verdict = VERDICT_MAP.get(value) if isinstance(value, str) else None
+    if verdict is not None:
+        return verdict
+    name = str(value).strip().upper().replace("-", "_").replace(" ", "_")
+    return VERDICT_MAP.get(name, Verdict.UNCERTAIN)
+
+
+def _confidence(value) -> float:
+    """Normalize a confidence to 0.0-1.0.
+
+    Accepts percentages as numbers (85) or strings ("85", "85%"), and
+    fractions (0.85, "0.85"). Out-of-range values are clamped; missing
+    or unreadable ones count as 50%.
+    """
+    if type(value) is int:  # the common case: a percentage as asked
+        return min(max(value, 0), 100) / 100.0
+    percent = isinstance(value, str) and value.strip().endswith("%")
+    if isinstance(value, str):
+        value = value.strip().rstrip("%").strip()
+        try:
+            value = int(value)
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                return 0.5
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.5
+    if math.isnan(value):
+        return 0.5
+    if isinstance(value, float) and value <= 1.0 and not percent:
+        value *= 100
+    return min(max(value, 0.0), 100.0) / 100.0
+
+
+def _string_list(value) -> list[str]:
+    """Coerce an indicators or recommendations value to a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [str(item) for item in value if item is not None]
+    return [str(value)]
+
 
+def _result_from_data(data: dict) -> AnalysisResult:
+    """Build a result from one decoded verdict object."""
+    reasoning = data.get("reasoning")
+    return AnalysisResult(
+        verdict=_verdict(data.get("verdict", "UNCERTAIN")),
+        confidence=_confidence(data.get("confidence", 50)),
+        reasoning=str(reasoning) if reasoning else "No reasoning provided",
+        indicators=_string_list(data.get("indicators")),
+        recommendations=_string_list(data.get("recommendations")),
+    )
+
+
+def _unparsed_result(response: str) -> AnalysisResult:
+    """Build the UNCERTAIN result recorded for an unparseable response."""
     return AnalysisResult(
         verdict=Verdict.UNCERTAIN,
         confidence=0.0,
@@ -52,52 +237,102 @@ def parse_llm_response(response: str) -> AnalysisResult:
     )
 
 
-def aggregate_results(results: list[AnalysisResult]) -> AnalysisResult:
+def is_parsed(result: AnalysisResult) -> bool:
+    """Check whether a result came from a usable model response.
+
+    Unparseable responses and failed frames come back UNCERTAIN with zero
+    confidence; they are never cached or checkpointed, so a re-run
+    queries the model again.
+    """
+    return result.verdict != Verdict.UNCERTAIN or result.confidence > 0
+
+
+@timed(PARSE)
+def parse_llm_response(response: str) -> AnalysisResult:
+    """Parse LLM response into structured result.
+
+    Args:
+        response: Raw LLM response text
+
+    Returns:
+        Structured AnalysisResult
+    """
+    try:
+        return _result_from_data(_extract_json(response))
+    except (json.JSONDecodeError, KeyError, ValueError):
+        return _unparsed_result(response)
+
+
+@timed(PARSE)
+def parse_multi_frame_response(response: str, count: int) -> list[AnalysisResult]:
+    """Parse a multi-frame response into one result per frame.
+
+    Entries are matched to frames by their 1-based ``frame`` number,
+    falling back to their position. Frames the model skipped, like every
+    frame of an unparseable response, come back UNCERTAIN with zero
+    confidence. Temporal indicators apply to the whole group and are
+    added to every frame's indicators.
+
+    Args:
+        response: Raw LLM response text
+        count: Number of frames sent in the request
+
+    Returns:
+        Per-frame AnalysisResult in request order
+    """
+    try:
+        data = _extract_json(response)
+        entries = data.get("frames", [])
+        temporal = _string_list(data.get("temporal_indicators"))
+        results: list[AnalysisResult | None] = [None] * count
+        for position, entry in enumerate(entries):
+            slot = _frame_slot(entry.get("frame"), position)
+            if 0 <= slot < count and results[slot] is None:
+                result = _result_from_data(entry)
+                result.indicators = [*result.indicators, *temporal]
+                results[slot] = result
+    except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+        return [_unparsed_result(response) for _ in range(count)]
+    return [
+        r or _unparsed_result(f"No verdict returned for frame {i + 1}")
+        for i, r in enumerate(results)
+    ]
+
+
+def _frame_slot(number, position: int) -> int:
+    """0-based slot of a packed entry from its ``frame`` number or position."""
+    if isinstance(number, bool):
+        return position
+    try:
+        return int(number) - 1
+    except (TypeError, ValueError):
+        return position
+
+
+def aggregate_results(
+    results: list[AnalysisResult],
+    weights: list[int] | None = None,
+    policy: VotingPolicy | None = None,
+    positions: list[float] | None = None,
+) -> AnalysisResult:
     """Aggregate multiple frame results into overall verdict.
 
     Args:
         results: List of individual frame analysis results
+        weights: Number of frames each result stands for (e.g. after
+            deduplication). Defaults to one frame per result.
+        policy: Vote weighting (default: one vote per frame)
+        positions: Position of each result's frame in the video, for
+            recency weighting. Defaults to the order of ``results``.
 
     Returns:
         Aggregated AnalysisResult with combined verdict
     """
-    if not results:
-        return AnalysisResult(
-            verdict=Verdict.UNCERTAIN,
-            confidence=0.0,
-            reasoning="No frames analyzed",
-            indicators=[],
-            recommendations=["Provide video frames for analysis"],
-        )
-
-    verdict_counts = {v: 0 for v in Verdict}
-    total_confidence = 0.0
-    all_indicators = []
-    all_recommendations = []
-
-    for result in results:
-        verdict_counts[result.verdict] += 1
-        total_confidence += result.confidence
-        all_indicators.extend(result.indicators)
-        all_recommendations.extend(result.recommendations)
-
-    max_verdict = max(verdict_counts, key=lambda v: verdict_counts[v])
-    avg_confidence = total_confidence / len(results)
-    unique_indicators = list(set(all_indicators))
-    unique_recommendations = list(set(all_recommendations))
-
-    reasoning = (
-        f"Analyzed {len(results)} frames. "
-        f"Verdicts: AI={verdict_counts[Verdict.AI_GENERATED]}, "
-        f"Authentic={verdict_counts[Verdict.AUTHENTIC]}, "
-        f"Uncertain={verdict_counts[Verdict.UNCERTAIN]}. "
-        f"Average confidence: {avg_confidence:.1%}"
-    )
-
-    return AnalysisResult(
-        verdict=max_verdict,
-        confidence=avg_confidence,
-        reasoning=reasoning,
-        indicators=unique_indicators,
-        recommendations=unique_recommendations,
-    )
+    accumulator = VerdictAccumulator(policy)
+    if weights is None:
+        weights = [1] * len(results)
+    if positions is None:
+        positions = [None] * len(results)
+    for result, weight, position in zip(results, weights, positions):
+        accumulator.add(result, weight, position)
+    return accumulator.snapshot()
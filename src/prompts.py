@@ -58,3 +58,32 @@ Provide your analysis in the following JSON format:
     "indicators": ["indicator1", "indicator2", ...],
     "recommendations": ["recommendation1", ...]
 }}"""
+
+MULTI_FRAME_PROMPT_TEMPLATE = """Analyze these {count} video frames ({frames})
+for signs of AI generation. {layout}
+Judge every frame on its own, and compare the frames with each other for
+temporal inconsistencies (flicker, morphing, identity or lighting drift).
+
+Provide your analysis in the following JSON format, with one entry per
+frame numbered 1 to {count} in the order given:
+{{
+    "frames": [
+        {{
+            "frame": 1,
+            "verdict": "AI_GENERATED" | "AUTHENTIC" | "UNCERTAIN",
+            "confidence": 0-100,
+            "reasoning": "detailed explanation",
+            "indicators": ["indicator1", ...],
+            "recommendations": ["recommendation1", ...]
+        }},
+        ...
+    ],
+    "temporal_indicators": ["inconsistency between frames", ...]
+}}"""
+
+MULTI_IMAGE_LAYOUT = "Each frame is a separate image, in order."
+
+MOSAIC_LAYOUT = (
+    "The frames are tiled into one image in a {rows}x{columns} grid, left to "
+    "right then top to bottom; each tile is labelled with its frame number."
+)
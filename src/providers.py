@@ -1,43 +1,549 @@
 """LLM Provider implementations for Video Fraud Detection Agent.
 
 This module contains provider-specific implementations for
-querying vision-capable language models.
+querying vision-capable language models, and the resilience layer
+around Ollama requests: retries with jittered exponential backoff,
+per-endpoint circuit breaking (see balancer.py) and optional hedging.
 """
 
-import os
+import math
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TypeVar
 
+from .balancer import CircuitOpenError, EndpointPool
+from .metrics import REQUEST, bind_context, record_model_durations, span
+from .parsing import ANALYSIS_SCHEMA
 from .prompts import ANALYSIS_PROMPT_TEMPLATE, SYSTEM_PROMPT
+from .streaming import iter_ndjson_responses
 
+# Ollama's keep_alive: a duration string ("5m") or seconds (-1 = forever)
+KeepAlive = str | int
 
-def query_ollama(model_name: str, image_data: str, context: str) -> str:
+# Ollama's format: "json" for any JSON, or a JSON schema to constrain output
+ResponseFormat = str | dict
+
+# Timeouts, rate limiting and server-side failures worth retrying
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Latency samples required before hedging starts
+HEDGE_MIN_SAMPLES = 20
+
+T = TypeVar("T")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether a failed request may succeed if sent again.
+
+    Connection failures, timeouts, open circuits and the statuses in
+    ``RETRYABLE_STATUS`` are retryable; other HTTP errors (a missing
+    model, a malformed request) are not.
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code in RETRYABLE_STATUS
+    # requests' connection errors and timeouts are OSErrors
+    return isinstance(error, (OSError, CircuitOpenError))
+
+
+@dataclass
+class RetryPolicy:
+    """Retries of failed Ollama requests with jittered exponential backoff.
+
+    The delay before retry ``n`` (from 0) is drawn uniformly from zero to
+    ``min(max_delay, base_delay * 2**n)`` ("full jitter"), so frames that
+    failed together don't retry in lockstep. A request refused by an open
+    circuit was never sent: it waits until an endpoint is back on
+    probation and does not use up an attempt.
+
+    Attributes:
+        attempts: Total tries per request, including the first
+        base_delay: Upper bound of the first backoff in seconds
+        max_delay: Upper bound of any backoff in seconds
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def __post_init__(self):
+        if self.attempts < 1:
+            raise ValueError(f"attempts must be >= 1, got {self.attempts}")
+
+    def backoff(self, retry: int) -> float:
+        """Return the seconds to wait before retry number ``retry``."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+    def delay_after(
+        self,
+        error: BaseException,
+        attempt: int,
+        retryable: Callable[[BaseException], bool] = is_retryable,
+    ) -> float | None:
+        """Return the backoff before retrying a failed attempt, or None.
+
+        Args:
+            error: Exception raised by attempt number ``attempt`` (from 0)
+            attempt: Number of the attempt that failed
+            retryable: Decides whether the error may be retried
+
+        Returns:
+            Seconds to wait, or None if the error is not retryable or no
+            attempts are left
+        """
+        if isinstance(error, CircuitOpenError):
+            return max(error.retry_in, self.backoff(attempt))
+        if attempt + 1 >= self.attempts or not retryable(error):
+            return None
+        return self.backoff(attempt)
+
+
+class LatencyWindow:
+    """Thread-safe window of recent request latencies.
+
+    Attributes:
+        size: Number of most recent samples kept
+    """
+
+    def __init__(self, size: int = 200):
+        """Create an empty window keeping the last ``size`` samples."""
+        self.size = size
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        """Record one request latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(
+        self, pct: float, min_samples: int = HEDGE_MIN_SAMPLES
+    ) -> float | None:
+        """Nearest-rank percentile, or None with fewer than ``min_samples``."""
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def build_ollama_payload(
+    model_name: str,
+    image_data: str | list[str],
+    context: str,
+    prompt: str | None = None,
+    stream: bool = False,
+    keep_alive: KeepAlive | None = None,
+    response_format: ResponseFormat | None = None,
+) -> dict:
+    """Build the request body for Ollama's /api/generate endpoint.
+
+    Args:
+        model_name: Name of the Ollama model to use
+        image_data: Base64 encoded image, or several for a packed request
+        context: Additional context for the analysis
+        prompt: Prompt replacing the single-frame analysis prompt
+        stream: Ask for an NDJSON token stream instead of one response
+        keep_alive: How long Ollama keeps the model loaded after the
+            request (duration string such as "30m", or seconds; -1 keeps
+            it loaded), or None for the server default
+        response_format: Sent as Ollama's ``format``: "json" or a JSON
+            schema the output is constrained to, or None for free text
+
+    Returns:
+        JSON-serializable request body
+    """
+    images = [image_data] if isinstance(image_data, str) else list(image_data)
+    payload = {
+        "model": model_name,
+        "prompt": prompt or ANALYSIS_PROMPT_TEMPLATE.format(context=context),
+        "system": SYSTEM_PROMPT,
+        "images": images,
+        "stream": stream,
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if response_format is not None:
+        payload["format"] = response_format
+    return payload
+
+
+def parse_keep_alive(value: str) -> KeepAlive:
+    """Convert a command-line keep_alive to what Ollama accepts.
+
+    Bare numbers are seconds and must be sent as numbers; anything else
+    ("10m", "1h") is passed through as a duration string.
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def model_matches(available: str, model_name: str) -> bool:
+    """Check whether an installed model name satisfies a requested one.
+
+    A request without a tag matches the ``latest`` tag.
+    """
+    if ":" not in model_name:
+        model_name += ":latest"
+    if ":" not in available:
+        available += ":latest"
+    return available == model_name
+
+
+class OllamaClient:
+    """Pooled, keep-alive HTTP client for one or more Ollama servers.
+
+    Holds one ``requests.Session`` whose connection pool is reused by
+    every request for the lifetime of the client, so concurrent frame
+    requests share warm TCP connections instead of opening new ones.
+    The session is created lazily on first use. Each generate request
+    is routed to a server of ``endpoints``, retried on transient failures
+    and, when ``hedge_percentile`` is set, duplicated if it runs slower
+    than that percentile of recent requests.
+
+    Attributes:
+        host: Base URL of the first Ollama server
+        endpoints: Servers requests are balanced across
+        pool_size: Maximum number of pooled connections per server
+        connect_timeout: Seconds to wait for a connection
+        read_timeout: Seconds to wait for the model response
+        keep_alive: Whether connections are kept open between requests
+        retry: Retry policy for failed requests
+        hedge_percentile: Latency percentile after which a duplicate
+            request is sent, or None to never hedge
+        latencies: Recent successful request latencies
+        retries: Number of requests retried
+        hedges: Number of duplicate requests sent
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 120.0,
+        keep_alive: bool = True,
+        endpoints: EndpointPool | None = None,
+        retry: RetryPolicy | None = None,
+        hedge_percentile: float | None = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            host: Base URL of the Ollama server (default: $OLLAMA_HOSTS,
+                comma-separated, then $OLLAMA_HOST)
+            pool_size: Maximum number of pooled connections per server;
+                extra concurrent requests wait for a free connection
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for the model response
+            keep_alive: Keep connections open between requests
+            endpoints: Servers to balance requests across; overrides host
+            retry: Retry policy (default: 3 attempts with jittered
+                exponential backoff); ``RetryPolicy(attempts=1)`` disables
+                retries
+            hedge_percentile: When set (e.g. 95), a generate request still
+                unanswered after this percentile of recent latencies is
+                sent again, usually to another server, and the first
+                response wins. Hedging starts after HEDGE_MIN_SAMPLES
+                requests; streamed requests are never hedged.
+        """
+        self.endpoints = endpoints or EndpointPool.from_env(host)
+        self.host = self.endpoints.hosts[0]
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.retry = retry or RetryPolicy()
+        self.hedge_percentile = hedge_percentile
+        self.latencies = LatencyWindow()
+        self.retries = 0
+        self.hedges = 0
+        self._session = None
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Return the pooled requests.Session, creating it on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=len(self.endpoints.endpoints),
+                    pool_maxsize=self.pool_size,
+                    pool_block=True,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if not self.keep_alive:
+                    session.headers["Connection"] = "close"
+                self._session = session
+            return self._session
+
+    def generate(
+        self,
+        model_name: str,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        keep_alive: KeepAlive | None = None,
+        response_format: ResponseFormat | None = None,
+    ) -> str:
+        """Query Ollama with vision model.
+
+        Args:
+            model_name: Name of the Ollama model to use
+            image_data: Base64 encoded image, or several for a packed request
+            context: Additional context for the analysis
+            prompt: Prompt replacing the single-frame analysis prompt
+            keep_alive: How long the model stays loaded after the request
+            response_format: JSON schema (or "json") constraining the output
+
+        Returns:
+            Model response text
+        """
+        payload = build_ollama_payload(
+            model_name,
+            image_data,
+            context,
+            prompt,
+            keep_alive=keep_alive,
+            response_format=response_format,
+        )
+        message = self._with_retries(lambda: self._hedged(payload))
+        record_model_durations(message)
+        return message.get("response", "")
+
+    def stream(
+        self,
+        model_name: str,
+        image_data: str | list[str],
+        context: str,
+        prompt: str | None = None,
+        keep_alive: KeepAlive | None = None,
+        response_format: ResponseFormat | None = None,
+    ) -> Iterator[str]:
+        """Stream the model response as it is generated.
+
+        Closing the generator early closes the connection, which makes
+        Ollama stop generating.
+
+        Args:
+            model_name: Name of the Ollama model to use
+            image_data: Base64 encoded image, or several for a packed request
+            context: Additional context for the analysis
+            prompt: Prompt replacing the single-frame analysis prompt
+            keep_alive: How long the model stays loaded after the request
+            response_format: JSON schema (or "json") constraining the output
+
+        Yields:
+            Response text chunks
+        """
+        payload = build_ollama_payload(
+            model_name, image_data, context, prompt, True, keep_alive, response_format
+        )
+        attempt = 0
+        while True:
+            started = False
+            try:
+                for chunk in self._stream(payload):
+                    started = True
+                    yield chunk
+                return
+            except Exception as error:
+                # Text already yielded can't be taken back
+                delay = None if started else self.retry.delay_after(error, attempt)
+                if delay is None:
+                    raise
+                attempt += not isinstance(error, CircuitOpenError)
+            self._count_retry()
+            time.sleep(delay)
+
+    def _post(self, payload: dict) -> dict:
+        """Send one generate request to the next endpoint."""
+        start = time.perf_counter()
+        with self.endpoints.route(is_retryable) as host, span(REQUEST):
+            response = self.session.post(
+                f"{host}/api/generate",
+                json=payload,
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+            response.raise_for_status()
+            message = response.json()
+        self.latencies.add(time.perf_counter() - start)
+        return message
+
+    def _stream(self, payload: dict) -> Iterator[str]:
+        """Stream one generate request from the next endpoint."""
+        with (
+            self.endpoints.route(is_retryable) as host,
+            span(REQUEST),
+            self.session.post(
+                f"{host}/api/generate",
+                json=payload,
+                timeout=(self.connect_timeout, self.read_timeout),
+                stream=True,
+            ) as response,
+        ):
+            response.raise_for_status()
+            yield from iter_ndjson_responses(response.iter_lines())
+
+    def _with_retries(self, call: Callable[[], T]) -> T:
+        """Run ``call``, retrying retryable failures with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except Exception as error:
+                delay = self.retry.delay_after(error, attempt)
+                if delay is None:
+                    raise
+                attempt += not isinstance(error, CircuitOpenError)
+            self._count_retry()
+            time.sleep(delay)
+
+    def _hedged(self, payload: dict) -> dict:
+        """Post ``payload``, duplicating it if it is slower than usual.
+
+        A request still pending after the hedge delay is sent once more
+        and the first successful response is returned. The slower
+        request is left to finish in the background; requests can't
+        abort it mid-flight. If both fail the first error is raised.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._post(payload)
+        post = bind_context(self._post)
+        pool = self._get_hedge_pool()
+        first = pool.submit(post, payload)
+        if not wait([first], timeout=delay).not_done:
+            return first.result()
+        with self._lock:
+            self.hedges += 1
+        pending = {first, pool.submit(post, payload)}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None if hedging is off."""
+        if self.hedge_percentile is None:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    def _get_hedge_pool(self) -> ThreadPoolExecutor:
+        """Return the threads running hedged requests, creating them once."""
+        with self._lock:
+            if self._hedge_pool is None:
+                # Each in-flight request may have a duplicate
+                workers = 2 * self.pool_size * len(self.endpoints.hosts)
+                self._hedge_pool = ThreadPoolExecutor(workers, "ollama-hedge")
+            return self._hedge_pool
+
+    def _count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def list_models(self, host: str | None = None) -> list[str]:
+        """Return the names of the models installed on a server.
+
+        Args:
+            host: Server to ask (default: the first server)
+        """
+        response = self.session.get(
+            f"{host or self.host}/api/tags",
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+        return [model["name"] for model in response.json().get("models", [])]
+
+    def preload(
+        self,
+        model_name: str,
+        keep_alive: KeepAlive | None = None,
+        host: str | None = None,
+    ) -> dict:
+        """Load a model into memory without generating anything.
+
+        Args:
+            model_name: Name of the Ollama model to load
+            keep_alive: How long the model stays loaded afterwards
+            host: Server to load it on (default: the first server)
+
+        Returns:
+            Ollama's response, including ``load_duration`` in nanoseconds
+        """
+        payload = {"model": model_name}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        response = self.session.post(
+            f"{host or self.host}/api/generate",
+            json=payload,
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the hedging threads."""
+        with self._lock:
+            if self._hedge_pool is not None:
+                self._hedge_pool.shutdown(wait=False)
+                self._hedge_pool = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+def query_ollama(
+    model_name: str,
+    image_data: str,
+    context: str,
+    keep_alive: KeepAlive | None = None,
+    structured: bool = False,
+) -> str:
     """Query Ollama with vision model.
 
+    One-shot helper that opens a new connection per call. Long-lived
+    callers should hold an ``OllamaClient`` to reuse connections.
+
     Args:
         model_name: Name of the Ollama model to use
         image_data: Base64 encoded image
         context: Additional context for the analysis
+        keep_alive: How long the model stays loaded after the request
+        structured: Constrain the output to ANALYSIS_SCHEMA, the verdict
+            object derived from AnalysisResult
 
     Returns:
         Model response text
     """
-    import requests
-
-    ollama_host = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-    prompt = ANALYSIS_PROMPT_TEMPLATE.format(context=context)
-
-    response = requests.post(
-        f"{ollama_host}/api/generate",
-        json={
-            "model": model_name,
-            "prompt": prompt,
-            "system": SYSTEM_PROMPT,
-            "images": [image_data],
-            "stream": False,
-        },
-        timeout=120,
-    )
-    response.raise_for_status()
-    return response.json().get("response", "")
+    client = OllamaClient()
+    try:
+        return client.generate(
+            model_name,
+            image_data,
+            context,
+            keep_alive=keep_alive,
+            response_format=ANALYSIS_SCHEMA if structured else None,
+        )
+    finally:
+        client.close()
 
 
 def query_openai(model_name: str, image_data: str, context: str) -> str:
@@ -0,0 +1,548 @@
+"""Long-running analysis service for Video Fraud Detection Agent.
+
+Keeps one warm agent (imported OpenCV, pooled model connections, open
+verdict cache) and accepts analysis jobs over a local HTTP API. Jobs run
+from a bounded queue on a fixed number of worker threads; when the queue
+is full new submissions are rejected with 429 instead of buffering
+without limit.
+
+Endpoints:
+    POST /jobs               Submit ``{"video": path, "frames": n}``, or
+                             raw video bytes (``?frames=n``); returns 202
+    GET  /jobs/<id>          Job status and result (``?wait=s`` long-polls)
+    GET  /jobs/<id>/events   NDJSON stream of job updates until it finishes
+    GET  /metrics            Queue depth, in-flight jobs and stage timings
+                             in Prometheus text format
+    GET  /health             Liveness check
+"""
+
+import json
+import math
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from .agent import VideoFraudDetectionAgent
+from .metrics import METRICS
+from .models import result_to_dict
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+MAX_WAIT_SECONDS = 300.0
+_UPLOAD_CHUNK = 1024 * 1024
+
+
+@dataclass
+class Job:
+    """One video analysis request.
+
+    Attributes:
+        id: Job identifier
+        video: Path of the video to analyze
+        frames: Number of frames to sample
+        upload: Whether ``video`` is an uploaded temp file to delete after
+        status: One of queued, running, done, failed
+        result: Serialized AnalysisResult once done
+        error: Error message if the job failed
+        submitted: Epoch seconds when the job was accepted
+        started: Epoch seconds when a worker picked it up
+        finished: Epoch seconds when it completed
+        version: Incremented on every update, for change notification
+    """
+
+    id: str
+    video: Path
+    frames: int
+    upload: bool = False
+    status: str = QUEUED
+    result: dict | None = None
+    error: str | None = None
+    submitted: float = field(default_factory=time.time)
+    started: float | None = None
+    finished: float | None = None
+    version: int = 0
+
+    def to_dict(self) -> dict:
+        """Return the job as a JSON-serializable dict."""
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "video": None if self.upload else str(self.video),
+            "frames": self.frames,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class AnalysisService:
+    """Bounded job queue feeding worker threads that share one agent.
+
+    Attributes:
+        agent: Agent used for every job
+        workers: Number of videos analyzed at once
+        queue_size: Maximum number of jobs waiting to start
+        sample_frames: Frames sampled when a job doesn't say
+        max_jobs: Finished jobs kept for polling before the oldest is dropped
+    """
+
+    def __init__(
+        self,
+        agent: VideoFraudDetectionAgent,
+        workers: int = 2,
+        queue_size: int = 16,
+        sample_frames: int = 5,
+        max_jobs: int = 1000,
+    ):
+        """Create a stopped service; call ``start()`` to run workers.
+
+        Args:
+            agent: Agent used for every job
+            workers: Number of videos analyzed at once
+            queue_size: Maximum number of jobs waiting to start
+            sample_frames: Frames sampled when a job doesn't say
+            max_jobs: Finished jobs kept for polling
+
+        Raises:
+            ValueError: If a size is not positive
+        """
+        if workers < 1 or queue_size < 1 or max_jobs < 1:
+            raise ValueError("workers, queue_size and max_jobs must be at least 1")
+        self.agent = agent
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sample_frames = sample_frames
+        self.max_jobs = max_jobs
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=queue_size)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._changed = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def is_full(self) -> bool:
+        """Whether a submission would currently be rejected."""
+        return self._queue.full()
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"analysis-job-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Let running jobs finish, then stop the workers.
+
+        Jobs still queued are marked failed.
+        """
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._finish(job, error="Service stopped")
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def submit(
+        self, video: str | Path, frames: int | None = None, upload: bool = False
+    ) -> Job:
+        """Queue a video for analysis.
+
+        Args:
+            video: Path of the video to analyze
+            frames: Frames to sample (default: ``sample_frames``)
+            upload: Delete ``video`` once the job finishes
+
+        Returns:
+            The queued job
+
+        Raises:
+            FileNotFoundError: If the video does not exist
+            ValueError: If ``frames`` is not positive
+            queue.Full: If the queue is saturated
+        """
+        video = Path(video)
+        if not video.exists():
+            raise FileNotFoundError(f"Video not found: {video}")
+        frames = self.sample_frames if frames is None else frames
+        if frames < 1:
+            raise ValueError("frames must be at least 1")
+        job = Job(id=uuid.uuid4().hex, video=video, frames=frames, upload=upload)
+        with self._changed:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise
+            self._jobs[job.id] = job
+            self._evict()
+        return job
+
+    def reject(self) -> None:
+        """Count a submission turned away before reaching ``submit()``."""
+        with self._changed:
+            self.rejected += 1
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a job by id, or None if unknown or evicted."""
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def wait(self, job: Job, version: int, timeout: float) -> bool:
+        """Block until the job changes past ``version`` or time runs out.
+
+        Returns:
+            Whether the job changed
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version > version, timeout)
+
+    def stats(self) -> dict:
+        """Return queue and job counters."""
+        with self._changed:
+            return {
+                "queue_depth": self.queue_depth,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "workers": self.workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def to_prometheus(self, namespace: str = "video_fraud") -> str:
+        """Export queue gauges, job counters and stage timings."""
+        stats = self.stats()
+        lines = []
+        gauges = (
+            ("queue_depth", "Jobs waiting for a worker.", stats["queue_depth"]),
+            ("queue_capacity", "Maximum jobs waiting.", stats["queue_size"]),
+            ("jobs_in_flight", "Jobs being analyzed.", stats["in_flight"]),
+        )
+        for name, help_text, value in gauges:
+            lines += [
+                f"# HELP {namespace}_{name} {help_text}",
+                f"# TYPE {namespace}_{name} gauge",
+                f"{namespace}_{name} {value}",
+            ]
+        name = f"{namespace}_jobs_total"
+        lines += [
+            f"# HELP {name} Jobs by outcome.",
+            f"# TYPE {name} counter",
+        ]
+        for outcome in ("completed", "failed", "rejected"):
+            lines.append(f'{name}{{outcome="{outcome}"}} {stats[outcome]}')
+        endpoints = self.agent.ollama_client.endpoints.to_prometheus(namespace)
+        text = "\n".join(lines) + "\n" + endpoints
+        return text + METRICS.to_prometheus(namespace)
+
+    def _work(self) -> None:
+        while (job := self._queue.get()) is not None:
+            with self._changed:
+                job.status, job.started = RUNNING, time.time()
+                job.version += 1
+                self.in_flight += 1
+                self._changed.notify_all()
+            try:
+                result = self.agent.analyze_video(job.video, job.frames)
+            except Exception as e:
+                self._finish(job, error=str(e))
+            else:
+                self._finish(job, result=result_to_dict(result))
+
+    def _finish(
+        self, job: Job, result: dict | None = None, error: str | None = None
+    ) -> None:
+        if job.upload:
+            job.video.unlink(missing_ok=True)
+        with self._changed:
+            if job.status == RUNNING:
+                self.in_flight -= 1
+            job.status = FAILED if error is not None else DONE
+            job.result, job.error, job.finished = result, error, time.time()
+            job.version += 1
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._evict()
+            self._changed.notify_all()
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond ``max_jobs``."""
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in [j.id for j in self._jobs.values() if j.status in FINISHED]:
+            if excess <= 0:
+                break
+            del self._jobs[job_id]
+            excess -= 1
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "VideoFraudDetection"
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        if url.path == "/health":
+            endpoints = self.service.agent.ollama_client.endpoints.stats()
+            stats = {**self.service.stats(), "endpoints": endpoints}
+            self._send_json(200, {"status": "ok", **stats})
+        elif url.path == "/metrics":
+            body = self.service.to_prometheus().encode()
+            self._send(200, body, "text/plain; version=0.0.4")
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._get_job(parts[1], parse_qs(url.query))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            self._stream_job(parts[1])
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/jobs":
+            self._discard_body()
+            self._send_json(404, {"error": "Not found"})
+            return
+        if self.service.is_full():
+            # Turn uploads away before reading them
+            self.service.reject()
+            self._reject()
+            return
+        try:
+            query = parse_qs(url.query)
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                job = self._submit_path()
+            else:
+                frames = int(query["frames"][0]) if "frames" in query else None
+                job = self._submit_upload(frames)
+        except queue.Full:
+            # Filled up since the check; the body has been read already
+            self._reject(body_read=True)
+        except FileNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Invalid request: {e}"})
+        else:
+            self._send_json(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def _submit_path(self) -> Job:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        return self.service.submit(body["video"], body.get("frames"))
+
+    def _submit_upload(self, frames: int | None) -> Job:
+        length = int(self.headers.get("Content-Length", 0))
+        if not 0 < length <= self.server.max_upload_bytes:
+            self.close_connection = True
+            raise ValueError(
+                f"upload must be 1 to {self.server.max_upload_bytes} bytes"
+            )
+        fd, path = tempfile.mkstemp(prefix="video_fraud_upload_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                remaining = length
+                while remaining:
+                    chunk = self.rfile.read(min(_UPLOAD_CHUNK, remaining))
+                    if not chunk:
+                        raise ValueError("upload ended early")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            return self.service.submit(path, frames, upload=True)
+        except BaseException:
+            Path(path).unlink(missing_ok=True)
+            raise
+
+    def _get_job(self, job_id: str, query: dict) -> None:
+        value = query.get("wait", ["0"])[0]
+        try:
+            wait = float(value)
+        except ValueError:
+            wait = math.nan
+        if not wait >= 0:  # also rejects NaN
+            self._send_json(400, {"error": f"Invalid wait: {value!r}"})
+            return
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {job_id}"})
+            return
+        wait = min(wait, MAX_WAIT_SECONDS)
+        deadline = time.monotonic() + wait
+        while job.status not in FINISHED and time.monotonic() < deadline:
+            self.service.wait(job, job.version, deadline - time.monotonic())
+        self._send_json(200, job.to_dict())
+
+    def _stream_job(self, job_id: str) -> None:
+        job = self.service.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {job_id}"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        version = -1
+        while True:
+            if job.version > version:
+                version = job.version
+                self.wfile.write(json.dumps(job.to_dict()).encode() + b"\n")
+                self.wfile.flush()
+            if job.status in FINISHED:
+                return
+            self.service.wait(job, version, MAX_WAIT_SECONDS)
+
+    def _reject(self, body_read: bool = False) -> None:
+        if not body_read:
+            self._discard_body()
+        self._send_json(
+            429,
+            {"error": "Queue is full, retry later", **self.service.stats()},
+            {"Retry-After": "1"},
+        )
+
+    def _discard_body(self) -> None:
+        """Skip an unread request body, or drop the connection if large."""
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= _UPLOAD_CHUNK:
+            self.rfile.read(length)
+        else:
+            self.close_connection = True
+
+    def _send_json(
+        self, status: int, payload: dict, headers: dict | None = None
+    ) -> None:
+        self._send(status, json.dumps(payload).encode(), "application/json", headers)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: dict | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ServiceServer(ThreadingHTTPServer):
+    """HTTP front end of an AnalysisService.
+
+    Attributes:
+        service: Job queue the handlers submit to
+        max_upload_bytes: Largest accepted video upload
+        verbose: Log each request to stderr
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: AnalysisService,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_upload_bytes: int = MAX_UPLOAD_BYTES,
+        verbose: bool = False,
+    ):
+        """Bind the server; call ``serve_forever()`` to handle requests.
+
+        Args:
+            service: Job queue the handlers submit to
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            max_upload_bytes: Largest accepted video upload
+            verbose: Log each request to stderr
+        """
+        super().__init__((host, port), _ServiceHandler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        """Base URL the server is listening on."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(
+    agent: VideoFraudDetectionAgent,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 2,
+    queue_size: int = 16,
+    sample_frames: int = 5,
+) -> None:
+    """Run the analysis service until interrupted.
+
+    Args:
+        agent: Warm agent shared by every job
+        host: Interface to listen on
+        port: Port to listen on
+        workers: Number of videos analyzed at once
+        queue_size: Maximum number of jobs waiting to start
+        sample_frames: Frames sampled when a job doesn't say
+    """
+    service = AnalysisService(agent, workers, queue_size, sample_frames)
+    server = ServiceServer(service, host, port)
+    service.start()
+    print(
+        f"Serving on {server.url} ({workers} workers, queue {queue_size})",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
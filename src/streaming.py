@@ -0,0 +1,245 @@
+"""Streaming response handling for Video Fraud Detection Agent.
+
+This module turns Ollama's NDJSON token stream into response text and
+parses the JSON verdict object while it is still being generated, so
+callers see each top-level field as soon as it is complete and can
+cancel generation once the fields they need have arrived.
+"""
+
+import json
+from collections.abc import AsyncIterable, Callable, Collection, Iterable, Iterator
+
+from .metrics import record_model_durations
+
+# Fields needed to score a frame; the prompts ask for them first
+VERDICT_FIELDS = ("verdict", "confidence")
+
+# Scanner states at the top level of the object
+_KEY, _KEY_STRING, _COLON, _VALUE, _STRING, _SCALAR, _NESTED, _AFTER = range(8)
+_INVALID = object()
+
+
+class IncrementalJSONParser:
+    """Parse the top-level fields of a JSON object from text chunks.
+
+    Text before the first ``{`` (prose, code fences) is skipped. Each
+    top-level value is decoded as soon as its closing character arrives;
+    values that fail to decode are left out.
+
+    Attributes:
+        fields: Top-level fields decoded so far, in order of completion
+        done: Whether the closing brace of the object has been seen
+    """
+
+    def __init__(self, on_field: Callable[[str, object], None] | None = None):
+        """Create an empty parser.
+
+        Args:
+            on_field: Called with (name, value) as each field completes
+        """
+        self.fields: dict[str, object] = {}
+        self.done = False
+        self._on_field = on_field
+        self._chunks: list[str] = []
+        self._buffer = ""  # text of the current key or value
+        self._depth = 0
+        self._state = _KEY
+        self._in_string = False
+        self._escape = False
+        self._key = ""
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def has(self, names: Collection[str]) -> bool:
+        """Check whether every named field has been decoded."""
+        return all(name in self.fields for name in names)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of response text."""
+        self._chunks.append(chunk)
+        for char in chunk:
+            if self.done:
+                return
+            self._consume(char)
+
+    def _consume(self, char: str) -> None:
+        if self._depth == 0:
+            if char == "{":
+                self._depth = 1
+            return
+        if self._state in (_KEY_STRING, _STRING, _SCALAR, _NESTED):
+            self._buffer += char
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._state == _KEY_STRING:
+                    self._key = self._decode(self._buffer)
+                    self._state = _COLON
+                elif self._state == _STRING:
+                    self._complete()
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._state == _KEY:
+                self._buffer, self._state = char, _KEY_STRING
+            elif self._state == _VALUE:
+                self._buffer, self._state = char, _STRING
+            return
+
+        if self._state == _NESTED:
+            if char in "[{":
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1:
+                    self._complete()
+            return
+
+        if self._state == _SCALAR and (char in ",}" or char.isspace()):
+            self._buffer = self._buffer[:-1]
+            self._complete()
+        if self._state == _COLON and char == ":":
+            self._state = _VALUE
+        elif self._state == _VALUE and not char.isspace():
+            self._buffer = char
+            if char in "[{":
+                self._depth += 1
+                self._state = _NESTED
+            else:
+                self._state = _SCALAR
+        elif self._state == _AFTER and char == ",":
+            self._state = _KEY
+        elif char == "}":
+            self._depth = 0
+            self.done = True
+
+    def _complete(self) -> None:
+        """Decode the buffered value and record the field."""
+        value = self._decode(self._buffer)
+        if value is not _INVALID:
+            self.fields[self._key] = value
+            if self._on_field is not None:
+                self._on_field(self._key, value)
+        self._buffer = ""
+        self._state = _AFTER
+
+    @staticmethod
+    def _decode(text: str) -> object:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return _INVALID
+
+
+def parse_ndjson_line(line: bytes | str) -> tuple[str, bool]:
+    """Decode one line of an Ollama NDJSON stream.
+
+    Args:
+        line: Raw line of the streamed HTTP body
+
+    The final line's server-side durations are recorded (see metrics).
+
+    Returns:
+        Tuple of (response text chunk, whether the stream is done)
+
+    Raises:
+        RuntimeError: If the server reports an error mid-stream
+    """
+    if not line:
+        return "", False
+    message = json.loads(line)
+    if "error" in message:
+        raise RuntimeError(f"Ollama stream error: {message['error']}")
+    done = bool(message.get("done"))
+    if done:
+        record_model_durations(message)
+    return message.get("response", ""), done
+
+
+def iter_ndjson_responses(lines: Iterable[bytes | str]) -> Iterator[str]:
+    """Yield the response text chunks of an Ollama NDJSON stream.
+
+    Args:
+        lines: Raw lines of the streamed HTTP body
+
+    Yields:
+        Non-empty ``response`` chunks until the stream reports ``done``
+    """
+    for line in lines:
+        chunk, done = parse_ndjson_line(line)
+        if chunk:
+            yield chunk
+        if done:
+            return
+
+
+def _finish(parser: IncrementalJSONParser, cancelled: bool) -> str:
+    """Return full text, or the decoded fields if generation was cut short."""
+    if cancelled and not parser.done:
+        return json.dumps(parser.fields)
+    return parser.text
+
+
+def read_streamed_json(
+    chunks: Iterable[str],
+    stop_after: Collection[str] | None = None,
+    on_field: Callable[[str, object], None] | None = None,
+) -> str:
+    """Consume a token stream, optionally cancelling once fields arrive.
+
+    Stopping closes the stream, which drops the HTTP connection and makes
+    Ollama abort generation instead of producing the remaining text.
+
+    Args:
+        chunks: Response text chunks, e.g. from ``OllamaClient.stream``
+        stop_after: Field names after which generation is cancelled,
+            or None to read the whole response
+        on_field: Called with (name, value) as each top-level field completes
+
+    Returns:
+        The response text, or a JSON object of the fields parsed before
+        cancelling (so it parses like a complete response)
+    """
+    parser = IncrementalJSONParser(on_field)
+    stream = iter(chunks)
+    cancelled = False
+    try:
+        for chunk in stream:
+            parser.feed(chunk)
+            if stop_after and parser.has(stop_after):
+                cancelled = True
+                break
+    finally:
+        if hasattr(stream, "close"):
+            stream.close()
+    return _finish(parser, cancelled)
+
+
+async def aread_streamed_json(
+    chunks: AsyncIterable[str],
+    stop_after: Collection[str] | None = None,
+    on_field: Callable[[str, object], None] | None = None,
+) -> str:
+    """Async counterpart of ``read_streamed_json``."""
+    parser = IncrementalJSONParser(on_field)
+    stream = aiter(chunks)
+    cancelled = False
+    try:
+        async for chunk in stream:
+            parser.feed(chunk)
+            if stop_after and parser.has(stop_after):
+                cancelled = True
+                break
+    finally:
+        if hasattr(stream, "aclose"):
+            await stream.aclose()
+    return _finish(parser, cancelled)
@@ -0,0 +1,404 @@
+"""Temporal consistency analysis for Video Fraud Detection Agent.
+
+The model sees sampled frames one at a time and cannot judge how a
+video changes over time. This module decodes the whole video once, at
+reduced resolution, and measures each transition between consecutive
+analyzed frames:
+
+- ``frame_diff``: Mean absolute luminance change (0-1).
+- ``flow_mean``, ``flow_std``: Mean and spread of the dense optical flow
+  magnitude, in pixels of the flow resolution.
+- ``warp_error``: Luminance change left after warping the previous frame
+  along the flow (0-1). Real motion is explained by the flow; morphing,
+  popping details and lighting flicker are not.
+- ``face_luma_flicker``: Brightness change of the tracked face beyond
+  the change of the whole frame (0-1).
+- ``face_texture_flicker``: Log ratio of the face's Laplacian variance
+  between the frames, i.e. detail appearing and vanishing on the face.
+
+Each transition is scored against a sliding window of the preceding
+ones: the robust z-score (median and MAD) of every signal, and the
+highest of them as the transition's anomaly score. Transitions scoring
+above a threshold are merged into suspicious segments. Only the window
+and the previous frame are kept, so memory does not grow with the
+video, and shot cuts reset the window instead of being reported.
+"""
+
+import math
+from collections import deque
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .metrics import TEMPORAL, span
+from .models import AnalysisResult, SuspiciousSegment, TemporalReport
+from .sampling import HIST_BINS, SHOT_THRESHOLD
+
+# Width in pixels frames are downscaled to for face tracking
+ANALYSIS_WIDTH = 320
+
+# Width in pixels of the frames optical flow is computed on
+FLOW_WIDTH = 160
+
+# Frames per second analyzed; faster videos are subsampled
+MAX_ANALYSIS_FPS = 15.0
+
+# Preceding transitions each one is compared with
+WINDOW = 64
+
+# Transitions needed in the window before any is scored
+MIN_HISTORY = 8
+
+# Anomaly score above which a transition is suspicious
+Z_THRESHOLD = 4.0
+
+# Suspicious transitions closer than this many seconds share a segment
+MERGE_GAP = 0.5
+
+# Analyzed frames between face detections; the last face is kept between
+FACE_DETECT_INTERVAL = 5
+
+# Strongest segments listed among a video result's indicators
+LISTED_SEGMENTS = 5
+
+SIGNALS = (
+    "frame_diff",
+    "flow_mean",
+    "flow_std",
+    "warp_error",
+    "face_luma_flicker",
+    "face_texture_flicker",
+)
+
+# Smallest spread of each signal, absolute and relative to its median,
+# so near-static content does not turn tiny changes into huge z-scores
+SIGNAL_FLOORS = np.array([0.001, 0.02, 0.02, 0.001, 0.002, 0.02])
+RELATIVE_FLOOR = 0.1
+
+_MAD_TO_STD = 1.4826
+_FACE_CASCADE = "haarcascade_frontalface_default.xml"
+
+
+class TemporalAnalyzer:
+    """Streaming anomaly scoring of consecutive video frames.
+
+    Attributes:
+        window: Preceding transitions each one is compared with
+        threshold: Anomaly score above which a transition is suspicious
+        frames: Frames added so far
+        scored: Transitions scored against a full enough window
+        suspicious: Transitions scoring above the threshold
+        face_frames: Frames in which a face was tracked
+        peak_score: Highest anomaly score so far
+        segments: Suspicious segments found so far
+    """
+
+    def __init__(
+        self,
+        window: int = WINDOW,
+        threshold: float = Z_THRESHOLD,
+        detect_faces: bool = True,
+    ):
+        """Create an analyzer with an empty window.
+
+        Args:
+            window: Transitions kept as the baseline of each score
+            threshold: Anomaly score above which a transition is suspicious
+            detect_faces: Track the largest face for the flicker signals.
+                Needs OpenCV's Haar cascades (opencv-python 4.x); without
+                them no face signals are measured.
+
+        Raises:
+            ValueError: If window is smaller than MIN_HISTORY or the
+                threshold is not positive
+        """
+        if window < MIN_HISTORY:
+            raise ValueError(f"window must be >= {MIN_HISTORY}, got {window}")
+        if threshold <= 0:
+            raise ValueError(f"threshold must be > 0, got {threshold}")
+        self.window = window
+        self.threshold = threshold
+        self.frames = 0
+        self.scored = 0
+        self.suspicious = 0
+        self.face_frames = 0
+        self.peak_score = 0.0
+        self.segments: list[SuspiciousSegment] = []
+        self._history: deque[np.ndarray] = deque(maxlen=window)
+        self._detector = _face_detector() if detect_faces else None
+        self._face: tuple[int, int, int, int] | None = None
+        self._previous: dict | None = None
+        self._sums = np.zeros(len(SIGNALS))
+        self._counts = np.zeros(len(SIGNALS))
+
+    def add(self, frame: np.ndarray, timestamp: float) -> float | None:
+        """Score the transition from the previous frame to this one.
+
+        Args:
+            frame: Decoded BGR or grayscale frame, at any resolution
+            timestamp: Position of the frame in the video, in seconds
+
+        Returns:
+            The transition's anomaly score, or None for the first frame,
+            a shot cut or while the window is filling up
+        """
+        current = self._prepare(frame, timestamp)
+        previous, self._previous = self._previous, current
+        self.frames += 1
+        if previous is None:
+            return None
+        cut = 0.5 * np.abs(current["hist"] - previous["hist"]).sum()
+        if cut > SHOT_THRESHOLD:
+            self._history.clear()
+            return None
+
+        signals = self._signals(previous, current)
+        known = ~np.isnan(signals)
+        self._sums[known] += signals[known]
+        self._counts[known] += 1
+        scored = self._score(signals)
+        self._history.append(signals)
+        if scored is None:
+            return None
+        self._record(*scored, previous["time"], timestamp)
+        return scored[0]
+
+    def report(self, duration: float) -> TemporalReport:
+        """Summarize the frames added so far.
+
+        Args:
+            duration: Length of the video in seconds
+        """
+        means = self._sums / np.maximum(self._counts, 1)
+        return TemporalReport(
+            anomaly_score=self.suspicious / self.scored if self.scored else 0.0,
+            peak_score=round(self.peak_score, 2),
+            duration=duration,
+            frames_analyzed=self.frames,
+            face_frames=self.face_frames,
+            segments=[
+                SuspiciousSegment(
+                    round(s.start, 3), round(s.end, 3), round(s.score, 2), s.signal
+                )
+                for s in self.segments
+            ],
+            signals={
+                name: round(float(mean), 4)
+                for name, mean, count in zip(SIGNALS, means, self._counts)
+                if count
+            },
+        )
+
+    def _prepare(self, frame: np.ndarray, timestamp: float) -> dict:
+        """Downscale a frame and measure what its transitions need."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape
+        scale = min(1.0, ANALYSIS_WIDTH / width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        flow_scale = FLOW_WIDTH / ANALYSIS_WIDTH
+        small = cv2.resize(
+            gray,
+            (max(8, round(size[0] * flow_scale)), max(8, round(size[1] * flow_scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        hist = np.bincount((small >> 3).ravel(), minlength=HIST_BINS) / small.size
+        state = {
+            "time": timestamp,
+            "small": small,
+            "hist": hist,
+            "luma": float(gray.mean()),
+            "face": None,
+        }
+        face = self._track_face(gray)
+        if face is not None:
+            x, y, w, h = face
+            region = gray[y : y + h, x : x + w]
+            texture = cv2.Laplacian(region, cv2.CV_32F).var()
+            state["face"] = (float(region.mean()), float(texture))
+            self.face_frames += 1
+        return state
+
+    def _track_face(self, gray: np.ndarray) -> tuple[int, int, int, int] | None:
+        """Detect the largest face every few frames, keeping it in between."""
+        if self._detector is None:
+            return None
+        if self.frames % FACE_DETECT_INTERVAL == 0:
+            faces = self._detector.detectMultiScale(
+                gray, scaleFactor=1.2, minNeighbors=4, minSize=(24, 24)
+            )
+            self._face = (
+                tuple(int(v) for v in max(faces, key=lambda f: f[2] * f[3]))
+                if len(faces)
+                else None
+            )
+        return self._face
+
+    @staticmethod
+    def _signals(previous: dict, current: dict) -> np.ndarray:
+        """Measure one transition; face signals are NaN without a face."""
+        before, after = previous["small"], current["small"]
+        diff = cv2.absdiff(after, before).mean() / 255.0
+        # Flow from the current frame back to the previous one, so the
+        # previous frame can be warped onto the current frame's grid
+        flow = cv2.calcOpticalFlowFarneback(
+            after, before, None, 0.5, 2, 9, 2, 5, 1.1, 0
+        )
+        magnitude = cv2.magnitude(flow[..., 0], flow[..., 1])
+        rows, cols = np.indices(after.shape, dtype=np.float32)
+        warped = cv2.remap(
+            before,
+            cols + flow[..., 0],
+            rows + flow[..., 1],
+            cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+        warp_error = cv2.absdiff(after, warped).mean() / 255.0
+        luma_flicker = texture_flicker = math.nan
+        if previous["face"] is not None and current["face"] is not None:
+            (face_before, texture_before), (face_after, texture_after) = (
+                previous["face"],
+                current["face"],
+            )
+            luma_change = current["luma"] - previous["luma"]
+            luma_flicker = abs(face_after - face_before - luma_change) / 255.0
+            texture_flicker = abs(
+                math.log((texture_after + 1.0) / (texture_before + 1.0))
+            )
+        return np.array(
+            [
+                diff,
+                magnitude.mean(),
+                magnitude.std(),
+                warp_error,
+                luma_flicker,
+                texture_flicker,
+            ]
+        )
+
+    def _score(self, signals: np.ndarray) -> tuple[float, str] | None:
+        """Highest robust z-score of a transition against the window.
+
+        Returns:
+            (score, name of the signal it came from), or None while the
+            window holds too few transitions
+        """
+        if len(self._history) < MIN_HISTORY:
+            return None
+        history = np.array(self._history)
+        best = None
+        for i, value in enumerate(signals):
+            column = history[:, i]
+            column = column[~np.isnan(column)]
+            if math.isnan(value) or len(column) < MIN_HISTORY:
+                continue
+            median = np.median(column)
+            spread = _MAD_TO_STD * np.median(np.abs(column - median))
+            floor = max(SIGNAL_FLOORS[i], RELATIVE_FLOOR * abs(median))
+            z = (value - median) / max(spread, floor)
+            if best is None or z > best[0]:
+                best = (float(z), SIGNALS[i])
+        return best
+
+    def _record(self, score: float, signal: str, start: float, end: float) -> None:
+        """Count a scored transition, extending or opening a segment."""
+        self.scored += 1
+        self.peak_score = max(self.peak_score, score)
+        if score <= self.threshold:
+            return
+        self.suspicious += 1
+        last = self.segments[-1] if self.segments else None
+        if last is not None and start - last.end <= MERGE_GAP:
+            last.end = end
+            if score > last.score:
+                last.score = score
+                last.signal = signal
+        else:
+            segment = SuspiciousSegment(start, end, score, signal)
+            self.segments.append(segment)
+
+
+def _face_detector():
+    """Load OpenCV's frontal face Haar cascade, or None if unavailable."""
+    classifier = getattr(cv2, "CascadeClassifier", None)
+    data = getattr(cv2, "data", None)
+    if classifier is None or data is None:
+        return None
+    detector = classifier(data.haarcascades + _FACE_CASCADE)
+    return None if detector.empty() else detector
+
+
+def analyze_temporal(
+    video_path: Path,
+    max_fps: float = MAX_ANALYSIS_FPS,
+    window: int = WINDOW,
+    threshold: float = Z_THRESHOLD,
+    detect_faces: bool = True,
+) -> TemporalReport:
+    """Decode a video once and report its temporal anomalies.
+
+    Frames beyond ``max_fps`` are grabbed without being converted or
+    analyzed.
+
+    Args:
+        video_path: Path to video file
+        max_fps: Frames per second analyzed
+        window: Preceding transitions each one is compared with
+        threshold: Anomaly score above which a transition is suspicious
+        detect_faces: Track the largest face for the flicker signals
+
+    Returns:
+        TemporalReport with the anomaly score and suspicious segments
+
+    Raises:
+        ValueError: If video cannot be opened
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+    analyzer = TemporalAnalyzer(window, threshold, detect_faces)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    stride = max(1, round(fps / max_fps))
+    index = 0
+    try:
+        with span(TEMPORAL):
+            while True:
+                if index % stride:
+                    if not cap.grab():
+                        break
+                else:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    analyzer.add(frame, index / fps)
+                index += 1
+    finally:
+        cap.release()
+    return analyzer.report(duration=index / fps)
+
+
+def attach_report(result: AnalysisResult, report: TemporalReport) -> None:
+    """Add a temporal report to a video's aggregated result.
+
+    The report is kept as ``result.temporal``; its anomaly score is
+    summarized in the reasoning and its strongest segments are listed
+    as indicators. The verdict is left to the model.
+
+    Args:
+        result: Aggregated video result, modified in place
+        report: Temporal report of the same video
+    """
+    result.temporal = report
+    result.reasoning += (
+        f" Temporal analysis: {report.anomaly_score:.1%} of frame transitions "
+        f"anomalous, {len(report.segments)} suspicious segments."
+    )
+    strongest = sorted(report.segments, key=lambda s: -s.score)[:LISTED_SEGMENTS]
+    result.indicators = [
+        *result.indicators,
+        *(
+            f"Temporal anomaly at {s.start:.2f}-{s.end:.2f}s ({s.signal})"
+            for s in sorted(strongest, key=lambda s: s.start)
+        ),
+    ]
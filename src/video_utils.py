@@ -4,15 +4,51 @@ This module contains utilities for extracting frames from videos
 and managing temporary files.
 """
 
+import base64
 import os
 import shutil
 import tempfile
 from pathlib import Path
 
 import cv2
+import numpy as np
 
+from .dedup import dhash
+from .features import analysis_crop, frame_features
+from .frame_prep import FramePrep
+from .frame_reader import AUTO, read_frames
+from .metrics import BASE64, DECODE, ENCODE, FEATURES, span, timed_iter
+from .models import Frame
+from .sampling import UNIFORM
 
-def extract_frames(video_path: Path, num_frames: int) -> tuple[list[Path], str]:
+
+def encode_frame(image: np.ndarray, ext: str = ".jpg") -> str:
+    """Encode a decoded frame to base64 without touching the filesystem.
+
+    Args:
+        image: Decoded BGR frame (numpy array)
+        ext: Image format extension understood by cv2.imencode
+
+    Returns:
+        Base64 encoded image
+
+    Raises:
+        ValueError: If the frame cannot be encoded
+    """
+    with span(ENCODE):
+        ok, buffer = cv2.imencode(ext, image)
+    if not ok:
+        raise ValueError(f"Could not encode frame as {ext}")
+    with span(BASE64):
+        return base64.b64encode(buffer).decode("utf-8")
+
+
+def extract_frames(
+    video_path: Path,
+    num_frames: int,
+    strategy: str = AUTO,
+    sampling: str = UNIFORM,
+) -> tuple[list[Path], str]:
     """Extract sample frames from a video.
 
     Extracts evenly distributed frames from the video for analysis.
@@ -20,6 +56,8 @@ def extract_frames(video_path: Path, num_frames: int) -> tuple[list[Path], str]:
     Args:
         video_path: Path to video file
         num_frames: Number of frames to extract
+        strategy: Frame decoding strategy (see frame_reader)
+        sampling: Frame selection mode (see sampling)
 
     Returns:
         Tuple of (list of paths to extracted frame images, temp directory path)
@@ -27,36 +65,21 @@ def extract_frames(video_path: Path, num_frames: int) -> tuple[list[Path], str]:
     Raises:
         ValueError: If video cannot be opened or has no frames
     """
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
-        raise ValueError(f"Could not open video: {video_path}")
-
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    if total_frames == 0:
-        cap.release()
-        raise ValueError(f"Video has no frames: {video_path}")
-
-    # Calculate frame indices to extract (evenly distributed)
-    if num_frames >= total_frames:
-        frame_indices = list(range(total_frames))
-    else:
-        step = total_frames / num_frames
-        frame_indices = [int(i * step) for i in range(num_frames)]
-
     # Create temp directory for frames
     temp_dir = tempfile.mkdtemp(prefix="video_fraud_")
     extracted_paths = []
 
-    for idx, frame_idx in enumerate(frame_indices):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-
-        if ret:
+    try:
+        frames = read_frames(video_path, num_frames, strategy, sampling)
+        for idx, (_, frame) in enumerate(timed_iter(frames, DECODE)):
             frame_path = Path(temp_dir) / f"frame_{idx:04d}.jpg"
-            cv2.imwrite(str(frame_path), frame)
+            with span(ENCODE):
+                cv2.imwrite(str(frame_path), frame)
             extracted_paths.append(frame_path)
-
-    cap.release()
+    except BaseException:
+        # Decoder, OS errors and interrupts must not leak the directory
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
 
     if not extracted_paths:
         cleanup_temp_files(temp_dir)
@@ -65,6 +88,67 @@ def extract_frames(video_path: Path, num_frames: int) -> tuple[list[Path], str]:
     return extracted_paths, temp_dir
 
 
+def extract_frames_in_memory(
+    video_path: Path,
+    num_frames: int,
+    strategy: str = AUTO,
+    sampling: str = UNIFORM,
+    prep: FramePrep | None = None,
+    features: bool = False,
+) -> list[Frame]:
+    """Extract sample frames from a video as in-memory encoded images.
+
+    Each frame is encoded with cv2.imencode and base64-encoded exactly
+    once; nothing is written to disk. A perceptual hash of the decoded
+    frame is recorded for deduplication.
+
+    With ``features``, an analysis crop of every decoded frame is kept
+    and all crops are scored as one batch once decoding is done.
+
+    Args:
+        video_path: Path to video file
+        num_frames: Number of frames to extract
+        strategy: Frame decoding strategy (see frame_reader)
+        sampling: Frame selection mode (see sampling)
+        prep: Downscaling and encoding applied before upload, or None
+            for full-resolution JPEG with OpenCV defaults
+        features: Score spectral and compression artifacts of each frame
+
+    Returns:
+        List of encoded frames in video order
+
+    Raises:
+        ValueError: If video cannot be opened or has no frames
+    """
+    frames = timed_iter(read_frames(video_path, num_frames, strategy, sampling), DECODE)
+    encode = prep.encode if prep else encode_frame
+    ext = prep.extension if prep else ".jpg"
+    crops = []
+    extracted = []
+    for idx, (frame_idx, frame) in enumerate(frames):
+        if features:
+            crops.append(analysis_crop(frame))
+        extracted.append(
+            Frame(
+                index=frame_idx,
+                name=f"frame_{idx:04d}{ext}",
+                data=encode(frame),
+                phash=dhash(frame),
+            )
+        )
+
+    if not extracted:
+        raise ValueError(f"Could not extract any frames from: {video_path}")
+
+    if features:
+        with span(FEATURES):
+            scores = frame_features(np.stack(crops))
+        for frame, frame_scores in zip(extracted, scores):
+            frame.features = frame_scores
+
+    return extracted
+
+
 def cleanup_temp_files(temp_dir: str | None) -> None:
     """Clean up temporary frame files.
 
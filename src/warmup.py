@@ -0,0 +1,87 @@
+"""Model warm-up for Ollama.
+
+The first request after Ollama starts, or after a model has been idle
+longer than its keep_alive, pays for loading the weights into memory,
+which can take far longer than the analysis itself. Warming up checks
+the model is installed, loads it with an empty preload request and
+measures how much of that first-request latency was loading.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+
+from .providers import KeepAlive, OllamaClient, model_matches
+
+NS_PER_SECOND = 1e9
+
+
+@dataclass
+class WarmupReport:
+    """Latency of loading a model versus using it once loaded.
+
+    Attributes:
+        model: Name of the warmed-up model
+        host: Base URL of the server it was loaded on
+        cold_s: Seconds taken by the first preload request
+        warm_s: Seconds taken by the same request once the model is loaded
+        load_s: Seconds Ollama reported spending loading the model
+    """
+
+    model: str
+    host: str
+    cold_s: float
+    warm_s: float
+    load_s: float
+
+    def to_dict(self) -> dict:
+        """Convert the report to a JSON-serializable dict."""
+        return asdict(self)
+
+    def summary(self) -> str:
+        """Describe the report in one line."""
+        return (
+            f"Warmed up {self.model} on {self.host}: cold {self.cold_s:.2f}s "
+            f"(load {self.load_s:.2f}s), warm {self.warm_s:.2f}s"
+        )
+
+
+def warm_up(
+    client: OllamaClient,
+    model_name: str,
+    keep_alive: KeepAlive | None = None,
+    host: str | None = None,
+) -> WarmupReport:
+    """Verify a model is installed, load it and time cold versus warm.
+
+    Args:
+        client: Client of the Ollama server to warm up
+        model_name: Name of the model to load
+        keep_alive: How long the model stays loaded afterwards
+        host: Server of the client to warm up (default: the first)
+
+    Returns:
+        WarmupReport with the cold and warm preload latency
+
+    Raises:
+        ValueError: If the model is not installed on the server
+    """
+    host = host or client.host
+    installed = client.list_models(host)
+    if not any(model_matches(name, model_name) for name in installed):
+        raise ValueError(
+            f"Model {model_name!r} is not installed on {host}; "
+            f"run 'ollama pull {model_name}' (installed: {', '.join(installed)})"
+        )
+    cold_s, message = _timed_preload(client, model_name, keep_alive, host)
+    warm_s, _ = _timed_preload(client, model_name, keep_alive, host)
+    load_s = message.get("load_duration", 0) / NS_PER_SECOND
+    return WarmupReport(model_name, host, cold_s, warm_s, load_s)
+
+
+def _timed_preload(
+    client: OllamaClient, model_name: str, keep_alive: KeepAlive | None, host: str
+) -> tuple[float, dict]:
+    """Send one preload request and return its latency and response."""
+    start = time.perf_counter()
+    message = client.preload(model_name, keep_alive, host)
+    return time.perf_counter() - start, message
@@ -1,10 +1,53 @@
 """Shared pytest fixtures for Project 9 tests."""
 
+import json
+
+import cv2
+import numpy as np
 import pytest
 
+from src.models import AnalysisResult, Verdict
+
+
+@pytest.fixture
+def llm_response():
+    """Provide a factory for JSON LLM responses."""
+
+    def make(verdict: str = "AI_GENERATED", confidence: int = 90) -> str:
+        return json.dumps(
+            {
+                "verdict": verdict,
+                "confidence": confidence,
+                "reasoning": f"{verdict} reasoning",
+                "indicators": [f"{verdict.lower()} indicator"],
+                "recommendations": [],
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_result():
+    """Provide a factory for parsed frame results."""
+
+    def make(
+        verdict: Verdict = Verdict.AI_GENERATED,
+        confidence: float = 0.9,
+        indicators: list[str] | tuple[str, ...] = ("i1",),
+    ) -> AnalysisResult:
+        return AnalysisResult(verdict, confidence, "reason", list(indicators), [])
+
+    return make
+
 
-# Add shared fixtures below
-# @pytest.fixture
-# def sample_data():
-#     """Provide sample test data."""
-#     return {}
+@pytest.fixture
+def sample_video(tmp_path):
+    """Write a small synthetic video and return its path."""
+    path = tmp_path / "sample.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(30):
+        frame = np.full((48, 64, 3), (i * 8) % 256, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
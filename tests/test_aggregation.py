@@ -0,0 +1,133 @@
+"""Unit tests for incremental verdict aggregation."""
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.aggregation import TopKCounter, VerdictAccumulator, VotingPolicy
+from src.models import Verdict
+from src.parsing import aggregate_results
+from src.providers import OllamaClient
+
+AI = Verdict.AI_GENERATED
+REAL = Verdict.AUTHENTIC
+
+
+class TestTopKCounter:
+    """Tests for the bounded frequency counter."""
+
+    def test_order_by_count_then_first_seen(self):
+        """Test that ties keep their first-seen order."""
+        counter = TopKCounter(k=None)
+        for item in ["b", "a", "c", "a"]:
+            counter.add(item)
+
+        assert counter.most_common() == [("a", 2), ("b", 1), ("c", 1)]
+
+    def test_bounded(self):
+        """Test that at most k strings are kept and heavy hitters survive."""
+        counter = TopKCounter(k=3)
+        for i in range(1000):
+            counter.add("frequent")
+            counter.add(f"rare{i}")
+
+        assert len(counter) == 3
+        assert counter.most_common()[0] == ("frequent", 1000)
+
+
+class TestVerdictAccumulator:
+    """Tests for VerdictAccumulator voting and snapshots."""
+
+    def test_matches_batch_aggregation(self, make_result):
+        """Test that plain voting equals aggregating the whole list."""
+        results = [make_result(AI, 0.9), make_result(AI, 0.8), make_result(REAL, 0.7)]
+        accumulator = VerdictAccumulator()
+        for result, weight in zip(results, [1, 2, 1]):
+            accumulator.add(result, weight)
+
+        assert accumulator.snapshot() == aggregate_results(results, [1, 2, 1])
+        assert accumulator.frames == 4
+        assert accumulator.counts[AI] == 3
+
+    def test_snapshot_at_any_point(self, make_result):
+        """Test that snapshots follow the frames added so far."""
+        accumulator = VerdictAccumulator()
+        assert accumulator.snapshot().reasoning == "No frames analyzed"
+
+        accumulator.add(make_result(REAL, 0.6))
+        assert accumulator.snapshot().verdict == REAL
+        accumulator.add(make_result(AI, 0.9), weight=2)
+        assert accumulator.snapshot().verdict == AI
+
+    def test_confidence_weighted(self, make_result):
+        """Test that one confident frame outweighs two unsure ones."""
+        unsure = make_result(REAL, 0.3)
+        results = [make_result(AI, 0.95), unsure, unsure]
+
+        plain = aggregate_results(results)
+        weighted = aggregate_results(results, policy=VotingPolicy(True))
+
+        assert plain.verdict == REAL
+        assert weighted.verdict == AI
+        assert "weighted by confidence" in weighted.reasoning
+
+    def test_recency_weighted(self, make_result):
+        """Test that recent frames outweigh older ones."""
+        results = [make_result(REAL, 0.8)] * 3 + [make_result(AI, 0.8)] * 2
+        policy = VotingPolicy(half_life=1)
+
+        assert aggregate_results(results).verdict == REAL
+        assert aggregate_results(results, policy=policy).verdict == AI
+
+    def test_recency_independent_of_arrival_order(self, make_result):
+        """Test that positions, not arrival order, decide recency."""
+        policy = VotingPolicy(half_life=2)
+        results = [make_result(REAL, 0.9), make_result(REAL, 0.5), make_result(AI, 0.7)]
+        in_order = VerdictAccumulator(policy)
+        shuffled = VerdictAccumulator(policy)
+        for position in (0, 1, 2):
+            in_order.add(results[position], position=position)
+        for position in (2, 0, 1):
+            shuffled.add(results[position], position=position)
+
+        assert shuffled.snapshot().confidence == pytest.approx(
+            in_order.snapshot().confidence
+        )
+        assert shuffled.snapshot().verdict == in_order.snapshot().verdict
+
+    def test_indicators_by_frequency(self, make_result):
+        """Test that indicators are deduplicated, most frequent first."""
+        accumulator = VerdictAccumulator()
+        accumulator.add(make_result(AI, 0.9, ["blur", "flicker"]))
+        accumulator.add(make_result(AI, 0.9, ["flicker", "teeth"]), weight=2)
+
+        assert accumulator.snapshot().indicators == ["flicker", "teeth", "blur"]
+
+    def test_invalid_policy(self):
+        """Test that bad voting settings are rejected."""
+        with pytest.raises(ValueError):
+            VotingPolicy(half_life=0)
+        with pytest.raises(ValueError):
+            VotingPolicy(top_k=0)
+
+
+class TestAgentVoting:
+    """Tests for the agent's voting policy."""
+
+    def test_confidence_weighted_video(self, sample_video):
+        """Test that the agent aggregates with its voting policy."""
+        responses = [
+            {"verdict": "AI_GENERATED", "confidence": 95},
+            {"verdict": "AUTHENTIC", "confidence": 30},
+            {"verdict": "AUTHENTIC", "confidence": 30},
+        ]
+        with FakeOllamaServer(responses=responses) as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                voting=VotingPolicy(confidence_weighted=True),
+                verbose=False,
+            )
+            result = agent.analyze_video(sample_video, sample_frames=3)
+            agent.close()
+
+        assert result.verdict == AI
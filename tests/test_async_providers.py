@@ -0,0 +1,161 @@
+"""Unit tests for the asyncio provider layer and agent API."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.async_providers import AsyncOllamaClient
+from src.concurrency import analyze_concurrently_async
+from src.models import AnalysisResult, Verdict
+from src.providers import OllamaClient
+
+httpx = pytest.importorskip("httpx")
+
+
+def _mock_client(handler) -> AsyncOllamaClient:
+    client = AsyncOllamaClient(host="http://ollama.test")
+    client._client = httpx.AsyncClient(
+        base_url=client.host, transport=httpx.MockTransport(handler)
+    )
+    client._loop = asyncio.get_running_loop()
+    return client
+
+
+class TestAsyncOllamaClient:
+    """Tests for AsyncOllamaClient."""
+
+    def test_generate_posts_payload(self):
+        """Test that generate sends the Ollama request body."""
+        seen = {}
+
+        def handler(request):
+            seen.update(json.loads(request.content))
+            return httpx.Response(200, json={"response": "ok"})
+
+        async def run():
+            client = _mock_client(handler)
+            try:
+                return await client.generate("llava", "aW1n", "frame_0000.jpg")
+            finally:
+                await client.aclose()
+
+        assert asyncio.run(run()) == "ok"
+        assert seen["model"] == "llava"
+        assert seen["images"] == ["aW1n"]
+        assert seen["stream"] is False
+        assert "frame_0000.jpg" in seen["prompt"]
+
+    def test_generate_raises_on_http_error(self):
+        """Test that HTTP errors are raised."""
+
+        async def run():
+            client = _mock_client(lambda request: httpx.Response(500))
+            try:
+                await client.generate("llava", "aW1n", "ctx")
+            finally:
+                await client.aclose()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_client_per_event_loop(self):
+        """Test that each event loop gets its own HTTP client."""
+        client = AsyncOllamaClient(host="http://ollama.test")
+
+        async def get():
+            return client._get_client()
+
+        first, second = asyncio.run(get()), asyncio.run(get())
+
+        assert first is not second
+        assert client._loop is not None
+
+    def test_host_from_environment(self, monkeypatch):
+        """Test that the host defaults to OLLAMA_HOST."""
+        monkeypatch.setenv("OLLAMA_HOST", "http://gpu-box:11434")
+
+        assert AsyncOllamaClient().host == "http://gpu-box:11434"
+
+
+class TestAnalyzeConcurrentlyAsync:
+    """Tests for analyze_concurrently_async helper."""
+
+    def test_bounded_and_ordered(self):
+        """Test semaphore bound, ordering and failure handling."""
+        active = 0
+        peak = 0
+
+        async def analyze(i):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01 * (5 - i))
+            active -= 1
+            if i == 2:
+                raise ConnectionError("refused")
+            return AnalysisResult(Verdict.AUTHENTIC, 0.8, str(i), [], [])
+
+        results = asyncio.run(analyze_concurrently_async(analyze, range(5), 2))
+
+        assert peak == 2
+        assert [r.reasoning for r in results[:2]] == ["0", "1"]
+        assert results[2].verdict == Verdict.UNCERTAIN
+
+
+class TestAgentAsync:
+    """Tests for the agent's async API."""
+
+    def test_analyze_frame_async_missing_file(self):
+        """Test that a missing frame raises FileNotFoundError."""
+        agent = VideoFraudDetectionAgent()
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(agent.analyze_frame_async("/nonexistent/frame.jpg"))
+
+    def test_analyze_video_async(self, sample_video, llm_response):
+        """Test async video analysis through the shared client."""
+        agent = VideoFraudDetectionAgent(max_concurrency=3)
+        agent._async_ollama.generate = AsyncMock(return_value=llm_response())
+
+        result = asyncio.run(agent.analyze_video_async(sample_video, 4))
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert "Analyzed 4 frames" in result.reasoning
+        assert agent._async_ollama.generate.await_count == 4
+
+    def test_many_videos_in_flight(self, sample_video, llm_response):
+        """Test that several videos can share one agent concurrently."""
+        agent = VideoFraudDetectionAgent(max_concurrency=2)
+        agent._async_ollama.generate = AsyncMock(return_value=llm_response())
+
+        async def run():
+            return await asyncio.gather(
+                *(agent.analyze_video_async(sample_video, 3) for _ in range(5))
+            )
+
+        results = asyncio.run(run())
+
+        assert len(results) == 5
+        assert agent._async_ollama.generate.await_count == 15
+
+    def test_repeated_asyncio_run(self, sample_video):
+        """Test that one agent serves several asyncio.run() calls."""
+        with FakeOllamaServer(latency=0.0) as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                max_concurrency=4,
+                verbose=False,
+            )
+            results = [
+                asyncio.run(agent.analyze_video_async(sample_video, 8))
+                for _ in range(2)
+            ]
+            after = agent.analyze_video(sample_video, 4)
+            agent.close()
+
+        assert all("Uncertain=0" in r.reasoning for r in [*results, after])
+        assert agent.ollama_client.endpoints.stats()[0]["ejections"] == 0
@@ -0,0 +1,233 @@
+"""Unit tests for load balancing across Ollama servers."""
+
+import asyncio
+import time
+from contextlib import ExitStack
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.balancer import LATENCY, CircuitOpenError, EndpointPool
+from src.models import Frame
+from src.providers import OllamaClient, is_retryable
+
+HOSTS = ["http://a:11434", "http://b:11434", "http://c:11434"]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestEndpointPool:
+    """Tests for EndpointPool scheduling and health."""
+
+    def test_least_outstanding(self):
+        """Test that each request goes to the least busy endpoint."""
+        pool = EndpointPool(HOSTS)
+
+        chosen = [pool.acquire() for _ in range(3)]
+        pool.release(chosen[1], 0.1)
+
+        assert [e.host for e in chosen] == HOSTS
+        assert pool.acquire().host == HOSTS[1]
+
+    def test_latency_weighted(self):
+        """Test that a slower endpoint gets fewer concurrent requests."""
+        pool = EndpointPool(HOSTS[:2], strategy=LATENCY)
+        fast, slow = pool.endpoints
+        fast.latency, slow.latency = 1.0, 3.0
+
+        hosts = [pool.acquire().host for _ in range(4)]
+
+        assert hosts.count(HOSTS[0]) == 3
+        assert hosts.count(HOSTS[1]) == 1
+
+    def test_untried_endpoints_go_first(self):
+        """Test that endpoints without a latency sample are tried."""
+        pool = EndpointPool(HOSTS[:2], strategy=LATENCY)
+        pool.endpoints[0].latency = 0.01
+
+        assert pool.acquire().host == HOSTS[1]
+
+    def test_ejection_and_reinstatement(self):
+        """Test that a failing endpoint is skipped, then probed again."""
+        clock = FakeClock()
+        pool = EndpointPool(HOSTS[:2], max_failures=2, ejection_seconds=10, clock=clock)
+        bad = pool.endpoints[0]
+        for _ in range(2):
+            pool.release(_take(pool, bad), ok=False)
+
+        assert all(pool.acquire().host == HOSTS[1] for _ in range(3))
+        assert pool.stats()[0]["ejected"] is True
+
+        clock.now = 11
+        probe = pool.acquire()
+        assert probe is bad
+        assert pool.acquire().host == HOSTS[1]  # one probe at a time
+
+        pool.release(probe, 0.1)
+        assert bad.failures == 0
+        assert pool.acquire() is bad
+
+    def test_failed_probe_ejects_again(self):
+        """Test that a reinstated endpoint failing once is ejected again."""
+        clock = FakeClock()
+        pool = EndpointPool(HOSTS[:2], max_failures=2, ejection_seconds=10, clock=clock)
+        bad = pool.endpoints[0]
+        for _ in range(2):
+            pool.release(_take(pool, bad), ok=False)
+        clock.now = 11
+
+        pool.release(_take(pool, bad), ok=False)
+
+        assert bad.ejections == 2
+        assert pool.stats()[0]["ejected"] is True
+
+    def test_all_ejected_opens_circuit(self):
+        """Test that requests fail fast while every endpoint is ejected."""
+        clock = FakeClock()
+        pool = EndpointPool(HOSTS[:2], max_failures=1, clock=clock)
+        pool.release(_take(pool, pool.endpoints[0]), ok=False)
+        clock.now = 1
+        pool.release(_take(pool, pool.endpoints[1]), ok=False)
+
+        with pytest.raises(CircuitOpenError, match="next retry in 29s") as info:
+            pool.acquire()
+        assert info.value.retry_in == 29
+
+        clock.now = 30
+        assert pool.acquire() is pool.endpoints[0]
+
+    def test_route_records_outcome(self):
+        """Test that route() counts exceptions as failures."""
+        pool = EndpointPool(HOSTS[:1])
+
+        with pool.route() as host:
+            assert host == HOSTS[0]
+        with pytest.raises(ConnectionError), pool.route():
+            raise ConnectionError("down")
+
+        stats = pool.stats()[0]
+        assert stats["requests"] == 2
+        assert stats["errors"] == 1
+        assert stats["outstanding"] == 0
+        assert stats["latency_s"] is not None
+
+    def test_route_ignores_non_failures(self):
+        """Test that errors the predicate rejects leave the endpoint healthy."""
+        pool = EndpointPool(HOSTS[:1], max_failures=1)
+
+        for error in (LookupError("model not found"), RuntimeError("loop closed")):
+            with pytest.raises(type(error)), pool.route(is_retryable):
+                raise error
+
+        endpoint = pool.endpoints[0]
+        assert (endpoint.failures, endpoint.errors, endpoint.outstanding) == (0, 0, 0)
+        assert pool.acquire() is endpoint
+
+    def test_from_env(self, monkeypatch):
+        """Test that $OLLAMA_HOSTS wins over $OLLAMA_HOST."""
+        monkeypatch.setenv("OLLAMA_HOST", "http://single:11434")
+        monkeypatch.setenv("OLLAMA_HOSTS", "http://a:11434/, http://b:11434")
+
+        assert EndpointPool.from_env().hosts == HOSTS[:2]
+        assert EndpointPool.from_env("http://x").hosts == ["http://x"]
+
+        monkeypatch.delenv("OLLAMA_HOSTS")
+        assert EndpointPool.from_env().hosts == ["http://single:11434"]
+
+    def test_prometheus(self):
+        """Test the per-endpoint exposition format."""
+        pool = EndpointPool(HOSTS[:1])
+        pool.acquire()
+
+        text = pool.to_prometheus()
+
+        assert 'video_fraud_endpoint_outstanding{host="http://a:11434"} 1' in text
+        assert 'video_fraud_endpoint_requests_total{host="http://a:11434"} 1' in text
+
+    def test_invalid_config(self):
+        """Test that bad configuration is rejected."""
+        with pytest.raises(ValueError):
+            EndpointPool([])
+        with pytest.raises(ValueError):
+            EndpointPool(HOSTS, strategy="random")
+
+
+def _take(pool: EndpointPool, endpoint):
+    """Acquire ``endpoint`` directly, bypassing the scheduler."""
+    with pool._lock:
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+    return endpoint
+
+
+class TestAgentBalancing:
+    """Tests for agents spreading requests over stub servers."""
+
+    @pytest.fixture
+    def servers(self):
+        """Run three fake servers generating one request at a time."""
+        with ExitStack() as stack:
+            yield [
+                stack.enter_context(FakeOllamaServer(latency=0.1, parallel=1))
+                for _ in range(3)
+            ]
+
+    def _agent(self, servers, **kwargs):
+        endpoints = EndpointPool([server.url for server in servers])
+        return VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(endpoints=endpoints), verbose=False, **kwargs
+        )
+
+    def test_video_spread_across_hosts(self, servers, sample_video):
+        """Test that one video's frames run on every host at once."""
+        agent = self._agent(servers, max_concurrency=3)
+
+        start = time.perf_counter()
+        agent.analyze_video(sample_video, sample_frames=6)
+        elapsed = time.perf_counter() - start
+        agent.close()
+
+        assert [server.requests for server in servers] == [2, 2, 2]
+        # Six 0.1s requests on hosts serving one at a time: ~0.2s, not 0.6s
+        assert elapsed < 0.5
+
+    def test_async_shares_pool(self, servers, sample_video):
+        """Test that the async path balances over the same endpoints."""
+        agent = self._agent(servers, max_concurrency=3)
+
+        asyncio.run(agent.analyze_video_async(sample_video, 3))
+        agent.close()
+
+        assert [server.requests for server in servers] == [1, 1, 1]
+        assert agent._async_ollama.endpoints is agent.ollama_client.endpoints
+
+    def test_failing_host_is_ejected(self, servers):
+        """Test that a host returning errors is retried elsewhere, then ejected."""
+        servers[0].error_rate = 1.0
+        agent = self._agent(servers[:2])
+        frame = Frame(0, "frame_0000.jpg", "aW1n")
+
+        results = [agent.analyze_frame(frame) for _ in range(8)]
+        agent.close()
+
+        assert all(result.confidence > 0 for result in results)
+        assert servers[0].requests == 3
+        assert servers[1].requests == 8
+        assert agent.ollama_client.retries == 3
+
+    def test_warm_up_every_host(self, servers):
+        """Test that warm-up loads the model on each server."""
+        agent = self._agent(servers, warm_up=True)
+        agent.close()
+
+        assert [r.host for r in agent.warmup_reports] == [s.url for s in servers]
+        assert all(server.preloads == 2 for server in servers)
@@ -0,0 +1,102 @@
+"""Unit tests for batch analysis."""
+
+import io
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from src.agent import VideoFraudDetectionAgent
+from src.batch import (
+    BatchSummary,
+    _percentile,
+    discover_videos,
+    read_manifest,
+    run_batch,
+)
+
+
+class TestDiscovery:
+    """Tests for discover_videos and read_manifest."""
+
+    def test_discover_videos_recurses_and_filters(self, tmp_path):
+        """Test that only video files are found, sorted, in subfolders."""
+        (tmp_path / "sub").mkdir()
+        for name in ("b.mp4", "a.AVI", "notes.txt", "sub/c.mkv"):
+            (tmp_path / name).touch()
+
+        found = discover_videos(tmp_path)
+
+        assert [p.relative_to(tmp_path).as_posix() for p in found] == [
+            "a.AVI",
+            "b.mp4",
+            "sub/c.mkv",
+        ]
+
+    def test_read_manifest(self, tmp_path):
+        """Test that comments and blanks are skipped and paths resolved."""
+        manifest = tmp_path / "videos.txt"
+        manifest.write_text("# corpus\nclip.mp4\n\n/abs/other.mp4\n")
+
+        assert read_manifest(manifest) == [
+            tmp_path / "clip.mp4",
+            Path("/abs/other.mp4"),
+        ]
+
+
+class TestBatchSummary:
+    """Tests for BatchSummary."""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 95) == 95.0
+        assert _percentile([], 95) == 0.0
+
+    def test_to_dict_rates(self):
+        """Test throughput rates derived from counts and elapsed time."""
+        summary = BatchSummary(
+            videos=4, frames=20, elapsed=2.0, latencies=[1.0, 2.0, 3.0, 4.0]
+        )
+
+        stats = summary.to_dict()
+
+        assert stats["videos_per_s"] == 2.0
+        assert stats["frames_per_s"] == 10.0
+        assert stats["latency_p50_s"] == 2.0
+        assert stats["latency_p95_s"] == 4.0
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    def test_streams_one_record_per_video(self, sample_video, tmp_path, llm_response):
+        """Test JSONL output for good and unreadable videos."""
+        second = tmp_path / "second.avi"
+        shutil.copy(sample_video, second)
+        broken = tmp_path / "broken.avi"
+        broken.write_bytes(b"not a video")
+        agent = VideoFraudDetectionAgent(max_concurrency=2, verbose=False)
+        output = io.StringIO()
+
+        with patch.object(
+            VideoFraudDetectionAgent, "_query_llm", return_value=llm_response()
+        ):
+            summary = run_batch(
+                agent, [sample_video, broken, second], output, 3, decode_workers=2
+            )
+        agent.close()
+
+        records = {
+            r["video"]: r for r in map(json.loads, output.getvalue().splitlines())
+        }
+        assert set(records) == {str(sample_video), str(broken), str(second)}
+        assert "error" in records[str(broken)]
+        assert records[str(second)]["verdict"] == "ai_generated"
+        assert records[str(second)]["frames"] == 3
+        assert summary.videos == 2
+        assert summary.failed == 1
+        assert summary.frames == 6
+        assert len(summary.latencies) == 2
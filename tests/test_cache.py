@@ -0,0 +1,95 @@
+"""Unit tests for the persistent verdict cache."""
+
+import time
+from unittest.mock import patch
+
+from src.agent import VideoFraudDetectionAgent
+from src.cache import VerdictCache
+from src.models import Frame
+
+
+class TestVerdictCache:
+    """Tests for VerdictCache."""
+
+    def test_round_trip(self, tmp_path, make_result):
+        """Test that stored results and responses are returned intact."""
+        cache = VerdictCache(tmp_path)
+        key = cache.make_key("aW1n", "ollama", "llava")
+
+        cache.put(key, '{"verdict": "AI_GENERATED"}', make_result())
+
+        assert cache.get(key) == make_result()
+        assert cache.get_response(key) == '{"verdict": "AI_GENERATED"}'
+
+    def test_persists_across_instances(self, tmp_path, make_result):
+        """Test that entries survive reopening the cache."""
+        key = VerdictCache.make_key("aW1n", "ollama", "llava")
+        first = VerdictCache(tmp_path)
+        first.put(key, "raw", make_result())
+        first.close()
+
+        assert VerdictCache(tmp_path).get(key) == make_result()
+
+    def test_key_depends_on_model(self):
+        """Test that frame, provider and model all change the key."""
+        base = VerdictCache.make_key("aW1n", "ollama", "llava")
+
+        assert base != VerdictCache.make_key("aW1o", "ollama", "llava")
+        assert base != VerdictCache.make_key("aW1n", "openai", "llava")
+        assert base != VerdictCache.make_key("aW1n", "ollama", "llava:13b")
+
+    def test_miss_returns_none(self, tmp_path):
+        """Test that unknown keys miss."""
+        assert VerdictCache(tmp_path).get("missing") is None
+
+    def test_expired_entries_miss(self, tmp_path, make_result):
+        """Test that entries older than max_age are dropped."""
+        cache = VerdictCache(tmp_path, max_age=60)
+        cache.put("k", "raw", make_result())
+
+        with patch("src.cache.time.time", return_value=time.time() + 120):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_size_eviction_is_lru(self, tmp_path, make_result):
+        """Test that the least recently used entries are evicted first."""
+        cache = VerdictCache(tmp_path, max_bytes=600)
+        cache.put("a", "x" * 100, make_result())
+        cache.put("b", "x" * 100, make_result())
+        cache.get("a")
+        cache.put("c", "x" * 100, make_result())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+class TestAgentCache:
+    """Tests for agent cache integration."""
+
+    def test_hit_skips_model(self, tmp_path, llm_response):
+        """Test that a repeated frame is served from the cache."""
+        agent = VideoFraudDetectionAgent(cache=VerdictCache(tmp_path))
+        frame = Frame(index=0, name="frame_0000.jpg", data="aW1n")
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as q:
+            first = agent.analyze_frame(frame)
+            second = agent.analyze_frame(frame)
+
+        assert q.call_count == 1
+        assert first == second
+
+    def test_parse_failures_not_cached(self, tmp_path):
+        """Test that unparseable responses are re-queried."""
+        agent = VideoFraudDetectionAgent(cache=VerdictCache(tmp_path))
+        frame = Frame(index=0, name="frame_0000.jpg", data="aW1n")
+
+        with patch.object(agent, "_query_llm", return_value="garbage") as q:
+            agent.analyze_frame(frame)
+            agent.analyze_frame(frame)
+
+        assert q.call_count == 2
+
+    def test_no_cache_by_default(self):
+        """Test that library callers opt in to caching."""
+        assert VideoFraudDetectionAgent().cache is None
@@ -0,0 +1,244 @@
+"""Unit tests for model cascades."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.cache import VerdictCache
+from src.cascade import CascadeTier, escalate, escalate_pack, parse_tier
+from src.main import build_parser, run_config
+from src.models import AnalysisResult, Verdict, result_from_dict, result_to_dict
+from src.parsing import ANALYSIS_SCHEMA, aggregate_results
+from src.providers import OllamaClient
+
+SMALL = "ollama/moondream"
+LARGE = "ollama/llava"
+CASCADE = [CascadeTier("moondream", threshold=0.8), CascadeTier("llava")]
+
+
+def _verdict(verdict: str, confidence: int) -> dict:
+    return {
+        "verdict": verdict,
+        "confidence": confidence,
+        "reasoning": f"{verdict} reasoning",
+        "indicators": [],
+        "recommendations": [],
+    }
+
+
+@pytest.fixture
+def server():
+    """A stub serving a small model that is sure of one frame in three."""
+    small = [
+        _verdict("AUTHENTIC", 95),
+        _verdict("AI_GENERATED", 40),
+        _verdict("UNCERTAIN", 90),
+    ]
+    with FakeOllamaServer(
+        models=("moondream:latest", "llava:latest"),
+        model_responses={"moondream": small},
+    ) as fake:
+        yield fake
+
+
+def _agent(server, **kwargs) -> VideoFraudDetectionAgent:
+    return VideoFraudDetectionAgent(
+        ollama_client=OllamaClient(host=server.url),
+        cascade=CASCADE,
+        verbose=False,
+        **kwargs,
+    )
+
+
+class TestCascadeTier:
+    """Tests for tier parsing and acceptance."""
+
+    @pytest.mark.parametrize(
+        "spec, expected",
+        [
+            ("moondream", CascadeTier("moondream")),
+            ("moondream@0.8", CascadeTier("moondream", threshold=0.8)),
+            ("llava:13b", CascadeTier("llava:13b")),
+            ("openai/gpt-4o@0.5", CascadeTier("gpt-4o", "openai", 0.5)),
+            ("hf.co/org/model", CascadeTier("hf.co/org/model")),
+        ],
+    )
+    def test_parse(self, spec, expected):
+        """Test provider prefixes, model tags and thresholds."""
+        assert parse_tier(spec) == expected
+
+    @pytest.mark.parametrize("spec", ["@0.5", "llava@high", "llava@1.5"])
+    def test_parse_invalid(self, spec):
+        """Test that a missing model or bad threshold raises ValueError."""
+        with pytest.raises(ValueError):
+            parse_tier(spec)
+
+    def test_unknown_provider(self):
+        """Test that tiers only accept known providers."""
+        with pytest.raises(ValueError):
+            CascadeTier("llava", provider="local")
+
+    def test_accepts(self):
+        """Test that UNCERTAIN or low-confidence results are not accepted."""
+        tier = CascadeTier("moondream", threshold=0.8)
+
+        def result(verdict, confidence):
+            return AnalysisResult(verdict, confidence, "r", [], [])
+
+        assert tier.accepts(result(Verdict.AUTHENTIC, 0.8))
+        assert not tier.accepts(result(Verdict.AI_GENERATED, 0.79))
+        assert not tier.accepts(result(Verdict.UNCERTAIN, 1.0))
+
+    def test_cli(self):
+        """Test that --cascade parses its tiers in order."""
+        args = build_parser().parse_args(["--cascade", "moondream@0.8", "llava"])
+
+        assert args.cascade == CASCADE
+
+    def test_part_of_run_config(self):
+        """Test that resuming a batch run with other tiers is refused."""
+        parser = build_parser()
+        single = parser.parse_args(["--dir", "videos"])
+        cascade = parser.parse_args(["--dir", "videos", "--cascade", "moondream"])
+        agent = VideoFraudDetectionAgent(verbose=False)
+
+        assert run_config(agent, single)["cascade"] == []
+        assert run_config(agent, cascade)["cascade"] == [["ollama", "moondream", 0.0]]
+
+
+class TestEscalation:
+    """Tests for the tier-by-tier escalation helpers."""
+
+    def test_pack_repacks_undecided_frames(self):
+        """Test that only frames a tier doesn't accept reach the next one."""
+        answers = {
+            CASCADE[0]: [Verdict.AUTHENTIC, Verdict.UNCERTAIN, Verdict.AUTHENTIC],
+            CASCADE[1]: [Verdict.AI_GENERATED],
+        }
+        sent = []
+
+        def query(tier, pending):
+            sent.append((tier, pending))
+            return [AnalysisResult(v, 0.9, "r", [], []) for v in answers[tier]]
+
+        results = escalate_pack(CASCADE, 3, query, log=lambda message: None)
+
+        assert sent == [(CASCADE[0], [0, 1, 2]), (CASCADE[1], [1])]
+        assert [r.verdict for r in results] == [
+            Verdict.AUTHENTIC,
+            Verdict.AI_GENERATED,
+            Verdict.AUTHENTIC,
+        ]
+        assert results[1].tiers == {LARGE: 1}
+
+    def test_single_model_always_decides(self):
+        """Test that the agent's single model (tier None) is never escalated."""
+        uncertain = AnalysisResult(Verdict.UNCERTAIN, 0.0, "r", [], [])
+
+        result = escalate([None], lambda tier: uncertain, log=lambda message: None)
+
+        assert result is uncertain
+        assert result.tiers == {}
+
+
+class TestResultTiers:
+    """Tests for tier counts carried by results."""
+
+    def test_round_trip_and_schema(self):
+        """Test tiers survive serialization and stay out of the schema."""
+        result = AnalysisResult(Verdict.AUTHENTIC, 0.9, "r", [], [], tiers={SMALL: 1})
+
+        assert result_from_dict(result_to_dict(result)).tiers == {SMALL: 1}
+        assert "tiers" not in ANALYSIS_SCHEMA["properties"]
+
+    def test_aggregated_counts(self):
+        """Test that the video result counts frames by weight per tier."""
+        results = [
+            AnalysisResult(Verdict.AUTHENTIC, 0.9, "r", [], [], tiers={SMALL: 1}),
+            AnalysisResult(Verdict.AUTHENTIC, 0.7, "r", [], [], tiers={LARGE: 1}),
+            AnalysisResult(Verdict.AUTHENTIC, 0.9, "r", [], [], tiers={SMALL: 1}),
+        ]
+
+        assert aggregate_results(results, [2, 1, 1]).tiers == {SMALL: 3, LARGE: 1}
+
+
+class TestAgentCascade:
+    """Tests for escalation in the agent."""
+
+    def test_escalates_uncertain_and_unconfident(self, server, sample_video):
+        """Test that only frames the small model can't decide reach llava."""
+        agent = _agent(server)
+        result = agent.analyze_video(sample_video, sample_frames=3)
+        agent.close()
+
+        assert server.generated == [
+            "moondream",
+            "moondream",
+            "llava",
+            "moondream",
+            "llava",
+        ]
+        assert result.tiers == {SMALL: 1, LARGE: 2}
+        assert f"Cascade decisions: {SMALL}: 1, {LARGE}: 2." in result.reasoning
+
+    def test_frame_result_names_tier(self, server, sample_video):
+        """Test that each frame result records the tier that decided it."""
+        agent = _agent(server)
+        frame = agent._extract_frames(sample_video, 1)[0][0]
+
+        first = agent.analyze_frame(frame)
+        second = agent.analyze_frame(frame)
+        agent.close()
+
+        assert (first.verdict, first.tiers) == (Verdict.AUTHENTIC, {SMALL: 1})
+        assert (second.verdict, second.tiers) == (Verdict.AI_GENERATED, {LARGE: 1})
+
+    def test_packed_escalation(self, server, sample_video):
+        """Test that escalated frames of a pack are re-packed for llava."""
+        agent = _agent(server, frames_per_request=2)
+        result = agent.analyze_video(sample_video, sample_frames=4)
+        agent.close()
+
+        assert server.generated == ["moondream", "moondream", "llava"]
+        assert result.tiers == {SMALL: 2, LARGE: 2}
+
+    def test_cached_per_tier(self, server, sample_video, tmp_path):
+        """Test that a rerun is answered from each tier's cache entries."""
+        agent = _agent(server, cache=VerdictCache(tmp_path))
+        first = agent.analyze_video(sample_video, sample_frames=3)
+        requests = server.requests
+        second = agent.analyze_video(sample_video, sample_frames=3)
+        agent.close()
+
+        assert server.requests == requests
+        assert second.tiers == first.tiers
+
+    def test_async(self, server, sample_video):
+        """Test that the async path escalates the same frames."""
+        agent = _agent(server)
+
+        async def analyze():
+            try:
+                return await agent.analyze_video_async(sample_video, 3)
+            finally:
+                await agent.aclose()
+
+        result = asyncio.run(analyze())
+        agent.close()
+
+        assert result.tiers == {SMALL: 1, LARGE: 2}
+
+    def test_warm_up_every_tier(self, server):
+        """Test that warm-up loads each tier's model."""
+        agent = _agent(server, warm_up=True)
+        agent.close()
+
+        assert server.preloads == 4
+        assert len(agent.warmup_reports) == 2
+
+    def test_empty_cascade(self):
+        """Test that a cascade without tiers is rejected."""
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(cascade=[])
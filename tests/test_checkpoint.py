@@ -0,0 +1,160 @@
+"""Unit tests for resumable batch-run checkpoints."""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.batch import run_batch
+from src.checkpoint import CheckpointStore, fingerprint_video
+from src.main import build_parser, run_config
+from src.models import Frame, Verdict
+
+
+class TestFingerprintVideo:
+    """Tests for fingerprint_video."""
+
+    def test_depends_on_content(self, tmp_path):
+        """Test that identical files match and different files do not."""
+        a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+        a.write_bytes(b"video" * 100)
+        b.write_bytes(b"video" * 100)
+        c.write_bytes(b"other" * 100)
+
+        assert fingerprint_video(a) == fingerprint_video(b)
+        assert fingerprint_video(a) != fingerprint_video(c)
+
+
+class TestCheckpointStore:
+    """Tests for CheckpointStore."""
+
+    def test_replays_frames_and_videos(self, tmp_path, make_result):
+        """Test that a reopened run sees completed frames and videos."""
+        with CheckpointStore(tmp_path, "run") as store:
+            store.record_frame("v1", 3, make_result())
+            store.record_video("v1", {"video": "a.mp4", "verdict": "ai_generated"})
+
+        store = CheckpointStore(tmp_path, "run")
+
+        assert store.frame_result("v1", 3) == make_result()
+        assert store.frame_result("v1", 4) is None
+        assert store.video_record("v1") == {"video": "a.mp4", "verdict": "ai_generated"}
+
+    def test_ignores_torn_final_line(self, tmp_path, make_result):
+        """Test that a partial record from a crash is skipped and not joined."""
+        with CheckpointStore(tmp_path, "run") as store:
+            store.record_frame("v1", 0, make_result())
+        with open(store.path, "a") as f:
+            f.write('{"type": "frame", "vid')
+
+        with CheckpointStore(tmp_path, "run") as store:
+            store.record_frame("v1", 1, make_result(Verdict.AUTHENTIC))
+
+        store = CheckpointStore(tmp_path, "run")
+        assert store.frame_result("v1", 0) == make_result()
+        assert store.frame_result("v1", 1) == make_result(Verdict.AUTHENTIC)
+
+    def test_fsync_is_batched(self, tmp_path, make_result):
+        """Test that records are fsynced once per batch, not per write."""
+        store = CheckpointStore(tmp_path, "run", sync_every=4, sync_interval=3600)
+        with patch("src.checkpoint.os.fsync") as fsync:
+            for i in range(8):
+                store.record_frame("v1", i, make_result())
+
+        assert fsync.call_count == 2
+
+    def test_rejects_changed_config(self, tmp_path):
+        """Test that resuming with different settings is refused."""
+        CheckpointStore(tmp_path, "run", {"model": "llava"}).close()
+
+        with pytest.raises(ValueError, match="different settings"):
+            CheckpointStore(tmp_path, "run", {"model": "bakllava"})
+
+    @pytest.mark.parametrize("flag", ["--features", "--temporal"])
+    def test_video_settings_in_run_config(self, tmp_path, flag):
+        """Test that flags changing video records are part of the config."""
+        parser = build_parser()
+        agent = VideoFraudDetectionAgent(verbose=False)
+        config = run_config(agent, parser.parse_args(["--dir", "videos"]))
+        CheckpointStore(tmp_path, "run", config).close()
+        changed = run_config(agent, parser.parse_args(["--dir", "videos", flag]))
+
+        with pytest.raises(ValueError, match="different settings"):
+            CheckpointStore(tmp_path, "run", changed)
+
+
+class TestResume:
+    """Tests for resuming analysis from a checkpoint."""
+
+    def test_only_missing_frames_are_queried(self, tmp_path, llm_response, make_result):
+        """Test that checkpointed frames skip the model on resume."""
+        frames = [Frame(i, f"frame_{i}.jpg", "aW1n") for i in range(4)]
+        agent = VideoFraudDetectionAgent(verbose=False)
+        store = CheckpointStore(tmp_path, "run")
+        store.record_frame("v1", 0, make_result())
+        store.record_frame("v1", 2, make_result())
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as query:
+            agent.analyze_extracted_frames(frames, store.for_video("v1"))
+
+        assert query.call_count == 2
+        assert store.frame_result("v1", 3) is not None
+
+    def test_failed_frames_are_not_checkpointed(self, tmp_path):
+        """Test that frames that errored are retried on resume."""
+        frames = [Frame(0, "frame_0.jpg", "aW1n")]
+        agent = VideoFraudDetectionAgent(max_concurrency=2, verbose=False)
+        store = CheckpointStore(tmp_path, "run")
+
+        with patch.object(agent, "_query_llm", side_effect=ConnectionError):
+            agent.analyze_extracted_frames(frames, store.for_video("v1"))
+        agent.close()
+
+        assert store.frame_result("v1", 0) is None
+
+    def test_finished_videos_are_skipped(self, sample_video, tmp_path, llm_response):
+        """Test that a rerun re-emits finished videos without analysis."""
+        agent = VideoFraudDetectionAgent(verbose=False)
+        first, second = io.StringIO(), io.StringIO()
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()):
+            with CheckpointStore(tmp_path / "runs", "run") as store:
+                run_batch(agent, [sample_video], first, 3, 1, store)
+        with patch.object(agent, "_query_llm") as query:
+            with CheckpointStore(tmp_path / "runs", "run") as store:
+                summary = run_batch(agent, [sample_video], second, 3, 1, store)
+
+        query.assert_not_called()
+        assert summary.resumed == 1
+        assert summary.videos == 0
+        assert json.loads(second.getvalue()) == json.loads(first.getvalue())
+
+    def test_provider_dies_midway(self, sample_video, tmp_path, llm_response):
+        """Test that a video with failed frames is resumed, not replayed."""
+        agent = VideoFraudDetectionAgent(verbose=False)
+        down = [llm_response(), ConnectionError("down"), ConnectionError("down")]
+
+        with patch.object(agent, "_query_llm", side_effect=down):
+            with CheckpointStore(tmp_path / "runs", "run") as store:
+                run_batch(agent, [sample_video], io.StringIO(), 3, 1, store)
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as query:
+            with CheckpointStore(tmp_path / "runs", "run") as store:
+                output = io.StringIO()
+                summary = run_batch(agent, [sample_video], output, 3, 1, store)
+
+        assert query.call_count == 2
+        assert (summary.resumed, summary.videos) == (0, 1)
+        assert json.loads(output.getvalue())["verdict"] == "ai_generated"
+
+    def test_video_without_usable_frames_fails(self, sample_video, tmp_path):
+        """Test that a video whose every frame failed counts as failed."""
+        agent = VideoFraudDetectionAgent(verbose=False)
+
+        with patch.object(agent, "_query_llm", side_effect=ConnectionError("down")):
+            with CheckpointStore(tmp_path / "runs", "run") as store:
+                summary = run_batch(agent, [sample_video], io.StringIO(), 3, 1, store)
+                assert store.video_record(fingerprint_video(sample_video)) is None
+
+        assert (summary.failed, summary.videos) == (1, 0)
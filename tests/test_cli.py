@@ -0,0 +1,34 @@
+"""Unit tests for the command-line options."""
+
+import pytest
+
+from src.cli import build_parser, check_args
+
+
+class TestCli:
+    """Tests for build_parser and check_args."""
+
+    def test_options_grouped(self):
+        """Test that every option is listed under a named group."""
+        parser = build_parser()
+        titles = [group.title for group in parser._action_groups]
+
+        assert {"inputs", "batch mode", "service mode", "output"} <= set(titles)
+        assert parser.parse_args(["--dir", "videos", "--workers", "3"]).workers == 3
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["--video", "a.mp4", "--dir", "videos"],
+            ["--dir", "videos", "--concurrency", "0"],
+            ["--dir", "videos", "--features", "--disk-frames"],
+            ["--serve", "--queue-size", "0"],
+        ],
+    )
+    def test_rejects_inconsistent_options(self, argv):
+        """Test that conflicting or out-of-range options are usage errors."""
+        parser = build_parser()
+
+        with pytest.raises(SystemExit):
+            check_args(parser, parser.parse_args(argv))
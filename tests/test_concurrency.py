@@ -0,0 +1,101 @@
+"""Unit tests for concurrent frame analysis."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.concurrency import analyze_concurrently, failed_frame_result
+from src.models import Verdict
+
+
+class TestAnalyzeConcurrently:
+    """Tests for analyze_concurrently helper."""
+
+    def test_preserves_frame_order(self, make_result):
+        """Test results come back in frame order despite finish order."""
+        verdicts = [Verdict.AI_GENERATED, Verdict.AUTHENTIC, Verdict.UNCERTAIN]
+
+        def analyze(i):
+            time.sleep(0.03 * (3 - i))
+            return make_result(verdicts[i])
+
+        results = analyze_concurrently(analyze, [0, 1, 2], max_concurrency=3)
+
+        assert [r.verdict for r in results] == verdicts
+
+    def test_runs_frames_in_parallel(self, make_result):
+        """Test that up to max_concurrency frames run at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def analyze(_):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return make_result(Verdict.AUTHENTIC)
+
+        analyze_concurrently(analyze, list(range(8)), max_concurrency=4)
+
+        assert peak == 4
+
+    def test_failure_becomes_uncertain(self, make_result):
+        """Test that a failing frame is recorded as UNCERTAIN."""
+
+        def analyze(i):
+            if i == 1:
+                raise TimeoutError("read timed out")
+            return make_result(Verdict.AI_GENERATED)
+
+        results = analyze_concurrently(analyze, [0, 1, 2], max_concurrency=2)
+
+        assert results[1].verdict == Verdict.UNCERTAIN
+        assert results[1].confidence == 0.0
+        assert "read timed out" in results[1].reasoning
+        assert results[2].verdict == Verdict.AI_GENERATED
+
+    def test_not_implemented_propagates(self):
+        """Test that provider configuration errors are not swallowed."""
+
+        def analyze(_):
+            raise NotImplementedError("provider")
+
+        with pytest.raises(NotImplementedError):
+            analyze_concurrently(analyze, [0, 1], max_concurrency=2)
+
+    def test_empty_frames(self):
+        """Test that no frames yields no results."""
+        assert analyze_concurrently(lambda f: f, [], max_concurrency=4) == []
+
+    def test_failed_frame_result(self):
+        """Test the UNCERTAIN result built for failed frames."""
+        result = failed_frame_result(ValueError("boom"))
+
+        assert result.verdict == Verdict.UNCERTAIN
+        assert "boom" in result.reasoning
+
+
+class TestAgentConcurrency:
+    """Tests for VideoFraudDetectionAgent max_concurrency."""
+
+    def test_invalid_max_concurrency(self):
+        """Test that max_concurrency below 1 is rejected."""
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(max_concurrency=0)
+
+    def test_analyze_video_concurrent(self, sample_video, llm_response):
+        """Test concurrent video analysis aggregates all frames."""
+        agent = VideoFraudDetectionAgent(max_concurrency=4)
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()):
+            result = agent.analyze_video(sample_video, sample_frames=6)
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert "Analyzed 6 frames" in result.reasoning
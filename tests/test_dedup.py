@@ -0,0 +1,97 @@
+"""Unit tests for perceptual-hash frame deduplication."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from src.agent import VideoFraudDetectionAgent
+from src.dedup import deduplicate_frames, dhash, hamming_distance
+from src.models import AnalysisResult, Frame, Verdict
+from src.parsing import aggregate_results
+
+
+def _gradient(direction: int) -> np.ndarray:
+    ramp = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (48, 1))[:, ::direction]
+    return np.dstack([ramp] * 3)
+
+
+def _frame(index: int, phash: int | None) -> Frame:
+    return Frame(index=index, name=f"frame_{index:04d}.jpg", data="", phash=phash)
+
+
+class TestDhash:
+    """Tests for dhash and hamming_distance."""
+
+    def test_similar_frames_match(self):
+        """Test that slight noise barely changes the hash."""
+        image = _gradient(1)
+        noisy = np.clip(image.astype(int) + 1, 0, 255).astype(np.uint8)
+
+        assert hamming_distance(dhash(image), dhash(noisy)) <= 2
+
+    def test_different_frames_differ(self):
+        """Test that opposite gradients produce distant hashes."""
+        assert hamming_distance(dhash(_gradient(1)), dhash(_gradient(-1))) > 32
+
+
+class TestDeduplicateFrames:
+    """Tests for deduplicate_frames."""
+
+    def test_groups_within_threshold(self):
+        """Test that close hashes share one representative."""
+        frames = [_frame(0, 0b0000), _frame(1, 0b0001), _frame(2, 0xFFFF)]
+
+        reps, weights = deduplicate_frames(frames, threshold=2)
+
+        assert [f.index for f in reps] == [0, 2]
+        assert weights == [2, 1]
+
+    def test_frames_without_hash_kept(self):
+        """Test that unhashed frames are never merged."""
+        reps, weights = deduplicate_frames([_frame(0, None), _frame(1, None)], 64)
+
+        assert len(reps) == 2
+        assert weights == [1, 1]
+
+
+class TestWeightedAggregation:
+    """Tests for weighted aggregate_results."""
+
+    def test_weights_change_majority(self):
+        """Test that a heavy group outvotes several single frames."""
+        results = [
+            AnalysisResult(Verdict.AUTHENTIC, 0.6, "r", [], []),
+            AnalysisResult(Verdict.AI_GENERATED, 0.9, "r", [], []),
+            AnalysisResult(Verdict.AI_GENERATED, 0.9, "r", [], []),
+        ]
+
+        result = aggregate_results(results, weights=[5, 1, 1])
+
+        assert result.verdict == Verdict.AUTHENTIC
+        assert result.confidence == (0.6 * 5 + 0.9 * 2) / 7
+        assert "Analyzed 7 frames" in result.reasoning
+
+
+class TestAgentDedup:
+    """Tests for agent deduplication."""
+
+    def test_static_video_single_call(self, sample_video, llm_response):
+        """Test that a static-looking video costs one model call."""
+        agent = VideoFraudDetectionAgent(dedup_threshold=4)
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as q:
+            result = agent.analyze_video(sample_video, sample_frames=5)
+
+        assert q.call_count == 1
+        assert "Analyzed 5 frames" in result.reasoning
+        assert "Deduplicated 4 near-identical frames" in result.reasoning
+
+    def test_disabled_by_default(self, sample_video, llm_response):
+        """Test that every frame is analyzed without a threshold."""
+        agent = VideoFraudDetectionAgent()
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as q:
+            result = agent.analyze_video(sample_video, sample_frames=5)
+
+        assert q.call_count == 5
+        assert "Deduplicated" not in result.reasoning
@@ -0,0 +1,138 @@
+"""Unit tests for early-exit sequential decisions."""
+
+from unittest.mock import patch
+
+from src.agent import VideoFraudDetectionAgent
+from src.aggregation import VotingPolicy
+from src.early_exit import (
+    EarlyStopPolicy,
+    analyze_until_decided,
+    informative_order,
+    verdict_locked,
+)
+from src.models import Verdict
+from src.parsing import aggregate_results
+
+
+class TestInformativeOrder:
+    """Tests for informative_order."""
+
+    def test_bit_reversal(self):
+        """Test the order for a power of two."""
+        assert informative_order(8) == [0, 4, 2, 6, 1, 5, 3, 7]
+
+    def test_is_permutation(self):
+        """Test that any count yields a permutation."""
+        assert sorted(informative_order(10)) == list(range(10))
+
+
+class TestVerdictLocked:
+    """Tests for verdict_locked."""
+
+    def test_locked_when_lead_exceeds_remaining(self, make_result):
+        """Test that a lead larger than the remaining frames locks."""
+        results = [make_result(Verdict.AI_GENERATED)] * 4
+
+        assert verdict_locked(results, [1] * 4, remaining_weight=3)
+
+    def test_not_locked_when_tie_possible(self, make_result):
+        """Test that a possible tie does not lock the verdict."""
+        results = [make_result(Verdict.AI_GENERATED)] * 3
+
+        assert not verdict_locked(results, [1] * 3, remaining_weight=3)
+
+    def test_confidence_weighted_lock(self, make_result):
+        """Test that the lock uses the scores the weighted aggregate uses."""
+        voting = VotingPolicy(confidence_weighted=True)
+        unsure = [make_result(Verdict.AI_GENERATED, 0.5)] * 4
+        rest = [make_result(Verdict.AUTHENTIC, 1.0)] * 3
+
+        assert verdict_locked(unsure, [1] * 4, remaining_weight=3)
+        assert not verdict_locked(unsure, [1] * 4, 3, voting)
+        assert aggregate_results(unsure + rest, [1] * 7, voting).verdict == (
+            Verdict.AUTHENTIC
+        )
+        sure = [make_result(Verdict.AI_GENERATED)] * 4
+        assert verdict_locked(sure, [1] * 4, 3, voting)
+
+    def test_recency_weighted_never_locks(self, make_result):
+        """Test that newer remaining frames may always outvote the rest."""
+        voting = VotingPolicy(half_life=2)
+        results = [make_result(Verdict.AI_GENERATED)] * 9
+
+        assert not verdict_locked(results, [1] * 9, 1, voting)
+
+
+class TestEarlyStopPolicy:
+    """Tests for EarlyStopPolicy."""
+
+    def test_agreement_stop(self, make_result):
+        """Test that confident agreement stops after min_frames."""
+        policy = EarlyStopPolicy(min_frames=3, agreement_confidence=0.9)
+        results = [make_result(Verdict.AI_GENERATED)] * 3
+
+        assert policy.should_stop(results, [1] * 3, remaining_weight=7)
+
+    def test_low_confidence_continues(self, make_result):
+        """Test that weak agreement does not stop analysis."""
+        policy = EarlyStopPolicy(min_frames=3, agreement_confidence=0.9)
+        results = [make_result(Verdict.AI_GENERATED, 0.6)] * 3
+
+        assert not policy.should_stop(results, [1] * 3, remaining_weight=7)
+
+    def test_uncertain_agreement_continues(self, make_result):
+        """Test that agreeing UNCERTAIN frames do not stop analysis."""
+        policy = EarlyStopPolicy(min_frames=2, agreement_confidence=0.5)
+        results = [make_result(Verdict.UNCERTAIN)] * 2
+
+        assert not policy.should_stop(results, [1] * 2, remaining_weight=7)
+
+
+class TestAnalyzeUntilDecided:
+    """Tests for analyze_until_decided."""
+
+    def test_stops_after_agreement(self, make_result):
+        """Test that clear-cut videos stop after min_frames calls."""
+        calls = []
+
+        def analyze_batch(batch):
+            calls.extend(batch)
+            return [make_result(Verdict.AI_GENERATED) for _ in batch]
+
+        results, used = analyze_until_decided(
+            analyze_batch, list(range(10)), [1] * 10, EarlyStopPolicy()
+        )
+
+        assert calls == [0, 8, 4]
+        assert len(results) == 3
+        assert used == [1, 1, 1]
+
+    def test_mixed_verdicts_analyze_all(self, make_result):
+        """Test that split verdicts analyze every frame."""
+
+        def analyze_batch(batch):
+            return [
+                make_result(Verdict.AI_GENERATED if i % 2 else Verdict.AUTHENTIC)
+                for i in batch
+            ]
+
+        results, _ = analyze_until_decided(
+            analyze_batch, list(range(6)), [1] * 6, EarlyStopPolicy(), 2
+        )
+
+        assert len(results) == 6
+
+
+class TestAgentEarlyStop:
+    """Tests for agent early-stop integration."""
+
+    def test_reasoning_records_frames(self, sample_video, llm_response):
+        """Test that reasoning reports analyzed versus planned frames."""
+        agent = VideoFraudDetectionAgent(early_stop=EarlyStopPolicy())
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as q:
+            result = agent.analyze_video(sample_video, sample_frames=10)
+
+        assert q.call_count == 3
+        assert result.verdict == Verdict.AI_GENERATED
+        assert "analyzed 3 of 10 planned frames" in result.reasoning
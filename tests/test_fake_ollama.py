@@ -0,0 +1,92 @@
+"""Unit tests for the fake Ollama server used by the benchmarks."""
+
+import json
+
+import pytest
+import requests
+
+from benchmarks.bench_pipeline import percentile
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.models import Frame, Verdict
+from src.packing import build_pack_prompt
+from src.providers import OllamaClient, RetryPolicy
+
+
+@pytest.fixture
+def fake_server():
+    """Run a fake Ollama server with no latency."""
+    with FakeOllamaServer(latency=0.0, responses=[{"verdict": "AUTHENTIC"}]) as server:
+        yield server
+
+
+class TestFakeOllamaServer:
+    """Tests for FakeOllamaServer."""
+
+    def test_generate(self, fake_server):
+        """Test that canned responses are served with duration stats."""
+        response = requests.post(
+            f"{fake_server.url}/api/generate",
+            json={"model": "llava", "prompt": "p", "images": ["aW1n"]},
+            timeout=5,
+        ).json()
+
+        assert json.loads(response["response"]) == {"verdict": "AUTHENTIC"}
+        assert response["done"] is True
+        assert "eval_duration" in response
+        assert fake_server.requests == 1
+
+    def test_stream(self, fake_server):
+        """Test that streamed responses reassemble to the canned text."""
+        client = OllamaClient(host=fake_server.url)
+
+        text = "".join(client.stream("llava", "aW1n", "frame.jpg"))
+        client.close()
+
+        assert json.loads(text) == {"verdict": "AUTHENTIC"}
+
+    def test_packed_prompt(self, fake_server):
+        """Test that packed prompts get one entry per frame."""
+        client = OllamaClient(host=fake_server.url)
+        prompt = build_pack_prompt(["a.jpg", "b.jpg"], "images")
+
+        response = json.loads(client.generate("llava", ["a", "b"], "", prompt))
+        client.close()
+
+        assert [f["frame"] for f in response["frames"]] == [1, 2]
+
+    def test_error_rate(self):
+        """Test that injected failures surface as HTTP errors."""
+        with FakeOllamaServer(latency=0.0, error_rate=1.0) as server:
+            client = OllamaClient(host=server.url, retry=RetryPolicy(attempts=1))
+            with pytest.raises(requests.HTTPError):
+                client.generate("llava", "aW1n", "frame.jpg")
+            client.close()
+
+        assert server.errors == 1
+
+    def test_tags(self, fake_server):
+        """Test that the model list is served."""
+        response = requests.get(f"{fake_server.url}/api/tags", timeout=5).json()
+
+        assert response == {"models": [{"name": "llava:latest"}]}
+
+    def test_agent_round_trip(self, fake_server):
+        """Test that the agent parses the fake server's verdicts."""
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=fake_server.url), verbose=False
+        )
+
+        result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+        agent.close()
+
+        assert result.verdict == Verdict.AUTHENTIC
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
@@ -0,0 +1,181 @@
+"""Unit tests for spectral and compression artifact features."""
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.features import (
+    FEATURE_NAMES,
+    analysis_crop,
+    batch_features,
+    frame_features,
+)
+from src.models import AnalysisResult, Verdict, result_from_dict, result_to_dict
+from src.parsing import ANALYSIS_SCHEMA, aggregate_results
+from src.providers import OllamaClient
+from src.video_utils import extract_frames_in_memory
+
+
+def _noise(frames: int = 2, size: int = 64, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (frames, size, size, 3), dtype=np.uint8)
+
+
+def _smooth(frames: int = 2, size: int = 64) -> np.ndarray:
+    return np.stack([cv2.GaussianBlur(f, (0, 0), 1.5) for f in _noise(frames, size)])
+
+
+class TestCrop:
+    """Tests for analysis_crop."""
+
+    def test_block_aligned_center(self):
+        """Test that the crop is square, centered and on the 8x8 grid."""
+        frame = np.zeros((100, 300, 3), dtype=np.uint8)
+        frame[:96, 96:192] = 1
+
+        crop = analysis_crop(frame, size=256)
+
+        assert crop.shape == (96, 96, 3)
+        assert crop.all()
+
+    def test_grayscale_and_too_small(self):
+        """Test grayscale frames get three channels and tiny frames fail."""
+        assert analysis_crop(np.zeros((32, 32), dtype=np.uint8)).shape == (32, 32, 3)
+        with pytest.raises(ValueError):
+            analysis_crop(np.zeros((12, 40, 3), dtype=np.uint8))
+
+
+class TestBatchFeatures:
+    """Tests for the vectorized feature computations."""
+
+    def test_one_value_per_frame(self):
+        """Test that every feature has one finite value per frame."""
+        features = batch_features(_noise(frames=11))
+
+        assert set(features) == set(FEATURE_NAMES)
+        assert all(v.shape == (11,) and np.isfinite(v).all() for v in features.values())
+
+    def test_batch_equals_single_frames(self):
+        """Test that frames are scored independently of their batch."""
+        batch = _noise(frames=10)
+
+        together = batch_features(batch)
+        alone = batch_features(batch[3:4])
+
+        for name in FEATURE_NAMES:
+            assert together[name][3] == pytest.approx(alone[name][0], rel=1e-4)
+
+    def test_high_frequency_energy(self):
+        """Test that noise has far more high-frequency energy than blur."""
+        noise, smooth = batch_features(_noise()), batch_features(_smooth())
+
+        assert noise["fft_high_freq"].min() > 0.5
+        assert smooth["fft_high_freq"].max() < 0.05
+        assert noise["dct_high_freq"].min() > 10 * smooth["dct_high_freq"].max()
+
+    def test_jpeg_blockiness(self):
+        """Test that heavy JPEG compression is detected at block edges."""
+        jpeg = np.stack(
+            [
+                cv2.imdecode(
+                    cv2.imencode(".jpg", f, [cv2.IMWRITE_JPEG_QUALITY, 10])[1], 1
+                )
+                for f in _smooth()
+            ]
+        )
+
+        assert batch_features(_smooth())["blockiness"] == pytest.approx(1, abs=0.2)
+        assert batch_features(jpeg)["blockiness"].min() > 2
+
+    def test_upsampling_grid_peaks(self):
+        """Test that 2x interpolated frames show periodic spectral peaks."""
+        halves = _smooth(size=64)
+        upsampled = np.stack(
+            [cv2.resize(f, (128, 128), interpolation=cv2.INTER_LINEAR) for f in halves]
+        )
+
+        natural = batch_features(_smooth(size=128))["grid_peak"]
+        assert batch_features(upsampled)["grid_peak"].min() > 1.5 * natural.max()
+
+    def test_color_statistics(self):
+        """Test channel means, spreads and correlations."""
+        gray = np.repeat(_noise()[..., :1], 3, axis=3)
+        features = batch_features(gray)
+
+        assert features["color_mean_r"] == pytest.approx(0.5, abs=0.05)
+        assert features["color_std_g"] == pytest.approx(0.29, abs=0.02)
+        assert features["color_corr_rg"] == pytest.approx(1)
+        assert abs(batch_features(_noise())["color_corr_rb"]).max() < 0.1
+
+    def test_invalid_batch(self):
+        """Test that unstackable shapes are rejected."""
+        with pytest.raises(ValueError):
+            batch_features(np.zeros((2, 64, 64), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            batch_features(np.zeros((2, 60, 64, 3), dtype=np.uint8))
+
+    def test_frame_features_serializable(self):
+        """Test that per-frame dicts hold plain floats in name order."""
+        (scores,) = frame_features(_noise(frames=1))
+
+        assert list(scores) == list(FEATURE_NAMES)
+        assert all(type(value) is float for value in scores.values())
+
+
+class TestResultFeatures:
+    """Tests for features carried by results."""
+
+    def test_round_trip_and_schema(self):
+        """Test features survive serialization and stay out of the schema."""
+        result = AnalysisResult(
+            Verdict.AUTHENTIC, 0.8, "r", [], [], features={"blockiness": 1.2}
+        )
+
+        assert result_from_dict(result_to_dict(result)).features == result.features
+        assert "features" not in ANALYSIS_SCHEMA["properties"]
+        plain = AnalysisResult(Verdict.AUTHENTIC, 1.0, "r", [], [])
+        assert "features" not in result_to_dict(plain)
+
+    def test_aggregated_mean(self):
+        """Test that the video result averages features by frame weight."""
+        results = [
+            AnalysisResult(Verdict.AUTHENTIC, 0.8, "r", [], [], features={"x": 1.0}),
+            AnalysisResult(Verdict.AUTHENTIC, 0.8, "r", [], [], features={"x": 4.0}),
+            AnalysisResult(Verdict.UNCERTAIN, 0.0, "failed", [], []),
+        ]
+
+        assert aggregate_results(results, [2, 1, 1]).features == {"x": 2.0}
+
+
+class TestAgentFeatures:
+    """Tests for features computed during frame extraction."""
+
+    def test_extracted_frames_scored(self, sample_video):
+        """Test that in-memory frames carry features only when requested."""
+        frames = extract_frames_in_memory(sample_video, 3, features=True)
+
+        assert all(list(frame.features) == list(FEATURE_NAMES) for frame in frames)
+        assert extract_frames_in_memory(sample_video, 3)[0].features is None
+
+    @pytest.mark.parametrize("frames_per_request", [1, 3])
+    def test_attached_to_results(self, sample_video, frames_per_request):
+        """Test that the video result carries the mean frame features."""
+        with FakeOllamaServer() as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                features=True,
+                frames_per_request=frames_per_request,
+                verbose=False,
+            )
+            result = agent.analyze_video(sample_video, sample_frames=3)
+            agent.close()
+
+        assert list(result.features) == list(FEATURE_NAMES)
+        assert result.verdict == Verdict.AI_GENERATED
+
+    def test_requires_in_memory_frames(self):
+        """Test that features with disk frames are rejected."""
+        with pytest.raises(ValueError, match="in_memory_frames"):
+            VideoFraudDetectionAgent(features=True, in_memory_frames=False)
@@ -0,0 +1,127 @@
+"""Unit tests for frame preparation before upload."""
+
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.frame_prep import (
+    DEFAULT_PREP,
+    GRAY,
+    PNG,
+    WEBP,
+    FramePrep,
+    prep_for,
+)
+from src.video_utils import extract_frames_in_memory
+
+
+def _decode(data: str) -> np.ndarray:
+    buffer = np.frombuffer(base64.b64decode(data), dtype=np.uint8)
+    return cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+
+
+def _noise(height: int, width: int) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), np.uint8)
+
+
+class TestFramePrep:
+    """Tests for FramePrep."""
+
+    def test_downscales_longest_side(self):
+        """Test that the longest side is capped and aspect is kept."""
+        image = _noise(1080, 1920)
+
+        decoded = _decode(FramePrep(max_side=640).encode(image))
+
+        assert decoded.shape == (360, 640, 3)
+
+    def test_never_upscales(self):
+        """Test that small frames keep their size."""
+        image = _noise(48, 64)
+
+        assert _decode(FramePrep(max_side=640).encode(image)).shape == (48, 64, 3)
+
+    def test_full_resolution(self):
+        """Test that max_side None keeps the original resolution."""
+        image = _noise(300, 500)
+
+        assert _decode(FramePrep(max_side=None).encode(image)).shape == (300, 500, 3)
+
+    def test_grayscale(self):
+        """Test that gray mode sends a single channel."""
+        image = _noise(48, 64)
+
+        assert _decode(FramePrep(color=GRAY).encode(image)).ndim == 2
+
+    def test_quality_shrinks_payload(self):
+        """Test that lower JPEG quality yields smaller payloads."""
+        image = _noise(240, 320)
+
+        low = FramePrep(quality=30).encode_bytes(image)
+        high = FramePrep(quality=95).encode_bytes(image)
+
+        assert len(low) < len(high)
+
+    @pytest.mark.parametrize("image_format", [WEBP, PNG])
+    def test_other_formats(self, image_format):
+        """Test that WebP and PNG frames decode back."""
+        image = _noise(48, 64)
+
+        assert _decode(FramePrep(image_format=image_format).encode(image)) is not None
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"max_side": 0}, {"quality": 0}, {"image_format": "gif"}, {"color": "cmyk"}],
+    )
+    def test_rejects_invalid_options(self, options):
+        """Test that invalid settings raise ValueError."""
+        with pytest.raises(ValueError):
+            FramePrep(**options)
+
+
+class TestPrepFor:
+    """Tests for prep_for."""
+
+    def test_model_profile_matches_tagged_model(self):
+        """Test that a tagged model falls back to its base model profile."""
+        assert prep_for("ollama", "llava:13b").max_side == 672
+
+    def test_provider_profile(self):
+        """Test that unknown models use the provider profile."""
+        assert prep_for("anthropic", "claude").max_side == 1568
+
+    def test_default(self):
+        """Test that unknown providers use the default profile."""
+        assert prep_for("other", "model") == DEFAULT_PREP
+
+
+class TestPreparedUpload:
+    """Tests for frame preparation in extraction and the agent."""
+
+    def test_extract_frames_in_memory_applies_prep(self, sample_video):
+        """Test that extracted frames are encoded with the prep settings."""
+        frames = extract_frames_in_memory(
+            sample_video, 2, prep=FramePrep(max_side=32, image_format=PNG)
+        )
+
+        assert frames[0].name.endswith(".png")
+        assert _decode(frames[0].data).shape == (24, 32, 3)
+
+    def test_load_image_applies_prep(self, tmp_path):
+        """Test that image files are downscaled before upload."""
+        path = tmp_path / "big.png"
+        cv2.imwrite(str(path), _noise(400, 800))
+        agent = VideoFraudDetectionAgent(frame_prep=FramePrep(max_side=200))
+
+        assert _decode(agent._load_image(path)).shape == (100, 200, 3)
+
+    def test_load_image_passes_through_undecodable_files(self, tmp_path):
+        """Test that files OpenCV cannot read are sent unchanged."""
+        path = tmp_path / "frame.jpg"
+        path.write_bytes(b"not an image")
+        agent = VideoFraudDetectionAgent()
+
+        assert base64.b64decode(agent._load_image(path)) == b"not an image"
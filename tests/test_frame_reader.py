@@ -0,0 +1,92 @@
+"""Unit tests for frame decoding strategies."""
+
+import numpy as np
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.frame_reader import (
+    KEYFRAME,
+    SEEK,
+    SEQUENTIAL,
+    choose_strategy,
+    compute_frame_indices,
+    find_keyframes,
+    read_frames,
+    snap_to_keyframes,
+)
+
+
+class TestComputeFrameIndices:
+    """Tests for compute_frame_indices."""
+
+    def test_even_distribution(self):
+        """Test indices are evenly spread across the video."""
+        assert compute_frame_indices(100, 5) == [0, 20, 40, 60, 80]
+
+    def test_more_samples_than_frames(self):
+        """Test that every frame is used when samples exceed frames."""
+        assert compute_frame_indices(3, 10) == [0, 1, 2]
+
+
+class TestChooseStrategy:
+    """Tests for automatic strategy selection."""
+
+    def test_dense_sampling_is_sequential(self):
+        """Test that many samples per GOP favour one sequential pass."""
+        assert choose_strategy(compute_frame_indices(200, 10)) == SEQUENTIAL
+
+    def test_sparse_sampling_seeks(self):
+        """Test that few samples over a long video favour seeking."""
+        assert choose_strategy(compute_frame_indices(100_000, 5)) == SEEK
+
+    def test_short_gop_seeks(self):
+        """Test that frequent keyframes make seeking cheaper."""
+        indices = compute_frame_indices(2_000, 10)
+        assert choose_strategy(indices, gop_size=12) == SEEK
+
+
+class TestSnapToKeyframes:
+    """Tests for snap_to_keyframes."""
+
+    def test_snaps_within_distance(self):
+        """Test that targets move to nearby keyframes."""
+        assert snap_to_keyframes([0, 48, 97], [0, 50, 100], 10) == [0, 50, 100]
+
+    def test_keeps_far_targets(self):
+        """Test that targets far from any keyframe are unchanged."""
+        assert snap_to_keyframes([0, 40, 80], [0], 20) == [0, 40, 80]
+
+    def test_no_keyframes(self):
+        """Test that an empty keyframe list leaves targets untouched."""
+        assert snap_to_keyframes([5, 10], [], 3) == [5, 10]
+
+
+class TestReadFrames:
+    """Tests for read_frames strategies."""
+
+    def test_sequential_matches_seek(self, sample_video):
+        """Test that both strategies decode the same frames."""
+        seek = list(read_frames(sample_video, 5, SEEK))
+        sequential = list(read_frames(sample_video, 5, SEQUENTIAL))
+
+        assert [i for i, _ in seek] == [i for i, _ in sequential]
+        for (_, a), (_, b) in zip(seek, sequential):
+            assert np.array_equal(a, b)
+
+    def test_keyframe_strategy(self, sample_video):
+        """Test keyframe snapping on an all-intra video keeps targets."""
+        assert find_keyframes(sample_video) == list(range(30))
+
+        frames = list(read_frames(sample_video, 3, KEYFRAME))
+
+        assert [i for i, _ in frames] == [0, 10, 20]
+
+    def test_unknown_strategy(self, sample_video):
+        """Test that an unknown strategy raises ValueError."""
+        with pytest.raises(ValueError):
+            list(read_frames(sample_video, 3, "random"))
+
+    def test_agent_rejects_unknown_strategy(self):
+        """Test that the agent validates its extraction strategy."""
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(extraction_strategy="random")
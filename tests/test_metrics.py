@@ -0,0 +1,186 @@
+"""Unit tests for per-stage timing instrumentation."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.metrics import (
+    METRICS,
+    PARSE,
+    REQUEST,
+    MetricsRegistry,
+    record,
+    record_model_durations,
+    span,
+    timed_iter,
+    timing_scope,
+)
+from src.models import AnalysisResult, Frame, Verdict, result_from_dict, result_to_dict
+from src.providers import OllamaClient
+from src.streaming import parse_ndjson_line
+
+OLLAMA_STATS = {
+    "total_duration": 2_000_000_000,
+    "load_duration": 500_000_000,
+    "prompt_eval_duration": 1_000_000_000,
+    "eval_duration": 400_000_000,
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with an empty process-wide registry."""
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry exports."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that bucket counts include every smaller bucket."""
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 0.7, 3.0):
+            registry.observe("decode", seconds)
+
+        stats = registry.to_dict()["decode"]
+
+        assert stats["buckets"] == {"0.1": 1, "1": 3, "+Inf": 4}
+        assert stats["count"] == 4
+        assert stats["sum_s"] == pytest.approx(4.25)
+
+    def test_prometheus_format(self):
+        """Test the exposition format of one stage."""
+        registry = MetricsRegistry(buckets=(1.0,))
+        registry.observe("parse", 0.25)
+
+        text = registry.to_prometheus()
+
+        assert "# TYPE video_fraud_stage_seconds histogram" in text
+        assert 'video_fraud_stage_seconds_bucket{stage="parse",le="1"} 1' in text
+        assert 'video_fraud_stage_seconds_bucket{stage="parse",le="+Inf"} 1' in text
+        assert 'video_fraud_stage_seconds_sum{stage="parse"} 0.250000' in text
+        assert 'video_fraud_stage_seconds_count{stage="parse"} 1' in text
+
+    def test_json_export(self):
+        """Test that the JSON export round-trips."""
+        registry = MetricsRegistry()
+        registry.observe("request", 1.5)
+
+        assert json.loads(registry.to_json())["request"]["mean_s"] == 1.5
+
+
+class TestTimingScope:
+    """Tests for scopes, spans and model durations."""
+
+    def test_nested_scopes_roll_up(self):
+        """Test that inner timings count towards the enclosing scope."""
+        with timing_scope() as outer:
+            record("decode", 1.0)
+            with timing_scope() as inner:
+                record("decode", 2.0)
+
+        assert inner.as_dict() == {"decode": 2.0}
+        assert outer.as_dict() == {"decode": 3.0}
+        assert METRICS.to_dict()["decode"]["count"] == 2
+
+    def test_span_records_on_error(self):
+        """Test that a failing block is still timed."""
+        with timing_scope() as timings, pytest.raises(RuntimeError):
+            with span(REQUEST):
+                raise RuntimeError("down")
+
+        assert REQUEST in timings.as_dict()
+
+    def test_timed_iter_times_each_item(self):
+        """Test that producing each item is one observation."""
+        assert list(timed_iter(iter([1, 2, 3]), "decode")) == [1, 2, 3]
+        assert METRICS.to_dict()["decode"]["count"] == 3
+
+    def test_model_durations(self):
+        """Test that Ollama's nanosecond durations are recorded in seconds."""
+        with timing_scope() as timings:
+            record_model_durations({"response": "", **OLLAMA_STATS})
+
+        assert timings.as_dict() == {
+            "model_total": 2.0,
+            "model_load": 0.5,
+            "model_prompt_eval": 1.0,
+            "model_eval": 0.4,
+        }
+
+    def test_stream_final_line_durations(self):
+        """Test that the done line of a stream carries the durations."""
+        with timing_scope() as timings:
+            parse_ndjson_line(json.dumps({"done": True, **OLLAMA_STATS}))
+
+        assert timings.as_dict()["model_eval"] == 0.4
+
+
+class TestAgentTimings:
+    """Tests for timings attached to AnalysisResult."""
+
+    def test_frame_timings(self, llm_response):
+        """Test that a frame result carries its parse and frame stages."""
+        agent = VideoFraudDetectionAgent(verbose=False)
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()):
+            result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+
+        assert {PARSE, "frame"} <= set(result.timings)
+
+    @pytest.mark.parametrize("max_concurrency", [1, 3])
+    def test_video_timings_sum_frames(
+        self, sample_video, llm_response, max_concurrency
+    ):
+        """Test that video timings include extraction and every frame."""
+        agent = VideoFraudDetectionAgent(max_concurrency=max_concurrency, verbose=False)
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()):
+            result = agent.analyze_video(sample_video, sample_frames=3)
+        agent.close()
+
+        assert {"decode", "encode", "base64", "frame", "video"} <= set(result.timings)
+        assert METRICS.to_dict()["frame"]["count"] == 3
+        assert result.timings["video"] >= result.timings["decode"]
+
+    def test_async_video_timings(self, sample_video, llm_response):
+        """Test that the async path attaches the same stages."""
+        agent = VideoFraudDetectionAgent(max_concurrency=2, verbose=False)
+
+        async def respond(image_data, context, prompt=None, tier=None):
+            return llm_response()
+
+        with patch.object(agent, "_query_llm_async", side_effect=respond):
+            result = asyncio.run(agent.analyze_video_async(sample_video, 3))
+
+        assert {"decode", "frame", "video"} <= set(result.timings)
+        assert METRICS.to_dict()["frame"]["count"] == 3
+
+    def test_ollama_durations_reach_result(self, llm_response):
+        """Test that server-side durations from a response are attached."""
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host="http://ollama.test"), verbose=False
+        )
+        message = {"response": llm_response(), "done": True, **OLLAMA_STATS}
+
+        with patch.object(agent.ollama_client.session, "post") as post:
+            post.return_value.json.return_value = message
+            result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+
+        assert result.timings["model_prompt_eval"] == 1.0
+        assert REQUEST in result.timings
+
+
+def test_timings_serialized_and_ignored_in_equality():
+    """Test that timings round-trip but don't affect result equality."""
+    result = AnalysisResult(Verdict.AUTHENTIC, 0.9, "ok", [], [], {"parse": 0.1})
+
+    assert result_from_dict(result_to_dict(result)) == result
+    assert result == AnalysisResult(Verdict.AUTHENTIC, 0.9, "ok", [], [])
+    untimed = AnalysisResult(Verdict.AUTHENTIC, 0.9, "", [], [])
+    assert "timings" not in result_to_dict(untimed)
@@ -0,0 +1,252 @@
+"""Unit tests for multi-frame request packing."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.cache import VerdictCache
+from src.checkpoint import CheckpointStore
+from src.frame_prep import FramePrep
+from src.models import Frame, Verdict
+from src.packing import (
+    PACK_MOSAIC,
+    build_mosaic,
+    build_pack_prompt,
+    decode_image,
+    mosaic_grid,
+)
+from src.parsing import parse_multi_frame_response
+from src.providers import build_ollama_payload
+
+
+def _multi_response(verdicts: list[str], temporal: list[str] | None = None) -> str:
+    return json.dumps(
+        {
+            "frames": [
+                {"frame": i + 1, "verdict": v, "confidence": 80, "indicators": [v]}
+                for i, v in enumerate(verdicts)
+            ],
+            "temporal_indicators": temporal or [],
+        }
+    )
+
+
+def _frames(count: int) -> list[Frame]:
+    prep = FramePrep(max_side=None)
+    images = [np.full((24, 32, 3), i * 40, np.uint8) for i in range(count)]
+    return [
+        Frame(i, f"frame_{i:04d}.jpg", prep.encode(image))
+        for i, image in enumerate(images)
+    ]
+
+
+def _respond(image_data, context, prompt=None, tier=None):
+    """Answer a packed request with one AI_GENERATED verdict per frame."""
+    count = int(prompt.split("these ")[1].split(" ")[0])
+    return _multi_response(["AI_GENERATED"] * count)
+
+
+class TestParseMultiFrameResponse:
+    """Tests for parse_multi_frame_response."""
+
+    def test_per_frame_verdicts(self):
+        """Test that each frame gets its own verdict."""
+        results = parse_multi_frame_response(
+            _multi_response(["AI_GENERATED", "AUTHENTIC"]), 2
+        )
+
+        assert [r.verdict for r in results] == [Verdict.AI_GENERATED, Verdict.AUTHENTIC]
+        assert results[0].confidence == 0.8
+
+    def test_matches_by_frame_number(self):
+        """Test that entries are placed by their frame number."""
+        response = json.dumps(
+            {
+                "frames": [
+                    {"frame": 2, "verdict": "AUTHENTIC", "confidence": 70},
+                    {"frame": 1, "verdict": "AI_GENERATED", "confidence": 90},
+                ]
+            }
+        )
+
+        results = parse_multi_frame_response(response, 2)
+
+        assert [r.verdict for r in results] == [Verdict.AI_GENERATED, Verdict.AUTHENTIC]
+
+    def test_missing_frame_is_uncertain(self):
+        """Test that a frame the model skipped is UNCERTAIN at zero confidence."""
+        results = parse_multi_frame_response(_multi_response(["AUTHENTIC"]), 2)
+
+        assert results[1].verdict == Verdict.UNCERTAIN
+        assert results[1].confidence == 0.0
+
+    def test_temporal_indicators_added_to_every_frame(self):
+        """Test that group-level indicators reach each frame."""
+        response = _multi_response(["AI_GENERATED"] * 2, ["identity drift"])
+
+        results = parse_multi_frame_response(response, 2)
+
+        assert all("identity drift" in r.indicators for r in results)
+
+    def test_unparseable_response(self):
+        """Test that garbage yields one UNCERTAIN result per frame."""
+        results = parse_multi_frame_response("no json here", 3)
+
+        assert len(results) == 3
+        assert all(r.verdict == Verdict.UNCERTAIN for r in results)
+
+
+class TestMosaic:
+    """Tests for mosaic building."""
+
+    def test_grid(self):
+        """Test that the grid is as square as possible."""
+        assert mosaic_grid(1) == (1, 1)
+        assert mosaic_grid(3) == (2, 2)
+        assert mosaic_grid(6) == (2, 3)
+
+    def test_build_mosaic_tiles_frames(self):
+        """Test that frames are tiled row-major at the first frame's size."""
+        images = [np.full((20, 30, 3), v, np.uint8) for v in (50, 100, 150)]
+        images[2] = cv2.resize(images[2], (60, 40))
+
+        mosaic = build_mosaic(images)
+
+        assert mosaic.shape == (40, 60, 3)
+        assert mosaic[19, 59, 0] == 100  # bottom-right corner of tile 2
+        assert mosaic[39, 29, 0] == 150  # bottom-right corner of tile 3
+        assert mosaic[39, 59, 0] == 0  # unused cell
+
+    def test_decode_image_round_trip(self):
+        """Test that encoded frames decode back to arrays."""
+        frame = _frames(1)[0]
+
+        assert decode_image(frame.data).shape == (24, 32, 3)
+
+    def test_prompt_describes_layout(self):
+        """Test that the prompt names frames and the mosaic layout."""
+        prompt = build_pack_prompt(["a.jpg", "b.jpg", "c.jpg"], PACK_MOSAIC)
+
+        assert "these 3 video frames (a.jpg, b.jpg, c.jpg)" in prompt
+        assert "2x2 grid" in prompt
+
+
+class TestPackedPayload:
+    """Tests for packed Ollama payloads."""
+
+    def test_multiple_images_and_prompt(self):
+        """Test that a pack sends every image with the given prompt."""
+        payload = build_ollama_payload("llava", ["a", "b"], "", prompt="P")
+
+        assert payload["images"] == ["a", "b"]
+        assert payload["prompt"] == "P"
+
+    def test_single_image_unchanged(self):
+        """Test that single-frame payloads keep the analysis prompt."""
+        payload = build_ollama_payload("llava", "a", "frame.jpg")
+
+        assert payload["images"] == ["a"]
+        assert "frame.jpg" in payload["prompt"]
+
+
+class TestAgentPacking:
+    """Tests for packed analysis in VideoFraudDetectionAgent."""
+
+    def test_rejects_invalid_settings(self):
+        """Test that bad packing settings raise ValueError."""
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(frames_per_request=0)
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(packing="grid")
+
+    @pytest.mark.parametrize("max_concurrency", [1, 2])
+    def test_frames_are_packed(self, max_concurrency):
+        """Test that K frames share each request, results in frame order."""
+        agent = VideoFraudDetectionAgent(
+            max_concurrency=max_concurrency, frames_per_request=2, verbose=False
+        )
+
+        with patch.object(agent, "_query_llm", side_effect=_respond) as query:
+            result = agent.analyze_extracted_frames(_frames(5))
+        agent.close()
+
+        assert sorted(len(call.args[0]) for call in query.call_args_list) == [1, 2, 2]
+        assert result.verdict == Verdict.AI_GENERATED
+        assert "Analyzed 5 frames" in result.reasoning
+
+    def test_mosaic_sends_one_image(self):
+        """Test that mosaic packing tiles frames into a single image."""
+        agent = VideoFraudDetectionAgent(
+            frames_per_request=4, packing=PACK_MOSAIC, verbose=False
+        )
+
+        with patch.object(agent, "_query_llm", side_effect=_respond) as query:
+            agent.analyze_extracted_frames(_frames(4))
+
+        images = query.call_args.args[0]
+        assert len(images) == 1
+        assert decode_image(images[0]).shape == (48, 64, 3)
+
+    def test_failed_pack_marks_its_frames_uncertain(self):
+        """Test that a failing request records each of its frames as UNCERTAIN."""
+        agent = VideoFraudDetectionAgent(
+            max_concurrency=2, frames_per_request=2, verbose=False
+        )
+
+        with patch.object(agent, "_query_llm", side_effect=ConnectionError("down")):
+            result = agent.analyze_extracted_frames(_frames(4))
+        agent.close()
+
+        assert result.verdict == Verdict.UNCERTAIN
+        assert "Uncertain=4" in result.reasoning
+
+    def test_cached_frames_leave_the_pack(self, tmp_path):
+        """Test that only uncached frames are sent on a second run."""
+        cache = VerdictCache(tmp_path)
+        agent = VideoFraudDetectionAgent(
+            cache=cache, frames_per_request=3, verbose=False
+        )
+        frames = _frames(3)
+
+        with patch.object(agent, "_query_llm", side_effect=_respond):
+            agent.analyze_extracted_frames(frames[:2])
+        with patch.object(agent, "_query_llm", side_effect=_respond) as query:
+            agent.analyze_extracted_frames(frames)
+
+        assert [len(call.args[0]) for call in query.call_args_list] == [1]
+
+    def test_checkpointed_frames_leave_the_pack(self, tmp_path):
+        """Test that resumed packs only send missing frames."""
+        store = CheckpointStore(tmp_path, "run")
+        agent = VideoFraudDetectionAgent(frames_per_request=3, verbose=False)
+        frames = _frames(3)
+
+        with patch.object(agent, "_query_llm", side_effect=_respond):
+            agent.analyze_extracted_frames(frames[1:], store.for_video("v"))
+        with patch.object(agent, "_query_llm", side_effect=_respond) as query:
+            agent.analyze_extracted_frames(frames, store.for_video("v"))
+
+        assert [len(call.args[0]) for call in query.call_args_list] == [1]
+        assert store.frame_result("v", 0) is not None
+
+    def test_async_packing(self):
+        """Test that the async path packs frames too."""
+        agent = VideoFraudDetectionAgent(frames_per_request=2, verbose=False)
+
+        async def respond(image_data, context, prompt=None, tier=None):
+            return _respond(image_data, context, prompt)
+
+        with (
+            patch.object(agent, "_extract_frames", return_value=(_frames(4), None)),
+            patch.object(agent, "_query_llm_async", side_effect=respond) as query,
+            patch("pathlib.Path.exists", return_value=True),
+        ):
+            result = asyncio.run(agent.analyze_video_async("video.mp4"))
+
+        assert query.call_count == 2
+        assert result.verdict == Verdict.AI_GENERATED
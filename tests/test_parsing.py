@@ -0,0 +1,212 @@
+"""Unit tests for tolerant response parsing and structured output."""
+
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.models import Frame, Verdict
+from src.parsing import (
+    ANALYSIS_SCHEMA,
+    MULTI_FRAME_SCHEMA,
+    parse_llm_response,
+    parse_multi_frame_response,
+)
+from src.providers import OllamaClient
+
+
+class TestTolerantParsing:
+    """Tests for responses that are not clean JSON."""
+
+    def test_code_fence(self):
+        """Test that a fenced object is parsed despite braces after it."""
+        response = (
+            '```json\n{"verdict": "AI_GENERATED", "confidence": 80}\n```\n'
+            "Format used: {verdict, confidence}"
+        )
+
+        result = parse_llm_response(response)
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert result.confidence == 0.8
+
+    def test_trailing_commas(self):
+        """Test that commas before closing brackets are dropped."""
+        response = '{"verdict": "AUTHENTIC", "indicators": ["a", "b",], }'
+
+        result = parse_llm_response(response)
+
+        assert result.verdict == Verdict.AUTHENTIC
+        assert result.indicators == ["a", "b"]
+
+    def test_commas_inside_strings_kept(self):
+        """Test that string contents are never rewritten."""
+        response = '{"verdict": "AUTHENTIC", "reasoning": "a, ] b,}", "x": 1,}'
+
+        assert parse_llm_response(response).reasoning == "a, ] b,}"
+
+    def test_escaped_quotes_and_raw_newlines(self):
+        """Test escapes and unescaped control characters inside strings."""
+        response = '{"verdict": "AUTHENTIC", "reasoning": "a \\"}\\" b\nc"}'
+
+        assert parse_llm_response(response).reasoning == 'a "}" b\nc'
+
+    def test_brace_prose_before_object(self):
+        """Test that a non-JSON brace group before the object is skipped."""
+        response = 'Using {the format}: {"verdict": "AUTHENTIC", "confidence": 60}'
+
+        result = parse_llm_response(response)
+
+        assert result.verdict == Verdict.AUTHENTIC
+        assert result.confidence == 0.6
+
+    def test_truncated_object(self):
+        """Test that an object cut off mid-string keeps its fields."""
+        response = '{"verdict": "AI_GENERATED", "confidence": 90, "reasoning": "Ski'
+
+        result = parse_llm_response(response)
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert result.confidence == 0.9
+        assert result.reasoning == "Ski"
+
+    @pytest.mark.parametrize(
+        ("confidence", "expected"),
+        [
+            ("95%", 0.95),
+            ("95", 0.95),
+            (" 72.5 % ", 0.725),
+            (0.85, 0.85),
+            ("0.4", 0.4),
+            (1, 0.01),
+            (140, 1.0),
+            (-5, 0.0),
+            ("high", 0.5),
+            (None, 0.5),
+        ],
+    )
+    def test_confidence_normalized(self, confidence, expected):
+        """Test percentages, fractions, strings and out-of-range values."""
+        response = json.dumps({"verdict": "AUTHENTIC", "confidence": confidence})
+
+        assert parse_llm_response(response).confidence == pytest.approx(expected)
+
+    @pytest.mark.parametrize(
+        "verdict", ["ai_generated", "AI-Generated", "ai generated"]
+    )
+    def test_verdict_spelling(self, verdict):
+        """Test that verdicts are matched regardless of case and separators."""
+        response = json.dumps({"verdict": verdict, "confidence": 70})
+
+        assert parse_llm_response(response).verdict == Verdict.AI_GENERATED
+
+    def test_list_fields_coerced(self):
+        """Test that a bare string indicator becomes a one-item list."""
+        response = json.dumps(
+            {
+                "verdict": "AUTHENTIC",
+                "indicators": "sensor noise",
+                "recommendations": None,
+            }
+        )
+
+        result = parse_llm_response(response)
+
+        assert result.indicators == ["sensor noise"]
+        assert result.recommendations == []
+
+    def test_packed_frame_numbers_as_strings(self):
+        """Test that packed entries numbered with strings land in their slot."""
+        response = (
+            '```json\n{"frames": [{"frame": "2", "verdict": "AUTHENTIC"}, '
+            '{"frame": "1", "verdict": "AI_GENERATED", "confidence": "90%"},],}\n```'
+        )
+
+        first, second = parse_multi_frame_response(response, 2)
+
+        assert first.verdict == Verdict.AI_GENERATED
+        assert first.confidence == 0.9
+        assert second.verdict == Verdict.AUTHENTIC
+
+
+class TestResponseSchema:
+    """Tests for the JSON schemas derived from AnalysisResult."""
+
+    def test_fields_in_result_order(self):
+        """Test that the schema lists the model-filled fields in order."""
+        assert list(ANALYSIS_SCHEMA["properties"]) == [
+            "verdict",
+            "confidence",
+            "reasoning",
+            "indicators",
+            "recommendations",
+        ]
+        assert ANALYSIS_SCHEMA["required"] == list(ANALYSIS_SCHEMA["properties"])
+
+    def test_field_types(self):
+        """Test the verdict enum and the percentage confidence."""
+        properties = ANALYSIS_SCHEMA["properties"]
+
+        assert properties["verdict"]["enum"] == [v.name for v in Verdict]
+        assert properties["confidence"]["maximum"] == 100
+        assert properties["indicators"]["items"] == {"type": "string"}
+
+    def test_multi_frame_schema(self):
+        """Test that packed entries carry a frame number and every field."""
+        entry = MULTI_FRAME_SCHEMA["properties"]["frames"]["items"]
+
+        assert entry["required"] == ["frame", *ANALYSIS_SCHEMA["required"]]
+
+
+class TestStructuredOutput:
+    """Tests for agents sending the schema as Ollama's format."""
+
+    def _agent(self, server, **kwargs):
+        return VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=server.url),
+            structured_output=True,
+            verbose=False,
+            **kwargs,
+        )
+
+    def test_single_frame_schema(self):
+        """Test that single-frame requests carry the verdict schema."""
+        with FakeOllamaServer() as server:
+            agent = self._agent(server)
+            result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+            agent.close()
+
+        assert server.formats == [ANALYSIS_SCHEMA]
+        assert result.verdict == Verdict.AI_GENERATED
+
+    def test_packed_schema(self, sample_video):
+        """Test that packed requests carry the multi-frame schema."""
+        with FakeOllamaServer() as server:
+            agent = self._agent(server, frames_per_request=3)
+            agent.analyze_video(sample_video, sample_frames=3)
+            agent.close()
+
+        assert server.formats == [MULTI_FRAME_SCHEMA]
+
+    def test_async_stream_schema(self):
+        """Test that the async streaming path sends the schema too."""
+        with FakeOllamaServer() as server:
+            agent = self._agent(server, stream_responses=True)
+            frame = Frame(0, "frame_0000.jpg", "aW1n")
+            asyncio.run(agent.analyze_frame_async(frame))
+            agent.close()
+
+        assert server.formats == [ANALYSIS_SCHEMA]
+
+    def test_off_by_default(self):
+        """Test that no format is sent unless structured output is on."""
+        with FakeOllamaServer() as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url), verbose=False
+            )
+            agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+            agent.close()
+
+        assert server.formats == [None]
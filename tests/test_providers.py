@@ -0,0 +1,416 @@
+"""Unit tests for the LLM provider layer."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.balancer import CircuitOpenError, EndpointPool
+from src.models import Frame, Verdict
+from src.providers import (
+    OllamaClient,
+    RetryPolicy,
+    build_ollama_payload,
+    is_retryable,
+    parse_keep_alive,
+)
+
+FAST_RETRY = RetryPolicy(attempts=3, base_delay=0.01)
+
+
+class _GenerateHandler(BaseHTTPRequestHandler):
+    """Minimal /api/generate handler recording client ports."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.ports.add(self.client_address[1])
+        self.server.models.append(body["model"])
+        payload = json.dumps({"response": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_server():
+    """Run a local stub Ollama server and return its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GenerateHandler)
+    server.ports = set()
+    server.models = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestBuildOllamaPayload:
+    """Tests for build_ollama_payload."""
+
+    def test_payload_fields(self):
+        """Test that the payload carries model, image and prompt."""
+        payload = build_ollama_payload("llava", "aW1n", "frame_0001.jpg")
+
+        assert payload["model"] == "llava"
+        assert payload["images"] == ["aW1n"]
+        assert payload["stream"] is False
+        assert "frame_0001.jpg" in payload["prompt"]
+        assert "keep_alive" not in payload
+
+    def test_keep_alive(self):
+        """Test that keep_alive is sent when configured."""
+        payload = build_ollama_payload("llava", "aW1n", "", keep_alive="30m")
+
+        assert payload["keep_alive"] == "30m"
+
+    def test_response_format(self):
+        """Test that a response format is sent as Ollama's format."""
+        schema = {"type": "object"}
+
+        payload = build_ollama_payload("llava", "aW1n", "", response_format=schema)
+
+        assert payload["format"] == schema
+        assert "format" not in build_ollama_payload("llava", "aW1n", "")
+
+    @pytest.mark.parametrize(
+        ("value", "expected"), [("30m", "30m"), ("600", 600), ("-1", -1)]
+    )
+    def test_parse_keep_alive(self, value, expected):
+        """Test that bare numbers become seconds and durations pass through."""
+        assert parse_keep_alive(value) == expected
+
+
+class TestOllamaClient:
+    """Tests for the pooled OllamaClient."""
+
+    def test_host_read_once(self, monkeypatch):
+        """Test that OLLAMA_HOST is read at construction time."""
+        monkeypatch.setenv("OLLAMA_HOST", "http://first:11434")
+        client = OllamaClient()
+        monkeypatch.setenv("OLLAMA_HOST", "http://second:11434")
+
+        assert client.host == "http://first:11434"
+
+    def test_reuses_connection(self, ollama_server):
+        """Test that sequential requests reuse one TCP connection."""
+        client = OllamaClient(host=_url(ollama_server))
+
+        for _ in range(5):
+            assert client.generate("llava", "aW1n", "ctx") == "ok"
+        client.close()
+
+        assert len(ollama_server.ports) == 1
+
+    def test_keep_alive_disabled(self, ollama_server):
+        """Test that keep_alive=False opens a connection per request."""
+        client = OllamaClient(host=_url(ollama_server), keep_alive=False)
+
+        for _ in range(3):
+            client.generate("llava", "aW1n", "ctx")
+        client.close()
+
+        assert len(ollama_server.ports) == 3
+
+    def test_session_is_shared(self):
+        """Test that the lazily created session is reused."""
+        client = OllamaClient(pool_size=4)
+
+        assert client.session is client.session
+        adapter = client.session.get_adapter("http://localhost")
+        assert adapter._pool_maxsize == 4
+        client.close()
+        assert client._session is None
+
+
+class TestAgentProviderClient:
+    """Tests for the agent-owned provider client."""
+
+    def test_pool_covers_concurrency(self):
+        """Test that the default pool is at least max_concurrency."""
+        agent = VideoFraudDetectionAgent(max_concurrency=32)
+
+        assert agent.ollama_client.pool_size == 32
+
+    def test_query_llm_uses_client(self, ollama_server):
+        """Test that every agent query goes through its client."""
+        client = OllamaClient(host=_url(ollama_server))
+        agent = VideoFraudDetectionAgent(model_name="moondream", ollama_client=client)
+
+        with patch("requests.post") as post:
+            agent._query_llm("aW1n", "a")
+            agent._query_llm("aW1n", "b")
+        agent.close()
+
+        post.assert_not_called()
+        assert ollama_server.models == ["moondream", "moondream"]
+        assert len(ollama_server.ports) == 1
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    return requests.HTTPError(response=MagicMock(status_code=status))
+
+
+def _ok_response(text: str = "ok") -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = {"response": text}
+    return response
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy and is_retryable."""
+
+    def test_backoff_is_bounded_full_jitter(self):
+        """Test that delays stay within the exponential cap."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+
+        delays = [policy.backoff(retry) for retry in (0, 1, 5) for _ in range(50)]
+
+        assert all(0 <= d <= 0.5 for d in delays[:50])
+        assert all(0 <= d <= 1.0 for d in delays[50:100])
+        assert all(0 <= d <= 2.0 for d in delays[100:])
+        assert len(set(delays)) > 1
+
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (_http_error(503), True),
+            (_http_error(429), True),
+            (_http_error(404), False),
+            (_http_error(400), False),
+            (requests.ConnectionError("refused"), True),
+            (requests.Timeout("slow"), True),
+            (CircuitOpenError("open"), True),
+            (ValueError("bad"), False),
+        ],
+    )
+    def test_is_retryable(self, error, expected):
+        """Test which failures are worth another attempt."""
+        assert is_retryable(error) is expected
+
+    def test_no_delay_after_last_attempt(self):
+        """Test that the last attempt and permanent errors are not retried."""
+        policy = RetryPolicy(attempts=2)
+        error = requests.ConnectionError()
+
+        assert policy.delay_after(error, 0) is not None
+        assert policy.delay_after(error, 1) is None
+        assert policy.delay_after(_http_error(404), 0) is None
+
+    def test_invalid_attempts(self):
+        """Test that zero attempts is rejected."""
+        with pytest.raises(ValueError):
+            RetryPolicy(attempts=0)
+
+
+class TestClientRetries:
+    """Tests for retries in OllamaClient."""
+
+    def test_transient_failure_is_retried(self):
+        """Test that a dropped connection and a 503 are retried."""
+        client = OllamaClient(host="http://ollama.test", retry=FAST_RETRY)
+        failing = MagicMock()
+        failing.raise_for_status.side_effect = _http_error(503)
+
+        with patch.object(client.session, "post") as post:
+            post.side_effect = [requests.ConnectionError(), failing, _ok_response()]
+            assert client.generate("llava", "aW1n", "ctx") == "ok"
+
+        assert post.call_count == 3
+        assert client.retries == 2
+
+    def test_permanent_failure_is_not_retried(self):
+        """Test that a 404 (e.g. missing model) fails at once."""
+        client = OllamaClient(host="http://ollama.test", retry=FAST_RETRY)
+        missing = MagicMock()
+        missing.raise_for_status.side_effect = _http_error(404)
+
+        with patch.object(client.session, "post", return_value=missing) as post:
+            with pytest.raises(requests.HTTPError):
+                client.generate("llava", "aW1n", "ctx")
+
+        assert post.call_count == 1
+
+    def test_gives_up_after_attempts(self):
+        """Test that the last error is raised once attempts run out."""
+        client = OllamaClient(host="http://ollama.test", retry=FAST_RETRY)
+
+        with patch.object(client.session, "post") as post:
+            post.side_effect = requests.ConnectionError("refused")
+            with pytest.raises(requests.ConnectionError):
+                client.generate("llava", "aW1n", "ctx")
+
+        assert post.call_count == 3
+
+    def test_stream_retried_before_first_chunk(self):
+        """Test that a stream failing before any text is sent again."""
+        with FakeOllamaServer(latency=0.0, error_rate=1.0) as server:
+            endpoints = EndpointPool([server.url], max_failures=10)
+            client = OllamaClient(endpoints=endpoints, retry=FAST_RETRY)
+            with pytest.raises(requests.HTTPError):
+                list(client.stream("llava", "aW1n", "ctx"))
+            server.error_rate = 0.0
+            text = "".join(client.stream("llava", "aW1n", "ctx"))
+            client.close()
+
+        assert server.requests == 4
+        assert json.loads(text)["verdict"] == "AI_GENERATED"
+
+
+class TestCircuitBreaker:
+    """Tests for requests while the endpoints' circuits are open."""
+
+    def test_dead_host_spends_every_attempt(self):
+        """Test that frames wait out ejections instead of failing unsent."""
+        endpoints = EndpointPool(
+            ["http://127.0.0.1:9"], max_failures=3, ejection_seconds=0.01
+        )
+        client = OllamaClient(endpoints=endpoints, retry=FAST_RETRY)
+        agent = VideoFraudDetectionAgent(ollama_client=client, verbose=False)
+        frames = [Frame(i, f"frame_{i:04d}.jpg", "aW1n") for i in range(5)]
+
+        result = agent.analyze_extracted_frames(frames)
+        agent.close()
+
+        assert result.verdict == Verdict.UNCERTAIN
+        assert "Uncertain=5" in result.reasoning
+        assert endpoints.stats()[0]["requests"] == 15
+
+    def test_frames_wait_for_probation(self):
+        """Test that frames after an ejection are sent once it ends."""
+        with FakeOllamaServer(latency=0.0, error_rate=1.0) as server:
+            endpoints = EndpointPool([server.url], ejection_seconds=0.2)
+            client = OllamaClient(endpoints=endpoints, retry=FAST_RETRY)
+            agent = VideoFraudDetectionAgent(ollama_client=client, verbose=False)
+            frame = Frame(0, "frame_0000.jpg", "aW1n")
+            with pytest.raises(requests.HTTPError):
+                agent.analyze_frame(frame)
+            server.error_rate = 0.0
+
+            start = time.perf_counter()
+            results = [agent.analyze_frame(frame) for _ in range(3)]
+            elapsed = time.perf_counter() - start
+            agent.close()
+
+        assert all(result.confidence > 0 for result in results)
+        assert endpoints.stats()[0]["ejections"] == 1
+        assert elapsed >= 0.15
+
+    def test_circuit_wait_spends_no_attempt(self):
+        """Test that an open circuit is waited out, however many attempts."""
+        policy = RetryPolicy(attempts=1, base_delay=0.01)
+
+        assert policy.delay_after(CircuitOpenError("open", 2.0), 0) == 2.0
+        assert 0 <= policy.delay_after(CircuitOpenError("open"), 0) <= 0.01
+
+    def test_missing_model_keeps_host(self, sample_video):
+        """Test that 404s for one agent don't eject the host for others."""
+        with FakeOllamaServer(latency=0.0) as server:
+            endpoints = EndpointPool([server.url])
+            clients = [OllamaClient(endpoints=endpoints, retry=FAST_RETRY)] * 2
+            missing, valid = (
+                VideoFraudDetectionAgent(
+                    model_name=name, ollama_client=client, verbose=False
+                )
+                for name, client in zip(("nope", "llava"), clients)
+            )
+            for _ in range(2):
+                missing.analyze_video(sample_video, sample_frames=3)
+            result = valid.analyze_video(sample_video, sample_frames=3)
+            missing.close()
+            valid.close()
+
+        assert endpoints.stats()[0]["ejections"] == 0
+        assert "Uncertain=0" in result.reasoning
+
+
+class TestHedging:
+    """Tests for hedged requests."""
+
+    @pytest.fixture
+    def slow_and_fast(self):
+        """Run one slow and one fast fake server."""
+        with (
+            FakeOllamaServer(latency=0.5) as slow,
+            FakeOllamaServer(latency=0.01) as fast,
+        ):
+            yield slow, fast
+
+    def _client(self, servers, cls=OllamaClient, **kwargs):
+        endpoints = EndpointPool([server.url for server in servers])
+        client = cls(endpoints=endpoints, hedge_percentile=95, **kwargs)
+        for _ in range(20):
+            client.latencies.add(0.05)
+        return client
+
+    def test_no_hedging_without_history(self):
+        """Test that hedging waits for enough latency samples."""
+        client = OllamaClient(host="http://ollama.test", hedge_percentile=95)
+
+        assert client.hedge_delay() is None
+        for _ in range(20):
+            client.latencies.add(0.2)
+        assert client.hedge_delay() == 0.2
+
+    def test_slow_request_is_hedged(self, slow_and_fast):
+        """Test that the duplicate on the fast host answers first."""
+        slow, fast = slow_and_fast
+        client = self._client(slow_and_fast)
+
+        start = time.perf_counter()
+        client.generate("llava", "aW1n", "ctx")
+        elapsed = time.perf_counter() - start
+        client.close()
+
+        assert elapsed < 0.3
+        assert client.hedges == 1
+        assert (slow.requests, fast.requests) == (1, 1)
+
+    def test_fast_request_is_not_hedged(self, slow_and_fast):
+        """Test that requests answered within the delay are sent once."""
+        slow, fast = slow_and_fast
+        client = self._client([fast, slow])
+
+        client.generate("llava", "aW1n", "ctx")
+        client.close()
+
+        assert client.hedges == 0
+        assert slow.requests == 0
+
+    def test_async_loser_is_cancelled(self, slow_and_fast):
+        """Test that the async path cancels the slower request."""
+        from src.async_providers import AsyncOllamaClient
+
+        pytest.importorskip("httpx")
+        client = self._client(slow_and_fast, AsyncOllamaClient)
+
+        async def run():
+            try:
+                return await client.generate("llava", "aW1n", "ctx")
+            finally:
+                await client.aclose()
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.3
+        assert client.hedges == 1
+        assert [e["outstanding"] for e in client.endpoints.stats()] == [0, 0]
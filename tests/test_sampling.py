@@ -0,0 +1,95 @@
+"""Unit tests for scene-change-aware frame sampling."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.frame_reader import read_frames
+from src.sampling import (
+    SCENE,
+    allocate_samples,
+    detect_shot_boundaries,
+    score_frames,
+    select_scene_indices,
+)
+
+
+@pytest.fixture
+def two_scene_video(tmp_path):
+    """Write a video with a long static shot then a short busy shot."""
+    path = tmp_path / "scenes.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for _ in range(40):
+        writer.write(np.full((48, 64, 3), 30, dtype=np.uint8))
+    for i in range(10):
+        frame = np.full((48, 64, 3), 220, dtype=np.uint8)
+        cv2.rectangle(frame, (i * 5, 10), (i * 5 + 12, 30), (0, 0, 0), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class TestDetectShotBoundaries:
+    """Tests for detect_shot_boundaries."""
+
+    def test_cuts_above_threshold(self):
+        """Test that large histogram jumps start new scenes."""
+        hist_dist = np.array([0.0, 0.05, 0.9, 0.1, 0.6])
+
+        assert detect_shot_boundaries(hist_dist, threshold=0.4) == [0, 2, 4]
+
+
+class TestAllocateSamples:
+    """Tests for allocate_samples."""
+
+    def test_every_scene_sampled(self):
+        """Test that a short scene still receives a sample."""
+        motion = np.zeros(100)
+
+        indices = allocate_samples([0, 95], motion, budget=4)
+
+        assert len(indices) == 4
+        assert any(i >= 95 for i in indices)
+
+    def test_motion_attracts_samples(self):
+        """Test that high-motion stretches get denser sampling."""
+        motion = np.zeros(100)
+        motion[80:90] = 1.0
+
+        indices = allocate_samples([0], motion, budget=6)
+
+        assert sum(80 <= i < 90 for i in indices) >= 4
+
+    def test_budget_exceeds_frames(self):
+        """Test that every frame is returned when budget is large."""
+        assert allocate_samples([0], np.zeros(3), budget=10) == [0, 1, 2]
+
+
+class TestSceneSampling:
+    """Tests for end-to-end scene sampling."""
+
+    def test_score_frames_finds_cut(self, two_scene_video):
+        """Test the one-pass scorer flags the shot boundary."""
+        motion, hist_dist = score_frames(two_scene_video)
+
+        assert len(motion) == 50
+        assert detect_shot_boundaries(hist_dist) == [0, 40]
+
+    def test_short_scene_covered(self, two_scene_video):
+        """Test that scene sampling covers the short busy shot."""
+        indices = select_scene_indices(two_scene_video, 4)
+
+        assert len(indices) == 4
+        assert sum(i >= 40 for i in indices) >= 2
+
+    def test_read_frames_scene_mode(self, two_scene_video):
+        """Test that read_frames decodes the scene-selected frames."""
+        frames = list(read_frames(two_scene_video, 4, sampling=SCENE))
+
+        assert [i for i, _ in frames] == select_scene_indices(two_scene_video, 4)
+
+    def test_unknown_sampling_mode(self):
+        """Test that the agent rejects unknown sampling modes."""
+        with pytest.raises(ValueError):
+            VideoFraudDetectionAgent(sampling="random")
@@ -0,0 +1,208 @@
+"""Unit tests for the analysis service and its job queue."""
+
+import json
+import queue
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.providers import OllamaClient
+from src.service import DONE, FAILED, AnalysisService, ServiceServer
+
+
+@pytest.fixture
+def model_server():
+    """Run a fake Ollama server answering after a short delay."""
+    with FakeOllamaServer(latency=0.02) as server:
+        yield server
+
+
+def _start(model_server, workers=1, queue_size=4):
+    agent = VideoFraudDetectionAgent(
+        ollama_client=OllamaClient(host=model_server.url), verbose=False
+    )
+    service = AnalysisService(agent, workers, queue_size, sample_frames=2)
+    server = ServiceServer(service, port=0)
+    service.start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return agent, service, server
+
+
+@pytest.fixture
+def service_server(model_server):
+    """Run the service against the fake model server."""
+    agent, service, server = _start(model_server)
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.stop()
+    agent.close()
+
+
+def _submit(server, video, frames=None):
+    return requests.post(
+        f"{server.url}/jobs", json={"video": str(video), "frames": frames}, timeout=5
+    )
+
+
+class TestServiceApi:
+    """Tests for the HTTP API."""
+
+    def test_submit_and_wait(self, service_server, sample_video, model_server):
+        """Test that a submitted path is analyzed and long-polled to completion."""
+        response = _submit(service_server, sample_video, frames=3)
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        job = requests.get(
+            f"{service_server.url}/jobs/{job_id}?wait=10", timeout=15
+        ).json()
+
+        assert job["status"] == DONE
+        assert job["result"]["verdict"] in ("ai_generated", "authentic")
+        assert "video" in job["result"]["timings"]
+        assert model_server.requests == 3
+
+    def test_upload_bytes(self, service_server, sample_video):
+        """Test that raw video bytes are analyzed and the temp file removed."""
+        response = requests.post(
+            f"{service_server.url}/jobs?frames=2",
+            data=sample_video.read_bytes(),
+            headers={"Content-Type": "application/octet-stream"},
+            timeout=5,
+        )
+        job_id = response.json()["id"]
+        job = service_server.service.get(job_id)
+
+        done = requests.get(
+            f"{service_server.url}/jobs/{job_id}?wait=10", timeout=15
+        ).json()
+
+        assert done["status"] == DONE
+        assert done["video"] is None
+        assert not job.video.exists()
+
+    def test_event_stream(self, service_server, sample_video):
+        """Test that the NDJSON stream ends with the finished job."""
+        job_id = _submit(service_server, sample_video).json()["id"]
+
+        with requests.get(
+            f"{service_server.url}/jobs/{job_id}/events", stream=True, timeout=15
+        ) as response:
+            events = [json.loads(line) for line in response.iter_lines() if line]
+
+        assert events[-1]["status"] == DONE
+        assert "result" in events[-1]
+
+    def test_errors(self, service_server, tmp_path):
+        """Test the 400 and 404 responses."""
+        url = service_server.url
+
+        assert _submit(service_server, tmp_path / "missing.mp4").status_code == 404
+        assert requests.get(f"{url}/jobs/nope", timeout=5).status_code == 404
+        bad = requests.post(f"{url}/jobs", json={"frames": 2}, timeout=5)
+        assert bad.status_code == 400
+
+    @pytest.mark.parametrize("wait", ["abc", "-1", "nan"])
+    def test_invalid_wait(self, service_server, sample_video, wait):
+        """Test that a malformed, negative or NaN wait gets a 400."""
+        job_id = _submit(service_server, sample_video).json()["id"]
+
+        response = requests.get(
+            f"{service_server.url}/jobs/{job_id}?wait={wait}", timeout=5
+        )
+
+        assert response.status_code == 400
+
+    def test_metrics_and_health(self, service_server, sample_video):
+        """Test that queue gauges and stage histograms are exposed."""
+        job_id = _submit(service_server, sample_video).json()["id"]
+        requests.get(f"{service_server.url}/jobs/{job_id}?wait=10", timeout=15)
+
+        metrics = requests.get(f"{service_server.url}/metrics", timeout=5).text
+        health = requests.get(f"{service_server.url}/health", timeout=5).json()
+
+        assert "video_fraud_queue_depth 0" in metrics
+        assert "video_fraud_jobs_in_flight 0" in metrics
+        assert 'video_fraud_jobs_total{outcome="completed"} 1' in metrics
+        assert 'video_fraud_stage_seconds_count{stage="video"}' in metrics
+        assert health["status"] == "ok"
+
+
+class TestBackpressure:
+    """Tests for queue saturation."""
+
+    def test_saturated_queue_returns_429(self, sample_video):
+        """Test that submissions beyond the queue are rejected, not buffered."""
+        with FakeOllamaServer(latency=0.3) as model_server:
+            agent, service, server = _start(model_server, workers=1, queue_size=1)
+            try:
+                codes = [_submit(server, sample_video, 1).status_code for _ in range(4)]
+                stats = service.stats()
+            finally:
+                server.shutdown()
+                server.server_close()
+                service.stop()
+                agent.close()
+
+        assert codes[0] == 202
+        assert 429 in codes
+        assert stats["rejected"] == codes.count(429)
+        assert stats["queue_depth"] <= 1
+
+    def test_queue_fills_after_check(self, sample_video):
+        """Test a 429 when the queue fills between the check and submit."""
+        service = AnalysisService(VideoFraudDetectionAgent(), queue_size=1)
+        service.submit(sample_video)
+        server = ServiceServer(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with patch.object(service, "is_full", return_value=False):
+                response = _submit(server, sample_video)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.stop()
+
+        assert response.status_code == 429
+        assert service.rejected == 1
+
+    def test_submit_raises_when_full(self, sample_video):
+        """Test that the service itself raises queue.Full."""
+        service = AnalysisService(VideoFraudDetectionAgent(), queue_size=1)
+
+        service.submit(sample_video)
+        with pytest.raises(queue.Full):
+            service.submit(sample_video)
+
+        assert service.rejected == 1
+
+    def test_stop_fails_queued_jobs(self, sample_video):
+        """Test that jobs never started are marked failed on shutdown."""
+        service = AnalysisService(VideoFraudDetectionAgent(), queue_size=2)
+        job = service.submit(sample_video)
+
+        service.stop()
+
+        assert job.status == FAILED
+        assert service.failed == 1
+
+    def test_finished_jobs_are_evicted(self, sample_video, model_server):
+        """Test that only max_jobs finished jobs are kept."""
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=model_server.url), verbose=False
+        )
+        service = AnalysisService(agent, workers=1, queue_size=4, max_jobs=1)
+        service.start()
+        jobs = [service.submit(sample_video, 1) for _ in range(2)]
+        for job in jobs:
+            while job.status not in (DONE, FAILED):
+                service.wait(job, job.version, 5)
+        service.stop()
+
+        assert service.get(jobs[0].id) is None
+        assert service.get(jobs[1].id) is jobs[1]
@@ -0,0 +1,261 @@
+"""Unit tests for streaming responses and incremental JSON parsing."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.cache import VerdictCache
+from src.models import Frame, Verdict
+from src.providers import OllamaClient
+from src.streaming import (
+    VERDICT_FIELDS,
+    IncrementalJSONParser,
+    aread_streamed_json,
+    iter_ndjson_responses,
+    read_streamed_json,
+)
+
+RESPONSE = (
+    'Here is my analysis:\n```json\n{"verdict": "AI_GENERATED", "confidence": 92, '
+    '"reasoning": "Skin is \\"waxy\\" {smooth}", '
+    '"indicators": ["waxy skin", {"region": [1, 2]}], "recommendations": []}\n```'
+)
+
+
+def _feed_by_char(text: str) -> IncrementalJSONParser:
+    parser = IncrementalJSONParser()
+    for char in text:
+        parser.feed(char)
+    return parser
+
+
+class TestIncrementalJSONParser:
+    """Tests for IncrementalJSONParser."""
+
+    def test_parses_fields_split_across_chunks(self):
+        """Test that every top-level field decodes from single characters."""
+        parser = _feed_by_char(RESPONSE)
+
+        assert parser.done
+        assert parser.fields == json.loads(RESPONSE[RESPONSE.index("{") : -4])
+
+    def test_fields_available_before_object_ends(self):
+        """Test that the verdict is known before the reasoning arrives."""
+        parser = IncrementalJSONParser()
+
+        parser.feed('{"verdict": "AUTHENTIC", "confidence": 71, "reasoning": "The')
+
+        assert parser.has(VERDICT_FIELDS)
+        assert parser.fields == {"verdict": "AUTHENTIC", "confidence": 71}
+        assert not parser.done
+
+    def test_number_waits_for_delimiter(self):
+        """Test that a number is not reported until it can't grow."""
+        parser = IncrementalJSONParser()
+
+        parser.feed('{"confidence": 9')
+        assert "confidence" not in parser.fields
+        parser.feed("5}")
+
+        assert parser.fields == {"confidence": 95}
+
+    def test_on_field_callback(self):
+        """Test that fields are reported in completion order."""
+        seen = []
+        parser = IncrementalJSONParser(lambda name, value: seen.append(name))
+
+        parser.feed(RESPONSE)
+
+        assert seen[:2] == ["verdict", "confidence"]
+
+    def test_invalid_value_is_skipped(self):
+        """Test that undecodable values are left out."""
+        parser = IncrementalJSONParser()
+
+        parser.feed('{"confidence": 9x, "verdict": "UNCERTAIN"}')
+
+        assert parser.fields == {"verdict": "UNCERTAIN"}
+
+
+class TestReadStreamedJson:
+    """Tests for read_streamed_json and NDJSON decoding."""
+
+    def test_ndjson_chunks(self):
+        """Test that response chunks are yielded until done."""
+        lines = [
+            b'{"response": "{\\"ver", "done": false}',
+            b"",
+            b'{"response": "dict\\": 1}", "done": false}',
+            b'{"response": "", "done": true}',
+            b'{"response": "ignored", "done": false}',
+        ]
+
+        assert list(iter_ndjson_responses(lines)) == ['{"ver', 'dict": 1}']
+
+    def test_ndjson_error(self):
+        """Test that a mid-stream error raises."""
+        with pytest.raises(RuntimeError, match="model not found"):
+            list(iter_ndjson_responses([b'{"error": "model not found"}']))
+
+    def test_full_read(self):
+        """Test that without stop fields the whole text is returned."""
+        assert read_streamed_json(iter([RESPONSE[:40], RESPONSE[40:]])) == RESPONSE
+
+    def test_stops_and_closes_stream(self):
+        """Test that reading stops once the fields arrive and closes the stream."""
+        consumed = []
+
+        def chunks():
+            for char in RESPONSE:
+                consumed.append(char)
+                yield char
+
+        stream = chunks()
+        text = read_streamed_json(stream, VERDICT_FIELDS)
+
+        assert json.loads(text) == {"verdict": "AI_GENERATED", "confidence": 92}
+        assert len(consumed) < len(RESPONSE)
+        assert stream.gi_frame is None  # generator was closed
+
+    def test_async_read(self):
+        """Test the async reader with cancellation."""
+
+        async def chunks():
+            for char in RESPONSE:
+                yield char
+
+        text = asyncio.run(aread_streamed_json(chunks(), VERDICT_FIELDS))
+
+        assert json.loads(text)["confidence"] == 92
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    """Stub /api/generate streaming one character per NDJSON line."""
+
+    protocol_version = "HTTP/1.0"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for char in RESPONSE + " " * 200:
+                line = {"response": char, "done": False}
+                self.wfile.write(json.dumps(line).encode() + b"\n")
+                self.wfile.flush()
+                time.sleep(0.002)
+            self.wfile.write(b'{"response": "", "done": true}\n')
+            self.server.completed += 1
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def streaming_server():
+    """Run a local stub Ollama server that streams its response."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+    server.payloads = []
+    server.completed = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class TestStreamingClient:
+    """Tests for OllamaClient.stream against a stub server."""
+
+    def test_stream_requests_ndjson(self, streaming_server):
+        """Test that the full stream is read with stream=True in the payload."""
+        client = OllamaClient(host=_url(streaming_server))
+
+        text = "".join(client.stream("llava", "aW1n", "frame.jpg"))
+
+        assert text.startswith(RESPONSE)
+        assert streaming_server.payloads[0]["stream"] is True
+
+    def test_cancel_after_verdict(self, streaming_server):
+        """Test that the agent stops generation once the verdict is parsed."""
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=_url(streaming_server)),
+            cancel_after_verdict=True,
+        )
+
+        start = time.perf_counter()
+        result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+        elapsed = time.perf_counter() - start
+        agent.close()
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert result.confidence == 0.92
+        assert result.indicators == []
+        # The full stream takes over a second; the verdict arrives early
+        assert elapsed < 0.6
+        assert streaming_server.completed == 0
+
+    def test_packed_requests_are_not_cancelled(self):
+        """Test that packed prompts read their whole stream."""
+        agent = VideoFraudDetectionAgent(cancel_after_verdict=True)
+
+        assert agent._stop_fields("packed prompt") is None
+        assert agent._stop_fields(None) == VERDICT_FIELDS
+
+    def test_verdict_only_results_cached_apart(self, tmp_path):
+        """Test that verdict-only results don't answer full-response lookups."""
+        cache = VerdictCache(tmp_path)
+        full = VideoFraudDetectionAgent(cache=cache)
+        verdict_only = VideoFraudDetectionAgent(cache=cache, cancel_after_verdict=True)
+
+        assert full._cache_key("aW1n") != verdict_only._cache_key("aW1n")
+
+    def test_streaming_used_when_enabled(self):
+        """Test that stream_responses routes queries through the stream."""
+        agent = VideoFraudDetectionAgent(stream_responses=True)
+
+        with patch.object(
+            agent.ollama_client, "stream", return_value=iter([RESPONSE])
+        ) as stream:
+            result = agent._analyze_image("aW1n", "frame.jpg")
+
+        stream.assert_called_once()
+        assert result.indicators[0] == "waxy skin"
+
+    def test_async_stream(self):
+        """Test that the async client yields NDJSON response chunks."""
+        httpx = pytest.importorskip("httpx")
+        from src.async_providers import AsyncOllamaClient
+
+        body = b'{"response": "{\\"a\\": 1}", "done": false}\n{"done": true}\n'
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content=body)
+
+        async def run():
+            client = AsyncOllamaClient(host="http://ollama.test")
+            client._client = httpx.AsyncClient(
+                base_url=client.host, transport=httpx.MockTransport(handler)
+            )
+            client._loop = asyncio.get_running_loop()
+            try:
+                return [c async for c in client.stream("llava", "aW1n", "f.jpg")]
+            finally:
+                await client.aclose()
+
+        assert asyncio.run(run()) == ['{"a": 1}']
@@ -0,0 +1,246 @@
+"""Unit tests for the streaming temporal analyzer."""
+
+import asyncio
+import io
+import json
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.batch import run_batch
+from src.models import AnalysisResult, Verdict, result_from_dict, result_to_dict
+from src.providers import OllamaClient
+from src.temporal import (
+    SIGNALS,
+    TemporalAnalyzer,
+    analyze_temporal,
+    attach_report,
+)
+
+FPS = 10.0
+
+
+def _texture(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (120, 200, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 2)
+
+
+def _pan(count: int, glitch: range = range(0), seed: int = 0) -> list[np.ndarray]:
+    """A texture panning 1 px per frame, partly regenerated during ``glitch``."""
+    texture = _texture(seed)
+    frames = [np.roll(texture, i, axis=1) for i in range(count)]
+    for i in glitch:
+        frames[i] = _texture(seed + 100 + i) // 4 + frames[i] // 4 * 3
+    return frames
+
+
+def _analyze(frames: list[np.ndarray], **kwargs) -> TemporalAnalyzer:
+    analyzer = TemporalAnalyzer(detect_faces=False, **kwargs)
+    for i, frame in enumerate(frames):
+        analyzer.add(frame, i / FPS)
+    return analyzer
+
+
+def _write_video(path, frames: list[np.ndarray]) -> None:
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (width, height)
+    )
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+class _FixedFace:
+    """Face detector stub reporting one box in every frame."""
+
+    def detectMultiScale(self, gray, **kwargs):  # noqa: N802 - OpenCV's name
+        return np.array([[40, 30, 48, 48]])
+
+
+class TestTemporalAnalyzer:
+    """Tests for transition scoring and segments."""
+
+    def test_smooth_motion_not_suspicious(self):
+        """Test that steady panning produces no segments."""
+        analyzer = _analyze(_pan(60))
+        report = analyzer.report(duration=6.0)
+
+        assert report.segments == []
+        assert report.anomaly_score == 0.0
+        assert report.frames_analyzed == 60
+        assert set(report.signals) == set(SIGNALS[:4])
+
+    def test_glitch_located(self):
+        """Test that content popping mid-video becomes a timed segment."""
+        report = _analyze(_pan(60, glitch=range(30, 32))).report(duration=6.0)
+
+        (segment,) = report.segments
+        assert segment.start == pytest.approx(2.9)
+        assert segment.end == pytest.approx(3.2)
+        assert segment.score > 4
+        assert 0 < report.anomaly_score < 0.1
+
+    def test_shot_cut_not_reported(self):
+        """Test that a cut to another scene resets the window silently."""
+        bright = [cv2.add(frame, 120) for frame in _pan(30)]
+        report = _analyze(_pan(30) + bright).report(duration=6.0)
+
+        assert report.segments == []
+
+    def test_memory_bounded_by_window(self):
+        """Test that the analyzer keeps only the sliding window."""
+        analyzer = _analyze(_pan(100), window=16)
+
+        assert len(analyzer._history) == 16
+
+    def test_face_flicker(self):
+        """Test that a face brightening alone is flagged as face flicker."""
+        frames = _pan(40)
+        face = frames[25][30:78, 40:88]
+        face[:] = cv2.add(face, 40)
+        analyzer = TemporalAnalyzer()
+        analyzer._detector = _FixedFace()
+        for i, frame in enumerate(frames):
+            analyzer.add(frame, i / FPS)
+        report = analyzer.report(duration=4.0)
+
+        assert report.face_frames == 40
+        assert report.segments[0].signal.startswith("face_")
+        assert report.segments[0].start == pytest.approx(2.4)
+
+    def test_invalid_settings(self):
+        """Test that a tiny window or non-positive threshold is rejected."""
+        with pytest.raises(ValueError):
+            TemporalAnalyzer(window=2)
+        with pytest.raises(ValueError):
+            TemporalAnalyzer(threshold=0)
+
+
+class TestAnalyzeTemporal:
+    """Tests for whole-video analysis and reporting."""
+
+    def test_video_file(self, tmp_path):
+        """Test decoding, subsampling to max_fps and timestamps."""
+        path = tmp_path / "glitch.avi"
+        _write_video(path, _pan(60, glitch=range(30, 32)))
+
+        report = analyze_temporal(path, detect_faces=False)
+        halved = analyze_temporal(path, max_fps=5, detect_faces=False)
+
+        assert report.duration == pytest.approx(6.0)
+        assert report.segments[0].start == pytest.approx(2.9)
+        assert halved.frames_analyzed == 30
+
+    def test_unreadable_video(self, tmp_path):
+        """Test that a file OpenCV cannot open raises ValueError."""
+        path = tmp_path / "broken.avi"
+        path.write_bytes(b"not a video")
+
+        with pytest.raises(ValueError):
+            analyze_temporal(path)
+
+    def test_report_on_result(self):
+        """Test the reasoning, indicators and serialization of a report."""
+        report = _analyze(_pan(60, glitch=range(30, 32))).report(duration=6.0)
+        result = AnalysisResult(Verdict.AUTHENTIC, 0.8, "Looks real.", ["x"], [])
+
+        attach_report(result, report)
+
+        assert "suspicious segments" in result.reasoning
+        assert result.indicators == ["x", "Temporal anomaly at 2.90-3.20s (warp_error)"]
+        assert result_from_dict(result_to_dict(result)).temporal == report
+
+
+class TestAgentTemporal:
+    """Tests for temporal analysis in the agent and batch runs."""
+
+    def test_analyze_video(self, sample_video):
+        """Test that the video result carries the temporal report."""
+        with FakeOllamaServer() as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                temporal=True,
+                verbose=False,
+            )
+            result = agent.analyze_video(sample_video, sample_frames=3)
+            agent.close()
+
+        assert result.temporal.frames_analyzed == 30
+        assert "temporal" in result.timings
+        assert result.verdict == Verdict.AI_GENERATED
+
+    def test_analyze_video_async(self, sample_video):
+        """Test that the async path attaches the report too."""
+        with FakeOllamaServer() as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                temporal=True,
+                verbose=False,
+            )
+
+            async def analyze():
+                try:
+                    return await agent.analyze_video_async(sample_video, 3)
+                finally:
+                    await agent.aclose()
+
+            result = asyncio.run(analyze())
+            agent.close()
+
+        assert result.temporal.frames_analyzed == 30
+        assert "temporal" in result.timings
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_failure_keeps_verdicts(self, sample_video, llm_response, use_async):
+        """Test that a failing temporal analysis drops only the report."""
+        agent = VideoFraudDetectionAgent(temporal=True, verbose=False)
+
+        async def analyze():
+            return await agent.analyze_video_async(sample_video, 3)
+
+        with (
+            patch("src.agent.analyze_temporal", side_effect=ValueError("bad")),
+            patch.object(agent, "_query_llm", return_value=llm_response()),
+            patch.object(agent, "_query_llm_async", return_value=llm_response()),
+        ):
+            if use_async:
+                result = asyncio.run(analyze())
+            else:
+                result = agent.analyze_video(sample_video, 3)
+        agent.close()
+
+        assert result.verdict == Verdict.AI_GENERATED
+        assert result.temporal is None
+        assert "Temporal analysis failed: bad." in result.reasoning
+
+    def test_no_thread_when_disabled(self, sample_video, llm_response):
+        """Test that no background executor is created without temporal."""
+        agent = VideoFraudDetectionAgent(verbose=False)
+
+        with (
+            patch("src.agent.ThreadPoolExecutor") as executor,
+            patch.object(agent, "_query_llm", return_value=llm_response()),
+        ):
+            agent.analyze_video(sample_video, 3)
+
+        executor.assert_not_called()
+
+    def test_batch(self, sample_video, llm_response):
+        """Test that batch records include the report computed by workers."""
+        agent = VideoFraudDetectionAgent(temporal=True, verbose=False)
+        output = io.StringIO()
+
+        with patch.object(
+            VideoFraudDetectionAgent, "_query_llm", return_value=llm_response()
+        ):
+            run_batch(agent, [sample_video], output, 3, decode_workers=1)
+        agent.close()
+
+        (record,) = map(json.loads, output.getvalue().splitlines())
+        assert record["temporal"]["frames_analyzed"] == 30
@@ -0,0 +1,123 @@
+"""Unit tests for video frame extraction utilities."""
+
+import base64
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+from src.agent import VideoFraudDetectionAgent
+from src.models import Frame, Verdict
+from src.video_utils import (
+    cleanup_temp_files,
+    encode_frame,
+    extract_frames,
+    extract_frames_in_memory,
+)
+
+
+class TestEncodeFrame:
+    """Tests for encode_frame."""
+
+    def test_round_trip(self):
+        """Test encoded frame decodes back to an image of same shape."""
+        image = np.zeros((16, 24, 3), dtype=np.uint8)
+
+        data = encode_frame(image)
+        raw = np.frombuffer(base64.b64decode(data), dtype=np.uint8)
+
+        assert cv2.imdecode(raw, cv2.IMREAD_COLOR).shape == (16, 24, 3)
+
+
+class TestExtractFrames:
+    """Tests for disk and in-memory frame extraction."""
+
+    def test_in_memory_touches_no_files(self, sample_video):
+        """Test in-memory extraction never writes to disk."""
+        with (
+            patch("tempfile.mkdtemp") as mkdtemp,
+            patch("cv2.imwrite") as imwrite,
+        ):
+            frames = extract_frames_in_memory(sample_video, 5)
+
+        mkdtemp.assert_not_called()
+        imwrite.assert_not_called()
+        assert [f.index for f in frames] == [0, 6, 12, 18, 24]
+        assert frames[0].name == "frame_0000.jpg"
+        assert base64.b64decode(frames[0].data)[:2] == b"\xff\xd8"
+
+    def test_disk_extraction(self, sample_video):
+        """Test file-based extraction writes JPEGs to a temp dir."""
+        paths, temp_dir = extract_frames(sample_video, 3)
+
+        assert len(paths) == 3
+        assert all(Path(p).parent == Path(temp_dir) for p in paths)
+        assert all(Path(p).is_file() for p in paths)
+        cleanup_temp_files(temp_dir)
+
+    @pytest.mark.parametrize("error", [OSError, KeyboardInterrupt])
+    def test_disk_extraction_failure_removes_dir(self, sample_video, tmp_path, error):
+        """Test that any error while writing frames removes the temp dir."""
+        temp_dir = tmp_path / "video_fraud_test"
+        temp_dir.mkdir()
+
+        with (
+            patch("tempfile.mkdtemp", return_value=str(temp_dir)),
+            patch("cv2.imwrite", side_effect=error),
+            pytest.raises(error),
+        ):
+            extract_frames(sample_video, 3)
+
+        assert not temp_dir.exists()
+
+    def test_unreadable_video(self, tmp_path):
+        """Test that an invalid video raises ValueError."""
+        bogus = tmp_path / "bogus.mp4"
+        bogus.write_bytes(b"not a video")
+
+        with pytest.raises(ValueError):
+            extract_frames_in_memory(bogus, 3)
+
+
+class TestAgentInMemoryFrames:
+    """Tests for the agent's in-memory frame pipeline."""
+
+    def test_analyze_frame_accepts_frame(self, llm_response):
+        """Test that an in-memory Frame is sent without file access."""
+        agent = VideoFraudDetectionAgent()
+        frame = Frame(index=3, name="frame_0003.jpg", data="aW1n")
+
+        with patch.object(agent, "_query_llm", return_value=llm_response()) as q:
+            result = agent.analyze_frame(frame)
+
+        q.assert_called_once_with("aW1n", "frame_0003.jpg", tier=None)
+        assert result.verdict == Verdict.AI_GENERATED
+
+    def test_analyze_video_in_memory(self, sample_video, llm_response):
+        """Test that video analysis defaults to in-memory frames."""
+        agent = VideoFraudDetectionAgent()
+
+        with (
+            patch.object(agent, "_query_llm", return_value=llm_response()),
+            patch("src.agent.extract_frames") as disk,
+        ):
+            result = agent.analyze_video(sample_video, sample_frames=3)
+
+        disk.assert_not_called()
+        assert "Analyzed 3 frames" in result.reasoning
+
+    def test_analyze_video_disk_frames(self, sample_video, llm_response):
+        """Test the file-based debugging path cleans up its temp dir."""
+        agent = VideoFraudDetectionAgent(in_memory_frames=False)
+
+        with (
+            patch.object(agent, "_query_llm", return_value=llm_response()),
+            patch("src.agent.cleanup_temp_files", wraps=cleanup_temp_files) as cleanup,
+        ):
+            agent.analyze_video(sample_video, sample_frames=2)
+
+        temp_dir = cleanup.call_args.args[0]
+        assert temp_dir is not None
+        assert not Path(temp_dir).exists()
@@ -0,0 +1,109 @@
+"""Unit tests for model warm-up and keep_alive."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from src.agent import VideoFraudDetectionAgent
+from src.models import Frame
+from src.providers import OllamaClient, model_matches
+from src.warmup import warm_up
+
+
+@pytest.fixture
+def cold_server():
+    """Run a fake Ollama server that takes 0.2s to load each model."""
+    with FakeOllamaServer(latency=0.0, load_time=0.2) as server:
+        yield server
+
+
+class TestModelMatches:
+    """Tests for model_matches."""
+
+    @pytest.mark.parametrize(
+        ("available", "requested", "expected"),
+        [
+            ("llava:latest", "llava", True),
+            ("llava:latest", "llava:latest", True),
+            ("llava:13b", "llava", False),
+            ("llava:13b", "llava:13b", True),
+            ("llava-phi3:latest", "llava", False),
+        ],
+    )
+    def test_tag_defaults_to_latest(self, available, requested, expected):
+        """Test that an untagged name only matches the latest tag."""
+        assert model_matches(available, requested) is expected
+
+
+class TestWarmUp:
+    """Tests for warm_up."""
+
+    def test_reports_cold_and_warm(self, cold_server):
+        """Test that only the first preload pays the load time."""
+        report = warm_up(OllamaClient(host=cold_server.url), "llava", "10m")
+
+        assert report.cold_s >= 0.2
+        assert report.warm_s < report.cold_s
+        assert report.load_s == pytest.approx(0.2)
+        assert cold_server.preloads == 2
+        assert cold_server.requests == 0
+        assert cold_server.keep_alive == ["10m", "10m"]
+
+    def test_missing_model(self, cold_server):
+        """Test that an uninstalled model is reported with a pull hint."""
+        with pytest.raises(ValueError, match="ollama pull llava:34b"):
+            warm_up(OllamaClient(host=cold_server.url), "llava:34b")
+
+        assert cold_server.preloads == 0
+
+
+class TestAgentWarmUp:
+    """Tests for the agent's warm-up and keep_alive options."""
+
+    def test_warm_up_on_construction(self, cold_server):
+        """Test that the first analysis no longer pays the load time."""
+        agent = VideoFraudDetectionAgent(
+            ollama_client=OllamaClient(host=cold_server.url),
+            warm_up=True,
+            verbose=False,
+        )
+
+        result = agent.analyze_frame(Frame(0, "frame_0000.jpg", "aW1n"))
+        agent.close()
+
+        assert agent.warmup_reports[0].load_s == pytest.approx(0.2)
+        assert agent.warmup_reports[0].to_dict()["model"] == "llava"
+        assert result.timings["model_load"] == 0.0
+
+    def test_missing_model_fails_construction(self, cold_server):
+        """Test that a misconfigured model fails fast."""
+        with pytest.raises(ValueError, match="not installed"):
+            VideoFraudDetectionAgent(
+                model_name="bakllava",
+                ollama_client=OllamaClient(host=cold_server.url),
+                warm_up=True,
+            )
+
+    def test_warm_up_requires_ollama(self):
+        """Test that other providers cannot be warmed up."""
+        agent = VideoFraudDetectionAgent(model_provider="openai")
+
+        with pytest.raises(ValueError, match="only supported for ollama"):
+            agent.warm_up()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_keep_alive_on_every_request(self, sample_video, stream):
+        """Test that keep_alive is sent with each frame, sync and async."""
+        with FakeOllamaServer(latency=0.0) as server:
+            agent = VideoFraudDetectionAgent(
+                ollama_client=OllamaClient(host=server.url),
+                stream_responses=stream,
+                keep_alive=-1,
+                verbose=False,
+            )
+            agent.analyze_video(sample_video, sample_frames=2)
+            asyncio.run(agent.analyze_video_async(sample_video, 2))
+            agent.close()
+
+        assert server.keep_alive == [-1] * 4